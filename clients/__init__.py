@@ -4,21 +4,28 @@ Clients package for handling external API requests
 All API clients use centralized caching via utils.cache to avoid code duplication.
 """
 
-from .weather_api import get_weather
+from .weather_api import get_weather, get_weather_bulk
 from .ip_api import get_ip_address
-from .crypto_api import get_crypto_prices
-from .fear_greed_api import get_fear_greed_index
+from .crypto_api import get_crypto_prices, get_crypto_prices_multi, register_crypto_ids, unregister_crypto_ids
+from .fear_greed_api import get_fear_greed_index, get_fear_greed_history
 from .coingecko_global_api import get_global_data
-from .altcoin_season_api import get_altcoin_season_index
+from .altcoin_season_api import get_altcoin_season_index, get_altcoin_season_history, backfill_altcoin_season_history
 from utils.cache import DEFAULT_CACHE_DURATION
 
 __all__ = [
     'get_weather',
+    'get_weather_bulk',
     'get_ip_address',
     'get_crypto_prices',
+    'get_crypto_prices_multi',
+    'register_crypto_ids',
+    'unregister_crypto_ids',
     'get_fear_greed_index',
+    'get_fear_greed_history',
     'get_global_data',
     'get_altcoin_season_index',
+    'get_altcoin_season_history',
+    'backfill_altcoin_season_history',
     'DEFAULT_CACHE_DURATION'
 ]
 
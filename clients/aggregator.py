@@ -0,0 +1,221 @@
+"""
+LAN Aggregator Client
+
+In client mode, data requests go to an aggregator instance on the local
+network instead of the public APIs. The aggregator (see aggregator_server.py)
+runs the regular API clients once for all tickers, so upstream load stays the
+same however many tickers are deployed.
+
+Each distinct request (e.g. prices of the same coins in the same currencies)
+gets a subscription: a background thread that long-polls the aggregator with
+the last ETag and keeps the latest value in memory. Modules read that value
+without waiting on the network. While the aggregator is unreachable, calls
+fall back to the public APIs (direct fetch).
+
+API clients opt in with the @aggregated decorator.
+"""
+
+import functools
+import inspect
+import random
+import threading
+import time
+import requests
+from .snapshots import from_json
+from utils import metrics
+
+
+# Client mode settings (url None = client mode off)
+_config = {
+    'url': None,
+    'long_poll': 30,      # seconds the aggregator may hold a request open
+    'timeout': 3,         # seconds to wait for the first response of a new subscription
+    'idle_timeout': 900,  # seconds without reads before a subscription stops
+    'max_backoff': 60,    # maximum seconds between reconnect attempts
+}
+
+# Subscriptions by aggregator URL + query
+_subscriptions = {}
+_subscriptions_lock = threading.Lock()
+
+STATE_CONNECTING = 'connecting'
+STATE_LIVE = 'live'
+STATE_DOWN = 'down'
+
+
+def configure_client(url, long_poll=30, timeout=3, idle_timeout=900, max_backoff=60):
+    """
+    Enable client mode: read data from an aggregator instead of the public APIs
+
+    Args:
+        url: Aggregator base URL (e.g. 'http://192.168.1.10:8765'), or None to disable
+        long_poll: Seconds the aggregator may hold a request open waiting for new data
+        timeout: Seconds to wait for the first response of a new request before fetching directly
+        idle_timeout: Seconds without reads before a subscription is stopped
+        max_backoff: Maximum seconds between reconnect attempts
+    """
+    _config['url'] = url.rstrip('/') if url else None
+    _config['long_poll'] = long_poll
+    _config['timeout'] = timeout
+    _config['idle_timeout'] = idle_timeout
+    _config['max_backoff'] = max_backoff
+
+
+def is_client():
+    """
+    Check if client mode is enabled
+
+    Returns:
+        bool: True if data is read from an aggregator
+    """
+    return _config['url'] is not None
+
+
+class _Subscription:
+    """Latest value of one aggregator source, kept current by long-polling"""
+
+    def __init__(self, url, params, on_update=None):
+        """
+        Initialize and start the subscription
+
+        Args:
+            url: Source URL on the aggregator
+            params: Query parameters of the request
+            on_update: Optional callback for every new value
+        """
+        self.url = url
+        self.params = params
+        self.on_update = on_update
+        self.state = STATE_CONNECTING
+        self.value = None
+        self.etag = None
+        self.last_read = time.time()
+        self._first_response = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="aggregator-client", daemon=True)
+        self._thread.start()
+
+    def read(self):
+        """
+        Get the latest value (waits for the first response of a new subscription)
+
+        Returns:
+            tuple: (True, value) if the aggregator answered, (False, None) if it is unreachable
+        """
+        self.last_read = time.time()
+        if self.state == STATE_CONNECTING:
+            self._first_response.wait(_config['timeout'])
+        if self.state != STATE_LIVE:
+            return False, None
+        return True, self.value
+
+    def _run(self):
+        """Long-poll loop with exponential backoff and jitter"""
+        backoff = 1
+        while time.time() - self.last_read < _config['idle_timeout'] and is_client():
+            long_poll = _config['long_poll']
+            headers = {'If-None-Match': self.etag} if self.etag else {}
+            try:
+                response = requests.get(
+                    self.url,
+                    params=dict(self.params, wait=long_poll),
+                    headers=headers,
+                    timeout=(_config['timeout'], long_poll + _config['timeout'])
+                )
+                if response.status_code == 200:
+                    self.value = from_json(response.json())
+                    self.etag = response.headers.get('ETag')
+                    if self.on_update is not None and self.value is not None:
+                        self.on_update(self.value)
+                elif response.status_code != 304:
+                    raise requests.RequestException(f"status code {response.status_code}")
+                if self.state != STATE_LIVE:
+                    print(f"Aggregator: Connected ({self.url})")
+                self.state = STATE_LIVE
+                backoff = 1
+            except Exception as e:
+                if self.state != STATE_DOWN:
+                    print(f"Aggregator: {self.url} unreachable ({e}), fetching directly")
+                self.state = STATE_DOWN
+            finally:
+                self._first_response.set()
+
+            if self.state == STATE_DOWN:
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+                backoff = min(_config['max_backoff'], backoff * 2)
+
+        with _subscriptions_lock:
+            for key, subscription in list(_subscriptions.items()):
+                if subscription is self:
+                    del _subscriptions[key]
+
+
+def _subscribe(source, params, on_update):
+    """Get the subscription of a request, starting it if needed"""
+    url = f"{_config['url']}/v1/{source}"
+    key = (url, tuple(sorted((name, str(value)) for name, value in params.items())))
+    with _subscriptions_lock:
+        subscription = _subscriptions.get(key)
+        if subscription is None:
+            subscription = _Subscription(url, params, on_update)
+            _subscriptions[key] = subscription
+        return subscription
+
+
+def aggregated(source, *param_names, on_update=None):
+    """
+    Route an API client function through the aggregator in client mode
+
+    Only the named parameters are sent; the aggregator applies its own
+    credentials, intervals and history settings. Without client mode, or
+    while the aggregator is unreachable, the function runs as usual.
+
+    Args:
+        source: Source name on the aggregator (see aggregator_server.py)
+        *param_names: Function parameters that identify the request
+        on_update: Optional callback for every new value from the aggregator
+                   (e.g. to publish fresh prices to the alert engine)
+
+    Example:
+        @aggregated('crypto_prices', 'crypto_ids', 'fiat_currencies')
+        def get_crypto_prices_multi(crypto_ids, fiat_currencies, timeout=10, ...):
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not is_client():
+                return function(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # Lists are sent as repeated query parameters
+            params = {name: bound.arguments[name] for name in param_names}
+
+            answered, value = _subscribe(source, params, on_update).read()
+            if answered:
+                metrics.increment('aggregator.reads')
+                return value
+
+            metrics.increment('aggregator.fallbacks')
+            return function(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def direct_only(default=None):
+    """
+    Skip an API client function in client mode (e.g. history backfills the aggregator does itself)
+
+    Args:
+        default: Return value when skipped
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if is_client():
+                return default
+            return function(*args, **kwargs)
+        return wrapper
+    return decorator
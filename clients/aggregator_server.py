@@ -0,0 +1,300 @@
+"""
+LAN Aggregator Server
+
+Serves the data of the regular API clients to other tickers on the local
+network, so all of them share one set of upstream requests.
+
+Endpoint: GET /v1/<source>?<params>
+- Responses are JSON snapshots (see snapshots.to_json()) with an ETag
+- A request with If-None-Match and ?wait=N is held open until the data
+  changes or N seconds pass (long-poll), then answered 200 or 304
+- Every distinct request is refreshed in the background at the source's
+  interval while clients ask for it, and dropped after idle_timeout. Each
+  refresh runs on its own thread, so a hung upstream only delays its own
+  requests; a failed refresh keeps serving the last good response
+
+Sources (see create_sources()):
+    crypto_prices   ?crypto_ids=bitcoin&crypto_ids=ethereum&fiat_currencies=usd
+    weather         ?location=London
+    weather_bulk    ?locations=London&locations=Paris
+    fear_greed
+    global          ?fiat_currencies=usd&fiat_currencies=eur
+    alt_season
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from .snapshots import to_json
+from .crypto_api import get_crypto_prices_multi
+from .weather_api import get_weather, get_weather_bulk
+from .fear_greed_api import get_fear_greed_index, get_fear_greed_history
+from .coingecko_global_api import get_global_data
+from .altcoin_season_api import (
+    get_altcoin_season_index, get_altcoin_season_history, backfill_altcoin_season_history
+)
+
+
+def create_sources(intervals, weather_api_key=None, timeout=10, fear_greed_history=None, alt_season_history=None):
+    """
+    Build the source table served by the aggregator
+
+    Args:
+        intervals: Dict of source name -> refresh interval in seconds
+                   ('crypto_prices', 'weather', 'fear_greed', 'global', 'alt_season')
+        weather_api_key: WeatherAPI key used for all clients
+        timeout: Upstream request timeout in seconds
+        fear_greed_history: Optional FEAR_GREED_MODULE_CONFIG['history'] dict
+        alt_season_history: Optional ALT_SEASON_MODULE_CONFIG['history'] dict
+
+    Returns:
+        dict: Source name -> (fetch function(query, force_refresh), refresh interval)
+    """
+    fear_greed_store = None
+    if fear_greed_history and fear_greed_history.get('enabled', False):
+        fear_greed_days = fear_greed_history.get('days', 30)
+        fear_greed_store = get_fear_greed_history(fear_greed_history['path'], fear_greed_days)
+
+    alt_season_store = None
+    if alt_season_history and alt_season_history.get('enabled', False):
+        alt_season_days = alt_season_history.get('days', 90)
+        alt_season_store = get_altcoin_season_history(alt_season_history['path'], alt_season_days)
+
+    def crypto_prices(query, force_refresh):
+        return get_crypto_prices_multi(
+            ','.join(query.get('crypto_ids', [])),
+            query.get('fiat_currencies', ['usd']),
+            timeout=timeout,
+            cache_duration=intervals['crypto_prices'],
+            force_refresh=force_refresh
+        )
+
+    def weather(query, force_refresh):
+        return get_weather(
+            weather_api_key,
+            query['location'][0],
+            timeout=timeout,
+            cache_duration=intervals['weather'],
+            force_refresh=force_refresh
+        )
+
+    def weather_bulk(query, force_refresh):
+        return get_weather_bulk(
+            weather_api_key,
+            query['locations'],
+            timeout=timeout,
+            cache_duration=intervals['weather'],
+            force_refresh=force_refresh
+        )
+
+    def fear_greed(query, force_refresh):
+        if fear_greed_store is None:
+            return get_fear_greed_index(timeout=timeout, cache_duration=intervals['fear_greed'],
+                                        force_refresh=force_refresh)
+        return get_fear_greed_index(timeout=timeout, cache_duration=intervals['fear_greed'],
+                                    force_refresh=force_refresh,
+                                    history=fear_greed_store, history_days=fear_greed_days)
+
+    def global_data(query, force_refresh):
+        return get_global_data(timeout=timeout, cache_duration=intervals['global'], force_refresh=force_refresh,
+                               fiat_currencies=query.get('fiat_currencies', ['usd']))
+
+    def alt_season(query, force_refresh):
+        if alt_season_store is None:
+            return get_altcoin_season_index(timeout=timeout, cache_duration=intervals['alt_season'],
+                                            force_refresh=force_refresh)
+        data = get_altcoin_season_index(timeout=timeout, cache_duration=intervals['alt_season'],
+                                        force_refresh=force_refresh,
+                                        history=alt_season_store, history_days=alt_season_days)
+        if data is not None:
+            backfill_altcoin_season_history(
+                alt_season_store,
+                alt_season_days,
+                timeout=timeout,
+                max_requests=alt_season_history.get('backfill_per_update', 5),
+                budget_reserve=alt_season_history.get('budget_reserve', 0.5)
+            )
+        return data
+
+    return {
+        'crypto_prices': (crypto_prices, intervals['crypto_prices']),
+        'weather': (weather, intervals['weather']),
+        'weather_bulk': (weather_bulk, intervals['weather']),
+        'fear_greed': (fear_greed, intervals['fear_greed']),
+        'global': (global_data, intervals['global']),
+        'alt_season': (alt_season, intervals['alt_season']),
+    }
+
+
+class _Entry:
+    """Latest response of one distinct request"""
+
+    __slots__ = ('source', 'query', 'body', 'etag', 'refreshed', 'requested', 'lock', 'refreshing')
+
+    def __init__(self, source, query):
+        self.source = source
+        self.query = query
+        self.body = None
+        self.etag = None
+        self.refreshed = 0
+        self.requested = time.time()
+        self.lock = threading.Lock()  # one upstream refresh at a time
+        self.refreshing = False  # background refresh in flight
+
+
+class AggregatorServer:
+    """HTTP server sharing API client data with tickers on the local network"""
+
+    def __init__(self, sources, host='0.0.0.0', port=8765, max_wait=60, idle_timeout=900):
+        """
+        Initialize the server (call start() to listen)
+
+        Args:
+            sources: Source table from create_sources()
+            host: Listen address
+            port: Listen port
+            max_wait: Longest long-poll a client may request (seconds)
+            idle_timeout: Seconds without requests before a request stops being refreshed
+        """
+        self.sources = sources
+        self.host = host
+        self.port = port
+        self.max_wait = max_wait
+        self.idle_timeout = idle_timeout
+        self._entries = {}
+        self._changed = threading.Condition()
+        self._running = False
+        self._httpd = None
+
+    def start(self):
+        """Start listening and refreshing in background threads"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass  # one line per long-poll would flood the log
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self._running = True
+        threading.Thread(target=self._httpd.serve_forever, name="aggregator-server", daemon=True).start()
+        threading.Thread(target=self._refresh_loop, name="aggregator-refresh", daemon=True).start()
+        print(f"Aggregator: Serving on {self.host}:{self.port}")
+
+    def stop(self):
+        """Stop the server"""
+        self._running = False
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _entry(self, source, query):
+        """Get the entry of a request, creating it if needed"""
+        key = (source, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+        with self._changed:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(source, query)
+                self._entries[key] = entry
+            entry.requested = time.time()
+            return entry
+
+    def _refresh(self, entry, force_refresh):
+        """Fetch an entry's data and notify waiting clients if it changed"""
+        with entry.lock:
+            fetch, _ = self.sources[entry.source]
+            entry.refreshed = time.time()
+            try:
+                data = fetch(entry.query, force_refresh)
+            except Exception as e:
+                print(f"Aggregator: Error refreshing {entry.source} ({e})")
+                return
+            if data is None and entry.body is not None:
+                print(f"Aggregator: {entry.source} refresh failed, keeping the last response")
+                return
+            # A first response of None (upstream failure) is served too; clients apply their own failure handling
+            body = json.dumps(to_json(data), separators=(',', ':')).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+            if etag == entry.etag:
+                return
+            with self._changed:
+                entry.body = body
+                entry.etag = etag
+                self._changed.notify_all()
+
+    def _refresh_loop(self):
+        """Refresh requested entries at their source's interval; drop idle ones"""
+        while self._running:
+            now = time.time()
+            with self._changed:
+                for key, entry in list(self._entries.items()):
+                    if now - entry.requested > self.idle_timeout:
+                        del self._entries[key]
+                entries = list(self._entries.values())
+
+            for entry in entries:
+                _, interval = self.sources[entry.source]
+                if entry.body is not None and not entry.refreshing and now - entry.refreshed >= interval:
+                    # One thread per refresh: a hung upstream must not stall the other sources
+                    entry.refreshing = True
+                    threading.Thread(target=self._background_refresh, args=(entry,),
+                                     name=f"aggregator-{entry.source}", daemon=True).start()
+            time.sleep(1)
+
+    def _background_refresh(self, entry):
+        """Refresh an entry on its own thread (started by _refresh_loop)"""
+        try:
+            self._refresh(entry, force_refresh=True)
+        finally:
+            entry.refreshing = False
+
+    def _handle(self, request):
+        """Answer one GET request (with optional long-poll)"""
+        url = urlsplit(request.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'v1' or parts[1] not in self.sources:
+            request.send_error(404, "Unknown source")
+            return
+
+        query = parse_qs(url.query)
+        try:
+            wait = min(float(query.pop('wait', ['0'])[0]), self.max_wait)
+        except ValueError:
+            request.send_error(400, "Invalid wait")
+            return
+
+        entry = self._entry(parts[1], query)
+        if entry.body is None:
+            self._refresh(entry, force_refresh=False)
+            if entry.body is None:
+                request.send_error(502, "Source unavailable")
+                return
+
+        # Long-poll: hold the request until the data changes or the wait expires
+        client_etag = request.headers.get('If-None-Match')
+        with self._changed:
+            if client_etag == entry.etag and wait > 0:
+                self._changed.wait_for(lambda: entry.etag != client_etag or not self._running, timeout=wait)
+            body, etag = entry.body, entry.etag
+
+        if client_etag == etag:
+            request.send_response(304)
+            request.send_header('ETag', etag)
+            request.end_headers()
+            return
+
+        request.send_response(200)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.send_header('ETag', etag)
+        request.send_header('Cache-Control', 'no-cache')
+        request.end_headers()
+        request.wfile.write(body)
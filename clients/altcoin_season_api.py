@@ -7,16 +7,47 @@ over the last 7 days and 30 days
 
 Implementation uses a reusable _calculate_index() helper method to avoid code duplication
 when calculating indices for multiple timeframes.
+
+The optional rolling index (e.g. 90 days) compares today's price with the
+daily close N days ago, kept in a DailySeries history store. The store is
+backfilled once per coin from CoinGecko market charts (a few coins per update,
+within the request budget); after that, each markets request records today's
+price, so the steady state needs no extra requests.
 """
 
-import requests
-import time
+import functools
+import threading
+from . import http
+from .aggregator import aggregated, direct_only
+from .snapshots import AltSeasonSnapshot
+from utils import clock, deadline
 from utils.cache import create_cache, cached_api_call, DEFAULT_CACHE_DURATION
+from utils.events import publish, TOPIC_ALT_SEASON
+from utils.history import shared_series, day_number
+
+
+COINGECKO_HOST = 'api.coingecko.com'
+MARKET_CHART_URL = "https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+
+# Share of the top 100 altcoins that need history before the rolling index is shown
+MIN_HISTORY_COVERAGE = 0.9
 
+# Days a coin may be missing from the markets response before its history is dropped
+DROP_AFTER_DAYS = 7
 
 # Internal cache
 _cache = create_cache()
 
+# Bitcoin and the top 100 altcoins of the last markets request
+_tracked_ids = []
+
+# Coin ID -> day of its last backfill request (at most one attempt per coin per day)
+_backfill_attempts = {}
+_backfill_lock = threading.Lock()
+
+# History path -> day it was last saved
+_saved_days = {}
+
 
 def _calculate_index(altcoins, btc_performance, performance_key, timeframe_label):
     """Calculate Altcoin Season Index for a specific timeframe
@@ -52,7 +83,154 @@ def _calculate_index(altcoins, btc_performance, performance_key, timeframe_label
     return index_value
 
 
-def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+def get_altcoin_season_history(path, days):
+    """
+    Get the shared history store for a rolling index window
+
+    Args:
+        path: JSON file the history is persisted to
+        days: Rolling window in days
+
+    Returns:
+        DailySeries: Store keeping days + 1 daily prices per coin
+    """
+    return shared_series(path, days + 1)
+
+
+def _record_prices(history, prices):
+    """
+    Record today's prices and save the history once per day
+
+    Today's value is overwritten on every request, so the last price seen
+    on a day becomes its close.
+
+    Args:
+        history: DailySeries to update
+        prices: Dict of coin ID -> current USD price
+    """
+    today = day_number()
+    for coin_id, price in prices.items():
+        history.set(coin_id, today, price)
+
+    # Coins gone from the top 100 for DROP_AFTER_DAYS are dropped (re-backfilled if they return);
+    # a brief absence (missing price, dip below the cutoff) keeps the history
+    for coin_id in history.keys():
+        if coin_id not in prices:
+            last_day = history.last_day(coin_id)
+            if last_day is None or today - last_day > DROP_AFTER_DAYS:
+                history.remove(coin_id)
+
+    # Persist when the day rolls over (yesterday's close is final)
+    if _saved_days.get(history.path) != today:
+        history.save()
+        _saved_days[history.path] = today
+
+
+def _calculate_rolling_index(history, altcoin_ids, days):
+    """
+    Calculate the rolling Altcoin Season Index from the history store
+
+    Args:
+        history: DailySeries with daily prices
+        altcoin_ids: IDs of the top 100 altcoins
+        days: Rolling window in days
+
+    Returns:
+        int: Index percentage (0-100), or None if too little history is available
+    """
+    today = day_number()
+    first_day = today - days
+
+    def performance(coin_id):
+        past = history.get(coin_id, first_day)
+        current = history.get(coin_id, today)
+        if not past or current is None:
+            return None
+        return (current / past - 1) * 100
+
+    btc_performance = performance('bitcoin')
+    if btc_performance is None:
+        return None
+
+    altcoins = [{'performance': performance(coin_id)} for coin_id in altcoin_ids]
+    covered = sum(1 for coin in altcoins if coin['performance'] is not None)
+    if covered < len(altcoin_ids) * MIN_HISTORY_COVERAGE:
+        print(f"Altcoin Season {days}d: History for {covered}/{len(altcoin_ids)} coins, backfilling")
+        return None
+
+    return _calculate_index(altcoins, btc_performance, 'performance', f'{days}d')
+
+
+@direct_only(default=0)
+def backfill_altcoin_season_history(history, days, timeout=10, max_requests=5, budget_reserve=0.5):
+    """
+    Fill missing history from CoinGecko market charts
+
+    Requests one coin at a time and stops after max_requests requests, when
+    the CoinGecko request budget falls to budget_reserve, or when the
+    rotation's fetch budget is used up. Coins without history for the start
+    of the window are backfilled; everything later is recorded daily by
+    get_altcoin_season_index().
+
+    Args:
+        history: DailySeries to fill
+        days: Rolling window in days
+        timeout: Request timeout in seconds
+        max_requests: Maximum requests per call
+        budget_reserve: Share of the CoinGecko budget left for other modules (0.0-1.0)
+
+    Returns:
+        int: Number of coins backfilled
+    """
+    # Another display is already backfilling
+    if not _backfill_lock.acquire(blocking=False):
+        return 0
+
+    try:
+        today = day_number()
+        first_day = today - days
+        pending = [
+            coin_id for coin_id in _tracked_ids
+            if history.get(coin_id, first_day) is None and _backfill_attempts.get(coin_id) != today
+        ]
+
+        filled = 0
+        for coin_id in pending[:max_requests]:
+            if http.budget_fraction(COINGECKO_HOST) <= budget_reserve or deadline.expired():
+                break
+
+            _backfill_attempts[coin_id] = today
+            try:
+                response = http.get(
+                    MARKET_CHART_URL.format(coin_id=coin_id),
+                    params={'vs_currency': 'usd', 'days': days, 'interval': 'daily'},
+                    timeout=timeout
+                )
+                if response.status_code != 200:
+                    print(f"Altcoin Season history: CoinGecko returned status code {response.status_code} for {coin_id}")
+                    break
+
+                for timestamp_ms, price in response.json().get('prices', []):
+                    day = day_number(timestamp_ms / 1000)
+                    # Today's price comes from the markets request
+                    if day < today and price:
+                        history.set(coin_id, day, price)
+                filled += 1
+            except Exception as e:
+                print(f"Altcoin Season history: Error backfilling {coin_id}: {e}")
+                break
+
+        if filled:
+            print(f"Altcoin Season history: Backfilled {filled} coins ({max(len(pending) - filled, 0)} pending)")
+            history.save()
+        return filled
+    finally:
+        _backfill_lock.release()
+
+
+@aggregated('alt_season', on_update=functools.partial(publish, TOPIC_ALT_SEASON))
+def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False,
+                             history=None, history_days=90):
     """Calculate Altcoin Season Index using CoinGecko API for both 7d and 30d with caching
     
     The index calculates the percentage of top 100 altcoins that outperformed 
@@ -65,15 +243,18 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
         timeout: Request timeout in seconds
         cache_duration: Cache duration in seconds (default: 600 = 10 minutes)
         force_refresh: If True, bypasses cache
+        history: Optional DailySeries (see get_altcoin_season_history()) for the rolling index
+        history_days: Rolling index window in days
     
     Returns:
-        dict: Altcoin Season data if successful, None otherwise
-        Example response:
-        {
-            'value_7d': 68,     # 7d percentage
-            'value_30d': 52,    # 30d percentage
-            'timestamp': 1640000000
-        }
+        AltSeasonSnapshot: Altcoin Season data if successful, None otherwise
+        Example:
+        AltSeasonSnapshot(
+            value_7d=68,     # 7d percentage
+            value_30d=52,    # 30d percentage
+            value_rolling=47,  # rolling percentage (None without enough history)
+            timestamp=1640000000
+        )
     """
     # Define fetch function
     def fetch():
@@ -90,7 +271,7 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
                 'price_change_percentage': '7d,30d'
             }
             
-            response = requests.get(url, params=params, timeout=timeout)
+            response = http.get(url, params=params, timeout=timeout)
             
             if response.status_code != 200:
                 print(f"Altcoin Season API error: CoinGecko returned status code {response.status_code}")
@@ -106,11 +287,13 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
             btc_performance_7d = None
             btc_performance_30d = None
             altcoins = []
+            prices = {}
             
             for coin in data:
                 coin_id = coin.get('id', '').lower()
                 price_change_7d = coin.get('price_change_percentage_7d_in_currency')
                 price_change_30d = coin.get('price_change_percentage_30d_in_currency')
+                current_price = coin.get('current_price')
                 
                 # Skip if both values are missing
                 if price_change_7d is None and price_change_30d is None:
@@ -119,7 +302,11 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
                 if coin_id == 'bitcoin':
                     btc_performance_7d = price_change_7d
                     btc_performance_30d = price_change_30d
+                    if current_price:
+                        prices[coin_id] = current_price
                 else:
+                    if current_price and len(altcoins) < 100:
+                        prices[coin_id] = current_price
                     altcoins.append({
                         'id': coin.get('id'),
                         'symbol': coin.get('symbol'),
@@ -147,13 +334,23 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
                 print("Altcoin Season: Failed to calculate any index")
                 return None
             
-            result = {
-                'value_7d': index_7d,
-                'value_30d': index_30d,
-                'timestamp': int(time.time())
-            }
+            # Rolling index from the history store (today's prices come with this request)
+            index_rolling = None
+            if history is not None:
+                _tracked_ids[:] = list(prices)
+                _record_prices(history, prices)
+                altcoin_ids = [coin_id for coin_id in prices if coin_id != 'bitcoin']
+                index_rolling = _calculate_rolling_index(history, altcoin_ids, history_days)
+            
+            result = AltSeasonSnapshot(
+                value_7d=index_7d,
+                value_30d=index_30d,
+                value_rolling=index_rolling,
+                timestamp=int(clock.now())
+            )
             
             print("- Indices calculated")
+            publish(TOPIC_ALT_SEASON, result)
             return result
             
         except Exception as e:
@@ -165,6 +362,7 @@ def get_altcoin_season_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION,
         cache=_cache,
         fetch_function=fetch,
         cache_duration=cache_duration,
+        cache_key=f"rolling_{history_days}" if history is not None else None,
         force_refresh=force_refresh,
         api_name="Altcoin Season API"
     )
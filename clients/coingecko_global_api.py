@@ -9,16 +9,27 @@ Implements internal caching to avoid duplicate API requests within a short time
 API Documentation: https://www.coingecko.com/api/documentation
 """
 
-import requests
-import time
+import functools
+import threading
+from . import http
+from .aggregator import aggregated
+from .snapshots import GlobalSnapshot
 from utils.cache import create_cache, cached_api_call, DEFAULT_CACHE_DURATION
+from utils import clock
+from utils.events import publish, TOPIC_GLOBAL_DATA
 
 
 # Internal cache to avoid duplicate requests
 _cache = create_cache()
 
+# Currencies kept from the ~60 in the response: 'usd' (published values) and every one asked for
+_fiats = {'usd'}
+_fiats_lock = threading.Lock()
 
-def get_global_data(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+
+@aggregated('global', 'fiat_currencies', on_update=functools.partial(publish, TOPIC_GLOBAL_DATA))
+def get_global_data(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False,
+                    fiat_currencies=('usd',)):
     """Fetch global cryptocurrency market data from CoinGecko API with caching
     
     This function serves both Market Cap and BTC Dominance modules with a single
@@ -28,24 +39,31 @@ def get_global_data(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_ref
         timeout: Request timeout in seconds
         cache_duration: Cache duration in seconds (default: 600 = 10 minutes)
         force_refresh: If True, bypasses cache and fetches fresh data
+        fiat_currencies: Currencies of total_market_cap the caller reads
     
     Returns:
-        dict: Global market data if successful, None otherwise
-        Example response:
-        {
-            'total_market_cap': {'usd': 1234567890000, ...},
-            'total_volume': {'usd': 123456789000, ...},
-            'market_cap_percentage': {'btc': 45.5, 'eth': 18.2, ...},
-            'market_cap_change_percentage_24h_usd': 2.5,
-            'timestamp': 1640000000  # Added by this function
-        }
+        GlobalSnapshot: Global market data if successful, None otherwise
+        Example:
+        GlobalSnapshot(
+            total_market_cap={'usd': 1234567890000, 'eur': 1134567890000},  # requested currencies only
+            market_cap_change_24h=2.5,
+            btc_dominance=45.5,
+            timestamp=1640000000  # Added by this function
+        )
     """
+    # The cache is shared: keep every currency any caller asked for, refetch once for a new one
+    wanted = {fiat.lower() for fiat in fiat_currencies}
+    with _fiats_lock:
+        new_fiats = not wanted <= _fiats
+        _fiats.update(wanted)
+        fiats = frozenset(_fiats)
+    
     # Define fetch function
     def fetch():
         url = "https://api.coingecko.com/api/v3/global"
         
         try:
-            response = requests.get(url, timeout=timeout)
+            response = http.get(url, timeout=timeout)
             
             if response.status_code != 200:
                 print(f"Coingecko Global API: Returned status {response.status_code}")
@@ -57,11 +75,18 @@ def get_global_data(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_ref
                 print("Coingecko Global API: Invalid response structure")
                 return None
             
-            # Add timestamp to the data
-            result = data['data']
-            result['timestamp'] = int(time.time())
+            # Keep only the fields the modules use, plus a timestamp
+            data = data['data']
+            market_caps = data.get('total_market_cap') or {}
+            result = GlobalSnapshot(
+                total_market_cap={fiat: value for fiat, value in market_caps.items() if fiat in fiats},
+                market_cap_change_24h=data.get('market_cap_change_percentage_24h_usd'),
+                btc_dominance=data.get('market_cap_percentage', {}).get('btc'),
+                timestamp=int(clock.now())
+            )
             
             print("- Market data fetched")
+            publish(TOPIC_GLOBAL_DATA, result)
             return result
             
         except Exception as e:
@@ -73,7 +98,7 @@ def get_global_data(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_ref
         cache=_cache,
         fetch_function=fetch,
         cache_duration=cache_duration,
-        force_refresh=force_refresh,
+        force_refresh=force_refresh or new_fiats,
         api_name="Coingecko Global API"
     )
 
@@ -1,11 +1,70 @@
 """Crypto API Client - Handles HTTP requests to CoinGecko API"""
 
-import requests
+import threading
+from . import http
+from .aggregator import aggregated
+from .snapshots import PriceSnapshot
 from utils.cache import create_cache, cached_api_call, DEFAULT_CACHE_DURATION
+from utils.events import publish, TOPIC_CRYPTO_PRICES
 
 
-# Internal cache
-_cache = create_cache()
+# Internal caches, one per request (crypto IDs and currencies), so modules
+# with different coins or currencies don't evict each other's data
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _get_cache(cache_key):
+    """Get the cache of a request, creating it if needed"""
+    with _caches_lock:
+        if cache_key not in _caches:
+            _caches[cache_key] = create_cache()
+        return _caches[cache_key]
+
+
+# Crypto IDs that other consumers (e.g. the portfolio) want priced, per owner:
+# owner -> (crypto IDs, fiat currency). Every request that includes the fiat
+# currency also asks for these IDs, so they ride along in the same batch
+# instead of costing requests of their own.
+_registered_ids = {}
+_registered_lock = threading.Lock()
+
+
+def register_crypto_ids(owner, crypto_ids, fiat_currency='usd'):
+    """
+    Add crypto IDs to every price request in a fiat currency
+    
+    Args:
+        owner: Any hashable object identifying the consumer (replaces its previous IDs)
+        crypto_ids: List of cryptocurrency IDs
+        fiat_currency: Fiat currency the IDs are needed in
+    """
+    with _registered_lock:
+        _registered_ids[owner] = (tuple(crypto_ids), fiat_currency)
+
+
+def unregister_crypto_ids(owner):
+    """Stop adding an owner's crypto IDs to price requests (no-op if not registered)"""
+    with _registered_lock:
+        _registered_ids.pop(owner, None)
+
+
+def _merge_registered_ids(crypto_ids, fiat_currencies):
+    """
+    Append the registered IDs wanted in any of the fiat currencies
+    
+    The requested IDs keep their order, so requests without registered IDs
+    keep their cache key.
+    
+    Returns:
+        list: Crypto IDs to request
+    """
+    merged = dict.fromkeys(crypto_ids)
+    with _registered_lock:
+        for ids, fiat in _registered_ids.values():
+            if fiat in fiat_currencies:
+                merged.update(dict.fromkeys(ids))
+    return list(merged)
 
 
 def get_crypto_prices(crypto_ids, fiat_currency='usd', timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
@@ -20,29 +79,85 @@ def get_crypto_prices(crypto_ids, fiat_currency='usd', timeout=10, cache_duratio
         force_refresh: If True, bypasses cache
         
     Returns:
-        Crypto price data dict if successful, None if failed
+        dict: Crypto ID -> PriceSnapshot if successful, None if failed
     """
-    # Convert list to comma-separated string if needed
-    if isinstance(crypto_ids, list):
-        crypto_ids = ','.join(crypto_ids)
+    prices = get_crypto_prices_multi(
+        crypto_ids,
+        [fiat_currency],
+        timeout=timeout,
+        cache_duration=cache_duration,
+        force_refresh=force_refresh
+    )
+    return None if prices is None else prices[fiat_currency]
+
+
+def _publish_prices(data):
+    """Announce fresh prices (e.g. to the price alert engine), one event per currency"""
+    for fiat, prices in data.items():
+        publish(TOPIC_CRYPTO_PRICES, {'prices': prices, 'fiat': fiat})
+
+
+def get_crypto_prices_multi(crypto_ids, fiat_currencies, timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+    """
+    Fetch cryptocurrency prices in several fiat currencies with one request
+    
+    CoinGecko returns all requested currencies in one /simple/price response,
+    so adding a currency adds no requests.
+    IDs added with register_crypto_ids() for one of the currencies are
+    included in the same request, also when it goes to the LAN aggregator.
+    
+    Args:
+        crypto_ids: Comma-separated string or list of cryptocurrency IDs
+        fiat_currencies: List of fiat currency codes (e.g., ['usd', 'eur'])
+        timeout: Request timeout in seconds
+        cache_duration: Cache duration in seconds (default: 600 = 10 minutes)
+        force_refresh: If True, bypasses cache
+        
+    Returns:
+        dict: Fiat currency -> {crypto ID -> PriceSnapshot} if successful, None if failed
+    """
+    # Merge before the aggregator binds the parameters, so direct and client mode send the same request
+    if isinstance(crypto_ids, str):
+        crypto_ids = crypto_ids.split(',')
+    return _get_prices(
+        ','.join(_merge_registered_ids(crypto_ids, fiat_currencies)),
+        list(fiat_currencies),
+        timeout=timeout,
+        cache_duration=cache_duration,
+        force_refresh=force_refresh
+    )
+
+
+@aggregated('crypto_prices', 'crypto_ids', 'fiat_currencies', on_update=_publish_prices)
+def _get_prices(crypto_ids, fiat_currencies, timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+    """Fetch prices of comma-separated crypto IDs (registered IDs already merged) with caching"""
+    vs_currencies = ','.join(fiat_currencies)
     
-    cache_key = f"{crypto_ids}_{fiat_currency}"
+    cache_key = f"{crypto_ids}_{vs_currencies}"
     
     # Define fetch function
     def fetch():
         url = "https://api.coingecko.com/api/v3/simple/price"
         params = {
             'ids': crypto_ids,
-            'vs_currencies': fiat_currency,
+            'vs_currencies': vs_currencies,
             'include_24hr_change': 'true',
             'precision': '2'
         }
         
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = http.get(url, params=params, timeout=timeout)
             if response.status_code == 200:
-                data = response.json()
-                print(f"- {list(data.keys())}")
+                values_by_id = response.json()
+                data = {
+                    fiat: {
+                        crypto_id: PriceSnapshot(values.get(fiat), values.get(f'{fiat}_24h_change'))
+                        for crypto_id, values in values_by_id.items()
+                    }
+                    for fiat in fiat_currencies
+                }
+                print(f"- {list(values_by_id.keys())} in {vs_currencies}")
+                _publish_prices(data)
                 return data
             else:
                 print(f"Crypto API error: {url} returned status code {response.status_code}")
@@ -53,11 +168,10 @@ def get_crypto_prices(crypto_ids, fiat_currency='usd', timeout=10, cache_duratio
     
     # Use centralized caching
     return cached_api_call(
-        cache=_cache,
+        cache=_get_cache(cache_key),
         fetch_function=fetch,
         cache_duration=cache_duration,
         cache_key=cache_key,
         force_refresh=force_refresh,
         api_name="Crypto API"
     )
-
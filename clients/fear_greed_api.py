@@ -3,17 +3,63 @@ Fear and Greed Index API Client
 
 Fetches cryptocurrency fear and greed index from Alternative.me
 API Documentation: https://alternative.me/crypto/fear-and-greed-index/
+
+With a history store, daily index values are kept locally: the store is
+backfilled with one ?limit=N request and then extended by the regular
+latest-value requests. Past values and moving averages are computed from the
+store without extra requests.
 """
 
-import requests
+import functools
+from . import http
+from .aggregator import aggregated
+from .snapshots import FearGreedSnapshot
 from utils.cache import create_cache, cached_api_call, DEFAULT_CACHE_DURATION
+from utils.events import publish, TOPIC_FEAR_GREED
+from utils.history import shared_series, day_number
 
 
 # Internal cache
 _cache = create_cache()
 
+# History series key (the store holds a single series)
+HISTORY_KEY = 'value'
+
+# History path -> day of the last backfill request (at most one per day)
+_backfill_days = {}
+
+
+def get_fear_greed_history(path, days):
+    """
+    Get the shared history store for the Fear & Greed Index
+
+    Args:
+        path: JSON file the history is persisted to
+        days: Days of history to keep (e.g. 30 for last month and the 30d average)
+
+    Returns:
+        DailySeries: Store keeping days + 1 daily values
+    """
+    return shared_series(path, days + 1)
+
+
+def _average(history, first_day, last_day):
+    """Get the average of a day range, or None if less than half of it is stored"""
+    values = history.values(HISTORY_KEY, first_day, last_day)
+    if len(values) * 2 < last_day - first_day + 1:
+        return None
+    return round(sum(values) / len(values))
 
-def get_fear_greed_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+
+def _past_value(history, day):
+    """Get the stored value of a day as int, or None"""
+    value = history.get(HISTORY_KEY, day)
+    return None if value is None else int(value)
+
+
+@aggregated('fear_greed', on_update=functools.partial(publish, TOPIC_FEAR_GREED))
+def get_fear_greed_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False,
+                         history=None, history_days=30):
     """Fetch Fear and Greed Index from Alternative.me API with caching
     
     The index ranges from 0 (Extreme Fear) to 100 (Extreme Greed)
@@ -22,29 +68,64 @@ def get_fear_greed_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, forc
         timeout: Request timeout in seconds
         cache_duration: Cache duration in seconds (default: 3600 = 1 hour)
         force_refresh: If True, bypasses cache
+        history: Optional DailySeries (see get_fear_greed_history()) for past values and averages
+        history_days: Days of history kept in the store
     
     Returns:
-        dict: Fear and Greed data if successful, None otherwise
-        Example response:
-        {
-            'value': '45',
-            'value_classification': 'Fear',
-            'timestamp': '1234567890',
-            'time_until_update': '43200'
-        }
+        FearGreedSnapshot: Fear and Greed data if successful, None otherwise
+        Example:
+        FearGreedSnapshot(value='45', classification='Fear', timestamp='1234567890',
+                          yesterday=41, last_week=60, last_month=25,
+                          average_7d=50, average_30d=44)
+        History fields are None without a history store or while data is missing.
     """
     # Define fetch function
     def fetch():
         url = "https://api.alternative.me/fng/"
+        params = None
+        
+        # One ?limit=N request fills the history; afterwards the latest value extends it
+        if history is not None:
+            today = day_number()
+            if (history.missing_days(HISTORY_KEY, today - history_days, today - 1)
+                    and _backfill_days.get(history.path) != today):
+                _backfill_days[history.path] = today
+                params = {'limit': history_days + 1}
+                print(f"- Backfilling {history_days} days of history")
         
         try:
-            response = requests.get(url, timeout=timeout)
+            response = http.get(url, params=params, timeout=timeout)
             if response.status_code == 200:
                 data = response.json()
-                # API returns {"data": [{"value": "45", ...}]}
+                # API returns {"data": [{"value": "45", ...}]}, newest first
                 if 'data' in data and len(data['data']) > 0:
-                    result = data['data'][0]
-                    print(f"- Index: {result.get('value')}")
+                    latest = data['data'][0]
+                    past = {}
+                    if history is not None:
+                        for point in data['data']:
+                            try:
+                                history.set(HISTORY_KEY, day_number(int(point['timestamp'])), float(point['value']))
+                            except (KeyError, TypeError, ValueError):
+                                continue
+                        history.save()
+                        
+                        today = day_number()
+                        past = {
+                            'yesterday': _past_value(history, today - 1),
+                            'last_week': _past_value(history, today - 7),
+                            'last_month': _past_value(history, today - 30),
+                            'average_7d': _average(history, today - 6, today),
+                            'average_30d': _average(history, today - 29, today),
+                        }
+                    
+                    result = FearGreedSnapshot(
+                        value=latest.get('value'),
+                        classification=latest.get('value_classification'),
+                        timestamp=latest.get('timestamp'),
+                        **past
+                    )
+                    print(f"- Index: {result.value}")
+                    publish(TOPIC_FEAR_GREED, result)
                     return result
                 return None
             else:
@@ -59,6 +140,7 @@ def get_fear_greed_index(timeout=10, cache_duration=DEFAULT_CACHE_DURATION, forc
         cache=_cache,
         fetch_function=fetch,
         cache_duration=cache_duration,
+        cache_key=f"history_{history_days}" if history is not None else None,
         force_refresh=force_refresh,
         api_name="Fear & Greed API"
     )
@@ -0,0 +1,447 @@
+"""
+HTTP Client Layer
+
+Shared entry point for every outgoing API request. Wraps requests and
+enforces a per-host request budget, so all clients talking to the same
+provider (e.g. the three CoinGecko clients) share one rate allowance.
+
+Each host also has a circuit breaker: after failure_threshold consecutive
+failures (network errors, 429 or 5xx responses) the circuit opens and
+requests fail immediately for cooldown seconds. Then a single probe request
+is let through (half-open); its outcome closes or re-opens the circuit.
+
+Timeouts are split into connect and read timeouts and capped at the calling
+thread's remaining fetch budget (utils.deadline). With no budget left the
+request is not sent at all.
+
+Transient failures (connection errors such as resets and DNS blips, and
+502/503/504 responses) are retried with jittered exponential backoff, as
+long as the fetch budget allows. GET requests are always retried; POST
+requests only when the caller marks them as read-only (retry=True).
+
+All traffic can be recorded to an archive, or an archive replayed instead of
+the network (see configure_traffic_archive() and traffic_archive.py).
+"""
+
+import random
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+from .traffic_archive import TrafficRecorder, TrafficReplayer
+from utils import clock, deadline, metrics
+
+
+class BudgetExceededError(requests.RequestException):
+    """Raised when a host's request budget is exhausted"""
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host's circuit breaker is open"""
+
+
+class DeadlineExceededError(requests.RequestException):
+    """Raised when the calling thread's fetch budget is used up"""
+
+
+# Circuit breaker states
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+# Breaker settings, shared by all hosts (see configure_breaker)
+_breaker_config = {'failure_threshold': 3, 'cooldown': 300}
+
+# Responses worth retrying (gateway/proxy hiccups)
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Retry settings (see configure_retries)
+_retry_config = {'max_retries': 2, 'base_delay': 0.5, 'max_delay': 4}
+
+# Timeout settings (see configure_timeouts)
+_timeout_config = {'connect_timeout': 3.05, 'min_timeout': 1}
+
+# Per-host breaker state: host -> {'state', 'failures', 'opened_at'}
+_breakers = {}
+_breaker_lock = threading.Lock()
+
+
+# Per-host budgets: host -> {'max_requests': int, 'window': seconds}
+_budgets = {}
+
+# Per-host timestamps of recent requests (only kept for budgeted hosts)
+_request_log = {}
+_budget_lock = threading.Lock()
+
+# Traffic archive (see configure_traffic_archive); at most one is set
+_archive = {'recorder': None, 'replayer': None}
+
+
+def set_budget(host, max_requests, window):
+    """
+    Limit how many requests may be sent to a host within a sliding window
+
+    Args:
+        host: Hostname (e.g. 'api.coingecko.com')
+        max_requests: Maximum number of requests per window
+        window: Window length in seconds
+    """
+    _budgets[host] = {'max_requests': max_requests, 'window': window}
+    _request_log.setdefault(host, deque())
+
+
+def _prune(host):
+    """Drop request timestamps that fell out of the host's window"""
+    log = _request_log[host]
+    cutoff = clock.now() - _budgets[host]['window']
+    while log and log[0] <= cutoff:
+        log.popleft()
+    return log
+
+
+def budget_remaining(host):
+    """
+    Get the number of requests still allowed for a host in the current window
+
+    Args:
+        host: Hostname
+
+    Returns:
+        int: Remaining requests, or None if the host has no budget
+    """
+    if host not in _budgets:
+        return None
+    with _budget_lock:
+        return max(0, _budgets[host]['max_requests'] - len(_prune(host)))
+
+
+def budget_fraction(host):
+    """
+    Get the remaining share of a host's budget
+
+    Returns:
+        float: 0.0 (exhausted) to 1.0 (unused); 1.0 if the host has no budget
+    """
+    remaining = budget_remaining(host)
+    if remaining is None:
+        return 1.0
+    return remaining / _budgets[host]['max_requests']
+
+
+def configure_breaker(failure_threshold, cooldown):
+    """
+    Set the circuit breaker settings for all hosts
+
+    Args:
+        failure_threshold: Consecutive failures before the circuit opens
+        cooldown: Seconds the circuit stays open before a probe request
+    """
+    _breaker_config['failure_threshold'] = failure_threshold
+    _breaker_config['cooldown'] = cooldown
+
+
+def breaker_state(host):
+    """
+    Get a host's circuit breaker state
+
+    Returns:
+        str: CIRCUIT_CLOSED, CIRCUIT_OPEN or CIRCUIT_HALF_OPEN
+    """
+    with _breaker_lock:
+        return _breakers.get(host, {}).get('state', CIRCUIT_CLOSED)
+
+
+def _set_state(host, breaker, state):
+    """Change a breaker's state (caller holds _breaker_lock)"""
+    if breaker['state'] != state:
+        print(f"HTTP: Circuit for {host} {state.replace('_', '-')}")
+    breaker['state'] = state
+    metrics.set_gauge(f'http.{host}.circuit', state)
+
+
+def _before_request(host, request_timeout):
+    """
+    Let a request through the host's breaker or fail fast
+
+    A probe that hasn't returned within cooldown plus its own timeout (e.g. a
+    request hung in DNS or abandoned by the watchdog) is given up, and the
+    next request becomes the probe.
+
+    Args:
+        host: Hostname
+        request_timeout: (connect, read) timeout of the request
+
+    Raises:
+        CircuitOpenError: If the circuit is open (or half-open with a probe in flight)
+    """
+    with _breaker_lock:
+        breaker = _breakers.setdefault(host, {'state': CIRCUIT_CLOSED, 'failures': 0, 'opened_at': 0})
+        now = clock.now()
+
+        if breaker['state'] == CIRCUIT_OPEN:
+            if now - breaker['opened_at'] < _breaker_config['cooldown']:
+                metrics.increment(f'http.{host}.short_circuited')
+                raise CircuitOpenError(f"Circuit open for {host}")
+            # Cooldown over: this request is the single probe
+            _set_state(host, breaker, CIRCUIT_HALF_OPEN)
+        elif breaker['state'] == CIRCUIT_HALF_OPEN:
+            if now - breaker['probe_started'] < _breaker_config['cooldown'] + breaker['probe_timeout']:
+                metrics.increment(f'http.{host}.short_circuited')
+                raise CircuitOpenError(f"Circuit half-open for {host}, probe in flight")
+            print(f"HTTP: Probe to {host} never returned, sending a new one")
+        else:
+            return
+
+        breaker['probe_started'] = now
+        breaker['probe_timeout'] = sum(request_timeout)
+
+
+def _after_request(host, success):
+    """Record a request outcome in the host's breaker"""
+    with _breaker_lock:
+        breaker = _breakers[host]
+        if success:
+            breaker['failures'] = 0
+            _set_state(host, breaker, CIRCUIT_CLOSED)
+            return
+
+        metrics.increment(f'http.{host}.failures')
+        breaker['failures'] += 1
+        if (breaker['state'] == CIRCUIT_HALF_OPEN
+                or breaker['failures'] >= _breaker_config['failure_threshold']):
+            breaker['opened_at'] = clock.now()
+            _set_state(host, breaker, CIRCUIT_OPEN)
+
+
+def _is_failure(response):
+    """Check if a response means the host is unhealthy (rate limited or server error)"""
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def configure_timeouts(connect_timeout, min_timeout):
+    """
+    Set request timeout settings
+
+    Args:
+        connect_timeout: Maximum seconds to establish a connection
+        min_timeout: Requests are skipped when less fetch budget than this is left
+    """
+    _timeout_config['connect_timeout'] = connect_timeout
+    _timeout_config['min_timeout'] = min_timeout
+
+
+def configure_retries(max_retries, base_delay, max_delay):
+    """
+    Set the retry policy for transient failures
+
+    Args:
+        max_retries: Retries after the first attempt (0 disables retries)
+        base_delay: Delay before the first retry in seconds (doubles every retry)
+        max_delay: Maximum delay between retries in seconds
+    """
+    _retry_config['max_retries'] = max_retries
+    _retry_config['base_delay'] = base_delay
+    _retry_config['max_delay'] = max_delay
+
+
+def configure_traffic_archive(mode, path, replay_speed=1.0):
+    """
+    Record all requests to an archive, or replay an archive instead of the network
+
+    Args:
+        mode: 'off', 'record' or 'replay'
+        path: Archive file (gzip JSON lines)
+        replay_speed: Replay latency scale (1.0 = recorded timing, 0 = as fast as possible)
+    """
+    if _archive['recorder'] is not None:
+        _archive['recorder'].close()
+    _archive['recorder'] = _archive['replayer'] = None
+
+    if mode == 'record':
+        _archive['recorder'] = TrafficRecorder(path)
+        print(f"HTTP: Recording traffic to {path}")
+    elif mode == 'replay':
+        _archive['replayer'] = TrafficReplayer(path, speed=replay_speed)
+        print(f"HTTP: Replaying traffic from {path} (speed {replay_speed or 'max'})")
+
+
+def _transport(method, url, params, json, timeout):
+    """Send a request over the network, recording it, or serve it from a replayed archive"""
+    replayer = _archive['replayer']
+    if replayer is not None:
+        return replayer.request(method, url, params=params, json=json, timeout=timeout)
+
+    recorder = _archive['recorder']
+    if recorder is None:
+        return requests.request(method, url, params=params, json=json, timeout=timeout)
+
+    started = clock.now()
+    try:
+        response = requests.request(method, url, params=params, json=json, timeout=timeout)
+    except Exception as e:
+        recorder.record(method, url, params, json, started, clock.now() - started, error=e)
+        raise
+    recorder.record(method, url, params, json, started, clock.now() - started, response=response)
+    return response
+
+
+def _request_timeout(timeout):
+    """
+    Get the (connect, read) timeout for a request, capped by the fetch budget
+
+    Raises:
+        DeadlineExceededError: If the fetch budget is used up
+    """
+    left = deadline.remaining()
+    if left is not None and left < _timeout_config['min_timeout']:
+        # Too little left for a useful request: the budget counts as used up
+        deadline.charge(max(left, 0))
+        raise DeadlineExceededError("Fetch budget for this cycle is used up")
+
+    read_timeout = timeout if left is None else min(timeout, left)
+    return (min(_timeout_config['connect_timeout'], read_timeout), read_timeout)
+
+
+def _wait_before_retry(host, attempt, reason):
+    """
+    Sleep before retrying a transient failure, if the policy and budget allow it
+
+    Args:
+        host: Hostname
+        attempt: Number of the attempt that just failed (0 = first)
+        reason: Failure description for the log
+
+    Returns:
+        bool: True if the request should be retried
+    """
+    if attempt >= _retry_config['max_retries'] or breaker_state(host) == CIRCUIT_OPEN:
+        return False
+
+    delay = min(_retry_config['max_delay'], _retry_config['base_delay'] * 2 ** attempt)
+    delay *= random.uniform(0.5, 1.0)
+
+    # Don't sleep into the cycle's fetch budget if no useful request would follow
+    left = deadline.remaining()
+    if left is not None and left - delay < _timeout_config['min_timeout']:
+        return False
+
+    metrics.increment(f'http.{host}.retries')
+    print(f"HTTP: {host} {reason}, retry {attempt + 1}/{_retry_config['max_retries']} in {delay:.1f}s")
+    clock.sleep(delay)
+    deadline.charge(delay)
+    return True
+
+
+def get(url, params=None, timeout=10):
+    """
+    Send a GET request through the shared client layer
+
+    Transient failures are retried (see configure_retries).
+
+    Args:
+        url: Request URL
+        params: Optional query parameters
+        timeout: Read timeout in seconds (capped by the remaining fetch budget)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        DeadlineExceededError: If the thread's fetch budget is used up
+        CircuitOpenError: If the host's circuit breaker is open
+        BudgetExceededError: If the host's request budget is exhausted
+        requests.RequestException: On network errors
+    """
+    return _request('GET', url, params=params, timeout=timeout, retry=True)
+
+
+def post(url, params=None, json=None, timeout=10, retry=False):
+    """
+    Send a POST request through the shared client layer
+
+    Args:
+        url: Request URL
+        params: Optional query parameters
+        json: Optional JSON body
+        timeout: Read timeout in seconds (capped by the remaining fetch budget)
+        retry: Retry transient failures (only for read-only requests, e.g. bulk lookups)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        Same as get()
+    """
+    return _request('POST', url, params=params, json=json, timeout=timeout, retry=retry)
+
+
+def _request(method, url, params=None, json=None, timeout=10, retry=True):
+    """
+    Send a request, retrying transient failures if allowed
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        params: Optional query parameters
+        json: Optional JSON body
+        timeout: Read timeout in seconds (capped by the remaining fetch budget)
+        retry: Whether transient failures may be retried
+
+    Returns:
+        requests.Response
+
+    Raises:
+        DeadlineExceededError: If the thread's fetch budget is used up
+        CircuitOpenError: If the host's circuit breaker is open
+        BudgetExceededError: If the host's request budget is exhausted
+        requests.RequestException: On network errors
+    """
+    host = urlparse(url).hostname
+
+    attempt = 0
+    while True:
+        try:
+            response = _send(method, host, url, params, json, timeout)
+        except requests.ConnectionError as e:
+            if not retry or not _wait_before_retry(host, attempt, type(e).__name__):
+                raise
+        else:
+            if (not retry or response.status_code not in RETRY_STATUS_CODES
+                    or not _wait_before_retry(host, attempt, f"returned {response.status_code}")):
+                return response
+        attempt += 1
+
+
+def _send(method, host, url, params, json, timeout):
+    """Send a single request attempt through the deadline, breaker and budget checks"""
+    try:
+        request_timeout = _request_timeout(timeout)
+    except DeadlineExceededError:
+        metrics.increment(f'http.{host}.deadline_skipped')
+        raise
+
+    _before_request(host, request_timeout)
+
+    if host in _budgets:
+        with _budget_lock:
+            if len(_prune(host)) >= _budgets[host]['max_requests']:
+                # No request was sent, so the breaker (and a pending probe) stays as it was
+                with _breaker_lock:
+                    if _breakers[host]['state'] == CIRCUIT_HALF_OPEN:
+                        _set_state(host, _breakers[host], CIRCUIT_OPEN)
+                raise BudgetExceededError(f"Request budget exhausted for {host}")
+            _request_log[host].append(clock.now())
+
+    metrics.increment(f'http.{host}.requests')
+    started = clock.now()
+    try:
+        response = _transport(method, url, params, json, request_timeout)
+    except Exception:
+        _after_request(host, success=False)
+        raise
+    finally:
+        deadline.charge(clock.now() - started)
+
+    _after_request(host, success=not _is_failure(response))
+    return response
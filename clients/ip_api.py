@@ -1,6 +1,6 @@
 """IP API Client - Handles HTTP requests to IP address service"""
 
-import requests
+from . import http
 
 
 def get_ip_address(timeout=10):
@@ -17,7 +17,7 @@ def get_ip_address(timeout=10):
     params = {'format': 'json'}
     
     try:
-        response = requests.get(url, params=params, timeout=timeout)
+        response = http.get(url, params=params, timeout=timeout)
         if response.status_code == 200:
             data = response.json()
             if 'ip' in data:
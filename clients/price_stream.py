@@ -0,0 +1,205 @@
+"""
+Streaming Price Feed Client
+
+Subscribes to a WebSocket ticker feed (Binance combined streams by default)
+in a background thread and keeps the latest price per coin in memory.
+Reconnects with exponential backoff; callers fall back to the polling
+client (crypto_api) whenever the stream is not live.
+
+Requires the optional 'websocket-client' package.
+
+Stream documentation: https://developers.binance.com/docs/binance-spot-api-docs/web-socket-streams
+"""
+
+import json
+import random
+import threading
+import time
+from .snapshots import PriceSnapshot
+from utils.events import publish, TOPIC_CRYPTO_PRICES
+
+try:
+    import websocket
+except ImportError:  # Optional dependency
+    websocket = None
+
+
+DEFAULT_STREAM_URL = "wss://stream.binance.com:9443/stream"
+
+# Streams shared between module instances (e.g. one per display)
+_shared_streams = {}
+_stream_users = {}  # key -> number of module instances using the stream
+_shared_lock = threading.Lock()
+
+
+def get_shared_stream(symbols, fiat, url=DEFAULT_STREAM_URL, pairs=None, stale_after=30, max_backoff=60):
+    """
+    Get a started PriceStream, reusing an existing one with the same settings
+
+    Call release_shared_stream() when the stream is no longer needed.
+
+    Returns:
+        PriceStream: Running stream, or None if streaming is unavailable
+    """
+    key = (tuple(sorted(symbols.items())), fiat, url, tuple(sorted((pairs or {}).items())))
+    with _shared_lock:
+        if key not in _shared_streams:
+            stream = PriceStream(symbols, fiat, url=url, pairs=pairs,
+                                 stale_after=stale_after, max_backoff=max_backoff)
+            _shared_streams[key] = stream if stream.start() else None
+            _stream_users[key] = 0
+        _stream_users[key] += 1
+        return _shared_streams[key]
+
+
+def release_shared_stream(stream):
+    """
+    Stop using a stream from get_shared_stream(); stops it after the last user
+
+    Args:
+        stream: PriceStream returned by get_shared_stream()
+    """
+    with _shared_lock:
+        for key, shared in list(_shared_streams.items()):
+            if shared is stream:
+                _stream_users[key] -= 1
+                if _stream_users[key] <= 0:
+                    del _shared_streams[key], _stream_users[key]
+                    stream.stop()
+                return
+
+
+class PriceStream:
+    """
+    Latest-price cache fed by a WebSocket ticker stream
+
+    Prices are stored in the same shape as crypto_api.get_crypto_prices():
+    {'bitcoin': PriceSnapshot(price=65000.12, change_24h=2.3), ...}
+    """
+
+    def __init__(self, symbols, fiat, url=DEFAULT_STREAM_URL, pairs=None,
+                 stale_after=30, max_backoff=60):
+        """
+        Initialize the price stream (call start() to connect)
+
+        Args:
+            symbols: Dict of acronym -> CoinGecko id
+            fiat: Fiat currency the prices are reported in (e.g. 'usd')
+            url: Combined-stream WebSocket endpoint
+            pairs: Optional dict of acronym -> exchange pair (e.g. {'BTC': 'btcusdt'})
+            stale_after: Seconds without a message before the stream counts as down
+            max_backoff: Maximum seconds between reconnect attempts
+        """
+        self.fiat = fiat
+        self.url = url
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+
+        # USD prices come from USDT pairs; other fiats trade directly (e.g. btceur)
+        quote = 'usdt' if fiat.lower() == 'usd' else fiat.lower()
+        pairs = pairs or {}
+        self._pair_to_id = {
+            pairs.get(acronym, f"{acronym.lower()}{quote}").upper(): crypto_id
+            for acronym, crypto_id in symbols.items()
+        }
+
+        self._prices = {}
+        self._last_message = 0
+        self._connected = False
+        self._running = False
+        self._ws = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _stream_url(self):
+        """Build the combined-stream URL for all configured pairs"""
+        streams = '/'.join(f"{pair.lower()}@ticker" for pair in self._pair_to_id)
+        return f"{self.url}?streams={streams}"
+
+    def start(self):
+        """Start the background connection thread"""
+        if websocket is None:
+            print("Price stream: 'websocket-client' not installed, using polling only")
+            return False
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="price-stream", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the stream and close the connection"""
+        self._running = False
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def is_live(self):
+        """
+        Check if the stream is connected and recently received data
+
+        Returns:
+            bool: True if prices from the stream are current
+        """
+        return self._connected and time.time() - self._last_message < self.stale_after
+
+    def snapshot(self):
+        """
+        Get the latest streamed prices
+
+        Returns:
+            dict: Crypto ID -> PriceSnapshot (copy of the mapping; snapshots are immutable)
+        """
+        with self._lock:
+            return dict(self._prices)
+
+    def _run(self):
+        """Connection loop with exponential backoff and jitter"""
+        backoff = 1
+        while self._running:
+            try:
+                self._ws = websocket.create_connection(self._stream_url(), timeout=self.stale_after)
+                print("Price stream: Connected")
+                backoff = 1
+                while self._running:
+                    message = self._ws.recv()
+                    if not message:
+                        raise ConnectionError("stream closed by server")
+                    self._handle_message(message)
+            except Exception as e:
+                if self._running:
+                    print(f"Price stream: Disconnected ({e}), retrying in {backoff}s")
+            finally:
+                self._connected = False
+                if self._ws is not None:
+                    try:
+                        self._ws.close()
+                    except Exception:
+                        pass
+                    self._ws = None
+
+            if self._running:
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+                backoff = min(self.max_backoff, backoff * 2)
+
+    def _handle_message(self, message):
+        """Parse one ticker message and update the latest price"""
+        try:
+            data = json.loads(message).get('data', {})
+            crypto_id = self._pair_to_id.get(data.get('s'))
+            if crypto_id is None:
+                return
+            values = PriceSnapshot(round(float(data['c']), 2), float(data['P']))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            print("Price stream: Ignoring malformed message")
+            return
+
+        with self._lock:
+            self._prices[crypto_id] = values
+        self._last_message = time.time()
+        self._connected = True
+
+        publish(TOPIC_CRYPTO_PRICES, {'prices': {crypto_id: values}, 'fiat': self.fiat})
@@ -0,0 +1,137 @@
+"""
+Data Snapshots
+
+Compact, immutable records that API clients return instead of raw JSON.
+Each client projects its response onto the few fields the modules use, so
+the cache and the modules share one small object per refresh.
+
+Missing fields are stored as None; modules show '--' for them.
+"""
+
+
+class Snapshot:
+    """
+    Immutable record base class
+
+    Subclasses list their fields in __slots__; values are given positionally
+    or by keyword, in __slots__ order.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.__slots__, args))
+        values.update(kwargs)
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class PriceSnapshot(Snapshot):
+    """Price of one coin in the requested fiat currency"""
+
+    __slots__ = ('price', 'change_24h')
+
+
+class WeatherSnapshot(Snapshot):
+    """Current weather for one location"""
+
+    __slots__ = ('name', 'country', 'temp_c', 'temp_f', 'feelslike_c', 'feelslike_f', 'condition')
+
+    @classmethod
+    def from_response(cls, data):
+        """
+        Project a WeatherAPI current.json response
+
+        Args:
+            data: Dict with 'location' and 'current' blocks
+
+        Returns:
+            WeatherSnapshot
+        """
+        location = data.get('location', {})
+        current = data.get('current', {})
+        return cls(
+            name=location.get('name'),
+            country=location.get('country'),
+            temp_c=current.get('temp_c'),
+            temp_f=current.get('temp_f'),
+            feelslike_c=current.get('feelslike_c'),
+            feelslike_f=current.get('feelslike_f'),
+            condition=current.get('condition', {}).get('text')
+        )
+
+
+class FearGreedSnapshot(Snapshot):
+    """Latest Fear & Greed Index value, plus past values and averages from the history store"""
+
+    __slots__ = (
+        'value', 'classification', 'timestamp',
+        'yesterday', 'last_week', 'last_month', 'average_7d', 'average_30d'
+    )
+
+
+class GlobalSnapshot(Snapshot):
+    """Global market data (total market cap per currency, BTC dominance)"""
+
+    __slots__ = ('total_market_cap', 'market_cap_change_24h', 'btc_dominance', 'timestamp')
+
+
+class AltSeasonSnapshot(Snapshot):
+    """Altcoin Season Index for 7 and 30 days, plus the optional rolling window"""
+
+    __slots__ = ('value_7d', 'value_30d', 'value_rolling', 'timestamp')
+
+
+def to_json(value):
+    """
+    Convert snapshots (also inside dicts and lists) into JSON-compatible values
+
+    Each snapshot becomes a dict of its fields plus a '_type' tag, so
+    from_json() can rebuild it (e.g. for the LAN aggregator).
+    """
+    if isinstance(value, Snapshot):
+        fields = {name: getattr(value, name) for name in value.__slots__}
+        fields['_type'] = type(value).__name__
+        return fields
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
+
+
+def from_json(value):
+    """Rebuild snapshots from the output of to_json()"""
+    if isinstance(value, dict):
+        type_name = value.get('_type')
+        snapshot_type = _SNAPSHOT_TYPES.get(type_name)
+        if snapshot_type is not None:
+            return snapshot_type(**{name: item for name, item in value.items() if name != '_type'})
+        return {key: from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [from_json(item) for item in value]
+    return value
+
+
+_SNAPSHOT_TYPES = {
+    snapshot_type.__name__: snapshot_type
+    for snapshot_type in (PriceSnapshot, WeatherSnapshot, FearGreedSnapshot, GlobalSnapshot, AltSeasonSnapshot)
+}
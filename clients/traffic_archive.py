@@ -0,0 +1,221 @@
+"""
+API Traffic Archive
+
+Records every request sent through clients/http.py (method, URL, params,
+status, headers, body, latency) into a gzip-compressed, append-only JSON
+lines archive, and replays such an archive in place of the network.
+
+Replays run the full application (budgets, breaker, retries, caches, modules)
+against real captured data, e.g. a crash-day /coins/markets response, for
+reproducible behavior and performance runs.
+
+Archive format: one JSON object per line, e.g.
+    {"time": 1700000000.1, "method": "GET", "url": "...", "params": {...},
+     "json": null, "status": 200, "headers": {...}, "body": "...",
+     "latency": 0.412}
+Failed requests store "error_type" (requests exception class, e.g. "ReadTimeout")
+and "error" (type and message) instead of a response; replays raise the same
+exception type, so retries behave as they did when recording.
+
+Credentials in query parameters (e.g. the WeatherAPI key) are masked.
+Each recording session appends a new gzip member, so archives can be
+extended across runs and read back in one pass.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import threading
+import zlib
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils import clock
+
+
+# Query parameters holding credentials; stored as '***' so archives can be shared
+REDACTED_PARAMS = ('key', 'api_key', 'apikey', 'token')
+
+
+def _redact(params):
+    """Copy of the query parameters with credentials masked"""
+    if not params:
+        return params
+    return {name: '***' if name in REDACTED_PARAMS else value for name, value in params.items()}
+
+
+def _request_key(method, url, params, body):
+    """Key that identifies the same request across recording and replay"""
+    return json.dumps([method, url, _redact(params) or {}, body], sort_keys=True)
+
+
+def _replayed_error(entry):
+    """
+    Build the requests exception a failed request was recorded with
+
+    Unknown types (and archives without "error_type") replay as ConnectionError.
+    """
+    name = entry.get('error_type') or entry['error'].split(':', 1)[0]
+    error_class = getattr(requests.exceptions, name, None)
+    if not isinstance(error_class, type) or not issubclass(error_class, requests.RequestException):
+        error_class = requests.ConnectionError
+    return error_class(f"Replayed failure: {entry['error']}")
+
+
+def _read_lines(path):
+    """
+    Read all lines of an archive
+
+    An unfinished last gzip member (recording still running or killed) is
+    read up to its last flushed line.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    text = b''
+    while data:
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)  # gzip member
+        text += decompressor.decompress(data)
+        if not decompressor.eof:
+            break
+        data = decompressor.unused_data
+    return text.decode('utf-8', errors='replace').splitlines()
+
+
+class TrafficRecorder:
+    """Appends requests and responses to a gzip JSON lines archive"""
+
+    def __init__(self, path):
+        """
+        Open the archive for appending
+
+        Args:
+            path: Archive file (e.g. 'data/traffic.jsonl.gz')
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def record(self, method, url, params, body, started, latency, response=None, error=None):
+        """
+        Append one request with its response or error
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query parameters (or None)
+            body: JSON request body (or None)
+            started: Unix time the request was sent
+            latency: Seconds until the response (or error)
+            response: requests.Response, if one was received
+            error: Exception raised instead of a response
+        """
+        entry = {
+            'time': started,
+            'method': method,
+            'url': url,
+            'params': _redact(params),
+            'json': body,
+            'latency': round(latency, 4),
+        }
+        if response is not None:
+            entry['status'] = response.status_code
+            entry['headers'] = dict(response.headers)
+            entry['body'] = response.content.decode('utf-8', errors='replace')
+        else:
+            entry['error_type'] = type(error).__name__
+            entry['error'] = f"{type(error).__name__}: {error}"
+
+        line = json.dumps(entry, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            # Keep the archive readable if the process is killed
+            self._file.flush()
+
+    def close(self):
+        """Close the archive"""
+        with self._lock:
+            self._file.close()
+
+
+class TrafficReplayer:
+    """Serves recorded responses in place of the network"""
+
+    def __init__(self, path, speed=1.0):
+        """
+        Load an archive
+
+        Args:
+            path: Archive file written by TrafficRecorder
+            speed: Latency scale (1.0 = recorded latency, 2.0 = twice as fast,
+                   0 = no delay, as fast as possible)
+        """
+        self.path = path
+        self.speed = speed
+        self._responses = {}  # request key -> deque of recorded entries, in recorded order
+        self._lock = threading.Lock()
+
+        count = 0
+        for line in _read_lines(path):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # truncated last line of an interrupted recording
+            key = _request_key(entry['method'], entry['url'], entry.get('params'), entry.get('json'))
+            self._responses.setdefault(key, deque()).append(entry)
+            count += 1
+        print(f"Traffic replay: Loaded {count} responses for {len(self._responses)} requests from {path}")
+
+    def _next_entry(self, key):
+        """Get the next recorded entry of a request; the last one repeats once all were served"""
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                return None
+            if len(entries) > 1:
+                return entries.popleft()
+            return entries[0]
+
+    def request(self, method, url, params=None, json=None, timeout=None):
+        """
+        Replay a request (same signature as requests.request)
+
+        Waits for the recorded latency (scaled by speed); a latency beyond the
+        read timeout ends in requests.Timeout, just like the real request would.
+
+        Returns:
+            requests.Response: Recorded response
+
+        Raises:
+            requests.ConnectionError: If the request is not in the archive
+            requests.RequestException: The recorded exception type, if it was recorded as failed
+            requests.ReadTimeout: If the recorded latency exceeds the timeout
+        """
+        entry = self._next_entry(_request_key(method, url, params, json))
+        if entry is None:
+            raise requests.ConnectionError(f"Not in traffic archive: {method} {url}")
+
+        latency = entry['latency'] / self.speed if self.speed else 0
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and latency > read_timeout:
+            clock.sleep(read_timeout)
+            raise requests.ReadTimeout(f"Replayed latency {entry['latency']}s exceeds timeout")
+        if latency:
+            clock.sleep(latency)
+
+        if 'error' in entry:
+            raise _replayed_error(entry)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        response.elapsed = datetime.timedelta(seconds=entry['latency'])
+        return response
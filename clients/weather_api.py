@@ -1,13 +1,25 @@
 """Weather API Client - Handles HTTP requests to WeatherAPI"""
 
-import requests
-from utils.cache import create_cache, cached_api_call, DEFAULT_CACHE_DURATION
+import threading
+from . import http
+from .aggregator import aggregated
+from .snapshots import WeatherSnapshot
+from utils import deadline
+from utils.cache import (create_cache, cached_api_call, is_cache_valid, claim_refresh, finish_refresh,
+                         wait_for_refresh, DEFAULT_CACHE_DURATION)
 
 
+WEATHER_URL = "http://api.weatherapi.com/v1/current.json"
+
 # Internal cache
 _cache = create_cache()
 
+# Per-location caches for bulk requests (location -> cache)
+_location_caches = {}
+_bulk_lock = threading.Lock()  # Guards the location caches; never held while fetching
+
 
+@aggregated('weather', 'location')
 def get_weather(api_key, location, timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
     """
     Fetch weather data from WeatherAPI with caching
@@ -20,23 +32,23 @@ def get_weather(api_key, location, timeout=10, cache_duration=DEFAULT_CACHE_DURA
         force_refresh: If True, bypasses cache
         
     Returns:
-        Weather data dict if successful, None if failed
+        WeatherSnapshot if successful, None if failed
     """
     cache_key = f"{api_key}_{location}"
     
     # Define fetch function
     def fetch():
-        url = "http://api.weatherapi.com/v1/current.json"
+        url = WEATHER_URL
         params = {
             'q': location,
             'key': api_key
         }
         
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = http.get(url, params=params, timeout=timeout)
             if response.status_code == 200:
-                data = response.json()
-                print(f"- {data.get('location', {}).get('name', 'Unknown')}")
+                data = WeatherSnapshot.from_response(response.json())
+                print(f"- {data.name or 'Unknown'}")
                 return data
             else:
                 print(f"Weather API error: {url} returned status code {response.status_code}")
@@ -55,3 +67,126 @@ def get_weather(api_key, location, timeout=10, cache_duration=DEFAULT_CACHE_DURA
         api_name="Weather API"
     )
 
+
+
+def _fetch_bulk(api_key, locations, timeout):
+    """
+    Fetch current weather for several locations in one bulk request
+
+    Returns:
+        dict: Location -> WeatherSnapshot (locations the API couldn't resolve
+              are missing), or None if the request failed
+    """
+    params = {'key': api_key, 'q': 'bulk'}
+    body = {'locations': [{'q': location, 'custom_id': str(index)} for index, location in enumerate(locations)]}
+
+    try:
+        # Bulk lookups are read-only, so transient failures may be retried
+        response = http.post(WEATHER_URL, params=params, json=body, timeout=timeout, retry=True)
+        if response.status_code != 200:
+            print(f"Weather API error: bulk request returned status code {response.status_code}")
+            return None
+
+        results = {}
+        for item in response.json().get('bulk', []):
+            query = item.get('query', {})
+            index = query.get('custom_id', '')
+            if not index.isdigit() or int(index) >= len(locations) or 'current' not in query:
+                continue
+            results[locations[int(index)]] = WeatherSnapshot.from_response(query)
+        return results
+    except Exception as e:
+        print(f"Unexpected error fetching bulk weather data: {e}")
+        return None
+
+
+@aggregated('weather_bulk', 'locations')
+def get_weather_bulk(api_key, locations, timeout=10, cache_duration=DEFAULT_CACHE_DURATION, force_refresh=False):
+    """
+    Fetch weather data for several locations with one request per refresh
+
+    Every location has its own cache; all expired locations are refreshed
+    together in a single WeatherAPI bulk request.
+
+    Args:
+        api_key: WeatherAPI key
+        locations: List of location queries (city name, IP, 'lat,lon', ...)
+        timeout: Request timeout in seconds
+        cache_duration: Cache duration in seconds (default: 600 = 10 minutes)
+        force_refresh: If True, bypasses cache
+
+    Returns:
+        dict: Location -> WeatherSnapshot, or None if the bulk request failed
+
+    Raises:
+        FetchSkippedError: If the fetch budget was used up before fresh data arrived
+    """
+    claimed = []   # expired locations this call refreshes
+    waiting = {}   # location -> refresh another caller has in flight
+    refresh = None
+    with _bulk_lock:
+        results = {}
+        for location in locations:
+            cache = _location_caches.setdefault(location, create_cache())
+            if not force_refresh and is_cache_valid(cache, cache_duration, api_key):
+                if cache['data']:
+                    results[location] = cache['data']
+                continue
+            # All locations claimed by this call share one refresh
+            location_refresh, owner = claim_refresh(cache, refresh)
+            if owner:
+                refresh = location_refresh
+                claimed.append(location)
+            else:
+                waiting[location] = location_refresh
+
+    if not claimed and not waiting:
+        print(f"Weather API: Using cached data for {len(locations)} locations")
+        return results
+
+    # Fetch without the lock, so a hung request blocks no other caller
+    fresh = None
+    if claimed:
+        try:
+            fresh = _fetch_bulk(api_key, claimed, timeout)
+        finally:
+            with _bulk_lock:
+                for location in claimed:
+                    cache = _location_caches[location]
+                    last_data = cache['data'] if cache.get('key') == api_key else None
+                    if fresh is None:
+                        finish_refresh(cache, refresh, None)
+                    elif location in fresh:
+                        finish_refresh(cache, refresh, fresh[location], cache_duration, api_key)
+                    else:
+                        # Not resolved by the API: don't ask again before the next interval
+                        # (an empty dict marks "no data" in the cache)
+                        finish_refresh(cache, refresh, last_data or {}, cache_duration, api_key)
+        if fresh is None:
+            if deadline.expired():
+                print("Weather API: Fetch budget used up, refresh skipped until the next rotation")
+                raise deadline.FetchSkippedError("Weather API: fetch budget used up")
+            return None
+        print(f"Weather API: Fresh data fetched for {len(fresh)}/{len(claimed)} locations")
+
+    # Locations another caller is refreshing: wait for it, then take what is cached
+    in_flight = False
+    for other in {id(other): other for other in waiting.values()}.values():
+        if not wait_for_refresh(other):
+            in_flight = True
+    if in_flight:
+        if deadline.expired():
+            print("Weather API: Fetch budget used up, refresh skipped until the next rotation")
+            raise deadline.FetchSkippedError("Weather API: fetch budget used up")
+        # Hung (e.g. abandoned by the watchdog): don't block on it
+        print("Weather API: Refresh still in flight, serving cached data")
+
+    with _bulk_lock:
+        for location in locations:
+            cache = _location_caches[location]
+            if fresh and location in fresh:
+                results[location] = fresh[location]
+            elif cache['data'] and cache.get('key') == api_key:
+                results[location] = cache['data']
+    return results
+
@@ -16,6 +16,7 @@ LCD_CONFIG = {
     'cols': 16,
     'rows': 2,
     'dotsize': 8,
+    'charmap': 'A00',  # character ROM of the controller ('A00' or 'A02')
     'max_size': 16
 }
 
@@ -28,9 +29,12 @@ WEATHER_MODULE_CONFIG = {
     'update_interval': 600,
     'display_duration': 5,
     'timeout': 10,
-    'lcd_max_size': LCD_CONFIG['max_size'],
     'max_failed_attempts': 3,
-    'temperature_unit': 'C'  # Options: 'C' (Celsius) or 'F' (Fahrenheit)
+    'temperature_unit': 'C',  # Options: 'C' (Celsius) or 'F' (Fahrenheit)
+    # Empty = device location (public IP). Several locations are fetched in one
+    # bulk request (needs a WeatherAPI plan with bulk requests), e.g.
+    # ['London', 'Sao Paulo', '40.71,-74.01']
+    'locations': []
 }
 
 # ============================================================================
@@ -44,11 +48,29 @@ CRYPTO_MODULE_CONFIG = {
         'SOL': 'solana',
     },
     'fiat': 'usd',
+    'extra_fiats': [],           # e.g. ['eur', 'brl'], fetched in the same request
     'update_interval': 600,
     'display_duration': 10,
     'timeout': 10,
-    'lcd_max_size': LCD_CONFIG['max_size'],
-    'max_failed_attempts': 3
+    'max_failed_attempts': 3,
+    # Refresh faster while prices move fast, slower while they are flat
+    'adaptive_interval': {
+        'enabled': True,
+        'min_interval': 150,     # seconds
+        'max_interval': 1800,    # seconds
+        'fast_move_pct': 1.0,    # any price moved >= 1% since last fetch -> halve interval
+        'flat_move_pct': 0.2,    # all prices moved <= 0.2% -> interval x1.5
+        'budget_reserve': 0.25   # never shorten with less than 25% of the API budget left
+    },
+    # Push-based prices from a WebSocket ticker feed (requires 'websocket-client').
+    # Falls back to polling CoinGecko whenever the stream is down.
+    'stream': {
+        'enabled': False,
+        'url': 'wss://stream.binance.com:9443/stream',
+        'pairs': {},             # Optional overrides, e.g. {'BTC': 'btcusdt'}
+        'stale_after': 30,       # seconds without data before falling back to polling
+        'max_backoff': 60        # max seconds between reconnect attempts
+    }
 }
 
 # ============================================================================
@@ -59,7 +81,16 @@ FEAR_GREED_MODULE_CONFIG = {
     'update_interval': 3600,  # 1 hour (index updates every 8 hours)
     'display_duration': 5,   # seconds
     'timeout': 10,
-    'max_failed_attempts': 3
+    'max_failed_attempts': 3,
+    
+    # Local daily history: adds screens with past values (1d/1w/1m ago) and
+    # 7d/30d averages. Backfilled with one request, then extended by the
+    # regular hourly request (no extra API calls).
+    'history': {
+        'enabled': True,
+        'path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fear_greed_history.json'),
+        'days': 30
+    }
 }
 
 # ============================================================================
@@ -79,14 +110,27 @@ MARKET_CAP_MODULE_CONFIG = {
 # ============================================================================
 # Displays Altcoin Season Index: % of top 100 coins outperforming BTC over 7d and 30d
 # Calculated using CoinGecko API (free, no API key required)
-# Shows 2 screens: Screen 1 (7d), Screen 2 (30d) with percentage + season classification
+# Shows 2 screens: Screen 1 (7d), Screen 2 (30d) with percentage + season classification,
+# plus Screen 3 (rolling 90d) once its history is available
 # Season indicators: 75%+ = Alt Season, 25%- = BTC Season, 25-75% = Mixed
 ALT_SEASON_MODULE_CONFIG = {
     'enabled': True,
     'update_interval': 600,   # 10 minutes
     'display_duration': 5,   # seconds
     'timeout': 10,
-    'max_failed_attempts': 3
+    'max_failed_attempts': 3,
+    
+    # Rolling index (e.g. 90 days) from a daily price history of the top 100 coins.
+    # Backfilled once from CoinGecko market charts (backfill_per_update coins per
+    # update, only while more than budget_reserve of the CoinGecko budget is left);
+    # afterwards today's prices come with the regular request.
+    'history': {
+        'enabled': True,
+        'path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'alt_season_history.json'),
+        'days': 90,
+        'backfill_per_update': 5,
+        'budget_reserve': 0.5
+    }
 }
 
 # ============================================================================
@@ -103,19 +147,245 @@ BTC_DOMINANCE_MODULE_CONFIG = {
     'max_failed_attempts': 3
 }
 
+# ============================================================================
+# PORTFOLIO MODULE CONFIGURATION
+# ============================================================================
+# Displays the value of your holdings: total value, 24h profit/loss and one
+# screen per holding. Held coins are priced in the crypto module's request, so
+# the portfolio adds no API calls while that module runs (keep update_interval
+# at or above the crypto module's). Add 'portfolio' to MODULE_ORDER to show it.
+PORTFOLIO_MODULE_CONFIG = {
+    'enabled': False,
+    'holdings': {
+        'BTC': {'id': 'bitcoin', 'amount': 0.05},
+        'ETH': {'id': 'ethereum', 'amount': 1.2},
+    },
+    'fiat': 'usd',
+    'show_holdings': True,       # one screen per holding after total and 24h P&L
+    'update_interval': 600,
+    'display_duration': 5,
+    'timeout': 10,
+    'max_failed_attempts': 3
+}
+
+# ============================================================================
+# PRICE ALERT CONFIGURATION
+# ============================================================================
+# Alerts are checked on every fresh price fetch for symbols in CRYPTO_MODULE_CONFIG
+# (prices in its 'fiat'). A firing alert interrupts the rotation immediately.
+# Rule types:
+#   {'symbol': 'BTC', 'type': 'above', 'level': 100000}           # crosses above level
+#   {'symbol': 'BTC', 'type': 'below', 'level': 50000}            # crosses below level
+#   {'symbol': 'BTC', 'type': 'move', 'percent': 3, 'window': 3600}  # moves 3% within 1h
+# Acknowledge latched alerts with: kill -USR1 <pid>
+PRICE_ALERT_CONFIG = {
+    'enabled': False,
+    'display_duration': 5,      # seconds per alert screen
+    'latch_timeout': 1800,      # alerts clear themselves after 30 minutes
+    'reminder_interval': 120,   # re-show latched alerts every 2 minutes
+    'rules': [
+        {'symbol': 'BTC', 'type': 'move', 'percent': 3, 'window': 3600},
+        {'symbol': 'ETH', 'type': 'move', 'percent': 3, 'window': 3600},
+    ]
+}
+
 # ============================================================================
 # APPLICATION CONFIGURATION
 # ============================================================================
 APP_CONFIG = {
     'version': 'V1.0.0',
     'connection_timeout': 10,
-    'retry_delay': 5
+    'retry_delay': 5,
+    'metrics_log_interval': 900,  # seconds between metrics log lines (0 = off)
+    'config_reload_interval': 5,  # seconds between checks for config.py changes (0 = off)
+    # 'system' = real time; 'virtual' = simulated time that skips over sleeps,
+    # for accelerated soak runs (e.g. with TRAFFIC_ARCHIVE_MODE=replay)
+    'clock': os.getenv('TICKER_CLOCK', 'system')
+}
+
+# ============================================================================
+# API REQUEST BUDGET
+# ============================================================================
+# Shared per-host request budget across all clients (sliding window).
+# Requests over budget fail fast and modules keep their previous data.
+API_BUDGET_CONFIG = {
+    'api.coingecko.com': {'max_requests': 60, 'window': 3600}
+}
+
+# ============================================================================
+# FETCH BUDGET
+# ============================================================================
+# Limits how long one rotation may wait for the network in total. Each request
+# gets separate connect and read timeouts, capped at what is left of the
+# budget; once it is used up, modules show cached data until the next rotation.
+# Worst case, a rotation spends 'cycle_budget' seconds fetching.
+FETCH_BUDGET_CONFIG = {
+    'cycle_budget': 20,         # seconds of fetching per rotation (None = no limit)
+    'connect_timeout': 3.05,    # seconds to establish a connection
+    'min_request_timeout': 1    # skip requests when less budget than this is left
+}
+
+# ============================================================================
+# RETRY POLICY
+# ============================================================================
+# Transient failures (connection reset, DNS blip, 502/503/504) are retried
+# with exponential backoff and jitter, within the rotation's fetch budget.
+RETRY_CONFIG = {
+    'max_retries': 2,    # retries after the first attempt (0 = off)
+    'base_delay': 0.5,   # seconds before the first retry, doubled each retry
+    'max_delay': 4       # seconds, upper limit per delay
+}
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+# Per-host breaker for all clients. After 'failure_threshold' consecutive
+# failures (network error, 429 or 5xx) requests to that host fail instantly
+# for 'cooldown' seconds, then one probe request decides whether it recovered.
+CIRCUIT_BREAKER_CONFIG = {
+    'failure_threshold': 3,
+    'cooldown': 300   # seconds
+}
+
+# ============================================================================
+# WATCHDOG
+# ============================================================================
+# Module refreshes run with a hard time limit: a request hung in DNS
+# resolution or on a half-open socket is abandoned after 'fetch_timeout' and
+# the display shows "Data delayed", then cached data. Under systemd with
+# Type=notify and WatchdogSec= (see docs/SYSTEMD_SETUP.md), WATCHDOG=1 pings
+# are only sent while every display made progress within 'stall_timeout', so
+# a wedged process is restarted. Keep 'stall_timeout' above 'fetch_timeout'
+# and QUIET_HOURS_CONFIG['redraw_interval'].
+WATCHDOG_CONFIG = {
+    'enabled': True,
+    'fetch_timeout': 60,         # seconds one module refresh may take
+    'stall_timeout': 180,        # seconds a display may go without progress
+    'max_stuck_workers': 5       # abandoned refreshes still hanging before restart
+}
+
+# ============================================================================
+# LAN AGGREGATOR
+# ============================================================================
+# Lets tickers on the same network share one set of upstream API requests.
+# 'server': this ticker fetches as usual and also serves its data on
+#           http://<host>:<port>/v1/... (refreshed at its module update intervals)
+# 'client': data is read from the aggregator at 'url' (weather uses the
+#           server's API key); while it is unreachable, APIs are called directly
+AGGREGATOR_CONFIG = {
+    'mode': 'off',                       # 'off', 'server' or 'client'
+    'host': '0.0.0.0',                   # server: listen address
+    'port': 8765,                        # server: listen port
+    'url': 'http://192.168.1.10:8765',   # client: aggregator address
+    'long_poll': 30,                     # seconds a request waits for new data
+    'timeout': 3,                        # client: seconds to wait for the first answer
+    'idle_timeout': 900                  # seconds before unused requests are dropped
+}
+
+# ============================================================================
+# TRAFFIC ARCHIVE
+# ============================================================================
+# 'record': every API request and response is appended to 'path' (gzip JSON lines)
+# 'replay': responses are served from 'path' instead of the network, with the
+#           recorded latency scaled by 'replay_speed' (0 = as fast as possible)
+# Used for reproducible test runs with real data, e.g.:
+#   TRAFFIC_ARCHIVE_MODE=replay python3 main.py
+TRAFFIC_ARCHIVE_CONFIG = {
+    'mode': os.getenv('TRAFFIC_ARCHIVE_MODE', 'off'),   # 'off', 'record' or 'replay'
+    'path': os.getenv('TRAFFIC_ARCHIVE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'traffic.jsonl.gz')),
+    'replay_speed': 1.0
+}
+
+# ============================================================================
+# TICK LOG
+# ============================================================================
+# Every fetched price, BTC dominance, market cap, Fear & Greed and Altcoin
+# Season value is appended to a binary log in 'path' (24 bytes per value),
+# for local statistics over months (see utils/ticklog.py for queries).
+# Under 1 MB per month with the default modules and intervals; streamed
+# prices add about 6 MB per coin and month at 'min_interval' 10.
+TICK_LOG_CONFIG = {
+    'enabled': False,
+    'path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ticks'),
+    'segment_size': 1024 * 1024,       # bytes per segment file
+    'retention_days': 365,             # delete older segments (0 = keep)
+    'max_size': 256 * 1024 * 1024,     # total bytes kept (0 = no limit)
+    'min_interval': 10                 # seconds between records of one series (streamed prices)
+}
+
+# ============================================================================
+# ROLLUPS
+# ============================================================================
+# In-memory OHLC candles of every fetched value (same series as the tick log),
+# for screens such as daily high/low or weekly range (utils/rollups.py).
+# Memory is fixed: about 100 KB per series with the default resolutions.
+ROLLUP_CONFIG = {
+    'enabled': False,
+    'resolutions': {     # candle length in seconds -> candles kept
+        60: 1440,        # 1 minute, last day
+        3600: 720,       # 1 hour, last 30 days
+        86400: 365       # 1 day, last year
+    }
+}
+
+# ============================================================================
+# QUIET HOURS
+# ============================================================================
+# Low-activity mode for the night (local time, may span midnight): the
+# backlight is switched off, the rotation pauses on one static screen that is
+# redrawn every 'redraw_interval' seconds, and only that screen's module is
+# refreshed, at update_interval × 'interval_multiplier'. 'prewake' seconds
+# before 'end', every module is refreshed so the display wakes up current.
+QUIET_HOURS_CONFIG = {
+    'enabled': False,
+    'start': '23:00',
+    'end': '07:00',
+    'backlight': False,          # backlight during quiet hours
+    'screen': ('weather', 1),    # (module, screen index): clock + temperature; None = blank
+    'interval_multiplier': 6,
+    'redraw_interval': 60,       # seconds (the clock shows minutes)
+    'prewake': 300               # seconds
 }
 
 # ============================================================================
 # MODULE DISPLAY ORDER
 # ============================================================================
-MODULE_ORDER = ['weather', 'btc_dominance', 'alt_season', 'fear_greed', 'market_cap'] + ['crypto'] * 3
+MODULE_ORDER = ['weather', 'btc_dominance', 'alt_season', 'fear_greed', 'market_cap', 'crypto']
+
+# ============================================================================
+# MODULE WEIGHTS
+# ============================================================================
+# How many times each module's screens appear per rotation (default: 1).
+# Screens are interleaved evenly, e.g. crypto screens between the other modules.
+# Data is only refreshed when a module's 'update_interval' expires.
+MODULE_WEIGHTS = {
+    'crypto': 3
+}
+
+# ============================================================================
+# DISPLAYS
+# ============================================================================
+# One process can drive several LCDs (different I2C addresses or buses).
+# Each display has its own module order, weights and timing, and runs in its
+# own thread. All displays share the API clients and caches, so adding a
+# display adds no API requests.
+DISPLAYS = [
+    {
+        'name': 'main',
+        'lcd': LCD_CONFIG,
+        'module_order': MODULE_ORDER,
+        'module_weights': MODULE_WEIGHTS,
+        'display_durations': {}   # Optional per-module override, e.g. {'crypto': 5}
+    },
+    # Example: second LCD at address 0x26 showing crypto and sentiment only
+    # {
+    #     'name': 'rack-2',
+    #     'lcd': {**LCD_CONFIG, 'address': 0x26},
+    #     'module_order': ['crypto', 'fear_greed', 'btc_dominance'],
+    #     'module_weights': {'crypto': 2},
+    #     'display_durations': {'crypto': 5}
+    # },
+]
 
 # ============================================================================
 # QUICK REFERENCE
@@ -125,6 +395,14 @@ MODULE_ORDER = ['weather', 'btc_dominance', 'alt_season', 'fear_greed', 'market_
 # Change display time:         Modify 'display_duration' (seconds)
 # Change update frequency:     Modify 'update_interval' (seconds)
 # Reorder modules:             Modify MODULE_ORDER list
+# Show a module more often:    Modify MODULE_WEIGHTS (e.g. 'crypto': 3)
+# Drive more LCDs:             Add entries to DISPLAYS
+# Share fetches on the LAN:    Set AGGREGATOR_CONFIG['mode'] ('server' / 'client')
+# Dark, quiet nights:          Set QUIET_HOURS_CONFIG['enabled'] to True
+# Keep price history:          Set TICK_LOG_CONFIG['enabled'] to True
+# Daily/weekly highs and lows: Set ROLLUP_CONFIG['enabled'] to True
+# Track your holdings:        Set PORTFOLIO_MODULE_CONFIG['enabled'] and add 'portfolio' to MODULE_ORDER
+# Restart when hung:           Keep WATCHDOG_CONFIG['enabled'] and set WatchdogSec= (docs/SYSTEMD_SETUP.md)
 # 
 # 📖 For complete configuration guide: see docs/CONFIGURATION_GUIDE.md
 # ============================================================================
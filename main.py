@@ -1,184 +1,531 @@
 """Modular Crypto Ticker - Main Application"""
 
-import time
+import signal
+import threading
 from RPLCD.i2c import CharLCD
 from utils.lcd import SafeLCD, POS_CENTER, ROW_FIRST, ROW_SECOND
 
-from config import (
-    LCD_CONFIG,
-    WEATHER_MODULE_CONFIG,
-    CRYPTO_MODULE_CONFIG,
-    FEAR_GREED_MODULE_CONFIG,
-    MARKET_CAP_MODULE_CONFIG,
-    ALT_SEASON_MODULE_CONFIG,
-    BTC_DOMINANCE_MODULE_CONFIG,
-    APP_CONFIG,
-    MODULE_ORDER
-)
+import config
 from modules.weather_time import WeatherTimeModule
 from modules.crypto_ticker import CryptoTickerModule
 from modules.fear_greed import FearGreedModule
 from modules.market_cap import MarketCapModule
 from modules.alt_season import AltSeasonModule
 from modules.btc_dominance import BTCDominanceModule
+from modules.price_alert import PriceAlertModule
+from modules.portfolio import PortfolioModule
 from clients import get_ip_address
+from clients import http
+from clients import aggregator
+from clients.aggregator_server import AggregatorServer, create_sources
+from utils.scheduler import Scheduler
+from utils.quiet_hours import QuietHours
+from utils.alerts import AlertEngine
+from utils.ticklog import TickLog
+from utils.rollups import start_rollups
+from utils.watchdog import Watchdog, sd_notify
+from utils.events import subscribe, subscribe_values, TOPIC_CRYPTO_PRICES
+from utils.metrics import log_metrics
+from utils.config_watcher import ConfigWatcher
+from utils import clock
 
 
-def init_lcd(version):
-    """Initialize LCD 16x2 screen with SafeLCD wrapper"""
+# Module key (as used in MODULE_ORDER) -> (module class, config name in config.py, log name)
+MODULE_REGISTRY = {
+    'weather': (WeatherTimeModule, 'WEATHER_MODULE_CONFIG', "Weather & Time"),
+    'crypto': (CryptoTickerModule, 'CRYPTO_MODULE_CONFIG', "Crypto"),
+    'fear_greed': (FearGreedModule, 'FEAR_GREED_MODULE_CONFIG', "Fear & Greed Index"),
+    'market_cap': (MarketCapModule, 'MARKET_CAP_MODULE_CONFIG', "Market Cap"),
+    'btc_dominance': (BTCDominanceModule, 'BTC_DOMINANCE_MODULE_CONFIG', "BTC Dominance"),
+    'alt_season': (AltSeasonModule, 'ALT_SEASON_MODULE_CONFIG', "Altcoin Season"),
+    'portfolio': (PortfolioModule, 'PORTFOLIO_MODULE_CONFIG', "Portfolio"),
+}
+
+
+def create_lcd(lcd_config):
+    """Create an LCD screen wrapped with SafeLCD
+    
+    Args:
+        lcd_config: LCD hardware configuration (see LCD_CONFIG)
+    """
     raw_lcd = CharLCD(
         i2c_expander='PCF8574',
-        address=LCD_CONFIG['address'],
-        port=LCD_CONFIG['port'],
-        cols=LCD_CONFIG['cols'],
-        rows=LCD_CONFIG['rows'],
-        dotsize=LCD_CONFIG['dotsize']
+        address=lcd_config['address'],
+        port=lcd_config['port'],
+        cols=lcd_config['cols'],
+        rows=lcd_config['rows'],
+        dotsize=lcd_config['dotsize'],
+        charmap=lcd_config.get('charmap', 'A00')
     )
     
     # Wrap LCD with SafeLCD for automatic text validation
-    lcd = SafeLCD(raw_lcd, max_size=LCD_CONFIG['max_size'])
+    return SafeLCD(raw_lcd, max_size=lcd_config['max_size'], rows=lcd_config['rows'])
+
+
+def init_lcds(displays, version):
+    """Initialize every configured LCD and show the splash screen on all of them
     
-    time.sleep(2)
-    lcd.clear()
-    lcd.write_string(row=ROW_FIRST, text="CRYPTO TICKER", pos=POS_CENTER)
-    lcd.write_string(row=ROW_SECOND, text=version, pos=POS_CENTER)
-    time.sleep(10)
-    return lcd
+    Args:
+        displays: DISPLAYS from config.py
+        version: Version shown on the splash screen
+    
+    Returns:
+        list: SafeLCD instances, in DISPLAYS order
+    """
+    lcds = [create_lcd(display['lcd']) for display in displays]
+    
+    clock.sleep(2)
+    for lcd in lcds:
+        lcd.clear()
+        lcd.write_string(row=ROW_FIRST, text="CRYPTO TICKER", pos=POS_CENTER)
+        lcd.write_string(row=ROW_SECOND, text=version, pos=POS_CENTER)
+    clock.sleep(10)
+    return lcds
 
 
-def fetch_ip_address():
+def fetch_ip_address(app_config):
     """Attempt to get IP address from ipify API
     
     Returns:
         str: IP address if successful, None otherwise
     """
-    return get_ip_address(timeout=APP_CONFIG['connection_timeout'])
+    return get_ip_address(timeout=app_config['connection_timeout'])
 
 
-def establish_connection(lcd):
+def establish_connection(lcd, app_config):
     """Establish internet connection and return IP address"""
     lcd.clear()
     ip = None
     
     while ip is None:
         lcd.write_string(row=ROW_FIRST, text="Connecting...", pos=POS_CENTER)
-        ip = fetch_ip_address()
+        ip = fetch_ip_address(app_config)
         
         if ip is None:
             lcd.clear()
             lcd.write_string(row=ROW_FIRST, text="Conn. error", pos=POS_CENTER)
             lcd.write_string(row=ROW_SECOND, text="Retrying...", pos=POS_CENTER)
-            time.sleep(APP_CONFIG['retry_delay'])
+            clock.sleep(app_config['retry_delay'])
         else:
             print(f"Connected! IP: {ip}")
     
     lcd.clear()
     lcd.write_string(row=ROW_FIRST, text="Connected!", pos=POS_CENTER)
     lcd.write_string(row=ROW_SECOND, text=f"IP:{ip}", pos=POS_CENTER)
-    time.sleep(2)
+    clock.sleep(2)
     return ip
 
 
-def initialize_modules(lcd, ip):
-    """Initialize all enabled modules"""
+def display_module_config(module_config, module_name, display):
+    """Apply a display's per-module overrides to a module configuration
+    
+    Args:
+        module_config: Module configuration dict from config.py
+        module_name: Module key (as used in MODULE_ORDER)
+        display: Display entry from DISPLAYS
+    
+    Returns:
+        dict: Configuration copy for this display
+    """
+    module_config = module_config.copy()
+    durations = display.get('display_durations', {})
+    if module_name in durations:
+        module_config['display_duration'] = durations[module_name]
+    return module_config
+
+
+def initialize_modules(cfg, lcd, ip, display, previous=None):
+    """Initialize all enabled modules for one display
+    
+    On a config reload, modules whose configuration didn't change are reused
+    as they are; changed ones are rebuilt and take over the previous data.
+    
+    Args:
+        cfg: Config module
+        lcd: The display's SafeLCD
+        ip: Public IP address (weather location)
+        display: Display entry from DISPLAYS
+        previous: Optional dict of module name -> module from the previous config
+    
+    Returns:
+        dict: Module name -> module instance
+    """
+    previous = previous or {}
     modules = {}
     
-    # Initialize Weather & Time Module
-    if WEATHER_MODULE_CONFIG['enabled']:
-        weather_config = WEATHER_MODULE_CONFIG.copy()
-        weather_config['ip'] = ip
-        modules['weather'] = WeatherTimeModule(lcd, weather_config)
-        print("Weather & Time module initialized")
-    
-    # Initialize Crypto Module
-    if CRYPTO_MODULE_CONFIG['enabled']:
-        modules['crypto'] = CryptoTickerModule(lcd, CRYPTO_MODULE_CONFIG)
-        print("Crypto module initialized")
-    
-    # Initialize Fear & Greed Index Module
-    if FEAR_GREED_MODULE_CONFIG['enabled']:
-        modules['fear_greed'] = FearGreedModule(lcd, FEAR_GREED_MODULE_CONFIG)
-        print("Fear & Greed Index module initialized")
-    
-    # Initialize Market Cap Module
-    if MARKET_CAP_MODULE_CONFIG['enabled']:
-        modules['market_cap'] = MarketCapModule(lcd, MARKET_CAP_MODULE_CONFIG)
-        print("Market Cap module initialized")
-    
-    # Initialize Bitcoin Dominance Module
-    if BTC_DOMINANCE_MODULE_CONFIG['enabled']:
-        modules['btc_dominance'] = BTCDominanceModule(lcd, BTC_DOMINANCE_MODULE_CONFIG)
-        print("BTC Dominance module initialized")
-    
-    # Initialize Altcoin Season Module
-    if ALT_SEASON_MODULE_CONFIG['enabled']:
-        modules['alt_season'] = AltSeasonModule(lcd, ALT_SEASON_MODULE_CONFIG)
-        print("Altcoin Season module initialized")
+    for name, (module_class, config_name, label) in MODULE_REGISTRY.items():
+        base_config = getattr(cfg, config_name)
+        if not base_config['enabled']:
+            continue
+        
+        module_config = display_module_config(base_config, name, display)
+        if name == 'weather':
+            module_config['ip'] = ip
+        
+        old_module = previous.get(name)
+        if old_module is not None and old_module.config == module_config:
+            modules[name] = old_module
+            continue
+        
+        modules[name] = module_class(lcd, module_config)
+        if old_module is not None:
+            modules[name].inherit_state(old_module)
+            print(f"{label} module reconfigured")
+        else:
+            print(f"{label} module initialized")
     
     return modules
 
 
+def initialize_alerts(cfg):
+    """Create the price alert engine shared by all displays
+    
+    Returns:
+        AlertEngine: Alert engine, or None if alerts are disabled
+    """
+    alert_config = cfg.PRICE_ALERT_CONFIG
+    if not alert_config['enabled']:
+        return None
+    
+    engine = AlertEngine(
+        rules=alert_config['rules'],
+        symbols=cfg.CRYPTO_MODULE_CONFIG['symbols'],
+        fiat=cfg.CRYPTO_MODULE_CONFIG['fiat'],
+        latch_timeout=alert_config['latch_timeout'],
+        reminder_interval=alert_config['reminder_interval']
+    )
+    # Evaluate rules on every fresh price fetch
+    subscribe(TOPIC_CRYPTO_PRICES, engine.on_prices)
+    
+    # Acknowledge latched alerts with: kill -USR1 <pid>
+    signal.signal(signal.SIGUSR1, lambda signum, frame: engine.acknowledge())
+    
+    print(f"Price alerts initialized ({len(alert_config['rules'])} rules)")
+    return engine
+
+
+def initialize_tick_log(cfg):
+    """Start recording fetched values in the tick log (TICK_LOG_CONFIG)
+    
+    Returns:
+        TickLog: Open tick log, or None if disabled
+    """
+    log_config = cfg.TICK_LOG_CONFIG
+    if not log_config['enabled']:
+        return None
+    
+    log = TickLog(
+        log_config['path'],
+        segment_size=log_config['segment_size'],
+        retention_days=log_config['retention_days'],
+        max_size=log_config['max_size'],
+        min_interval=log_config['min_interval']
+    )
+    subscribe_values(log.append)
+    print(f"Tick log: Recording to {log_config['path']} ({len(log.series())} series)")
+    return log
+
+
+def initialize_watchdog(cfg):
+    """Create the hung-fetch watchdog shared by all displays (WATCHDOG_CONFIG)
+    
+    Returns:
+        Watchdog: Watchdog, or None if disabled
+    """
+    watchdog_config = cfg.WATCHDOG_CONFIG
+    if not watchdog_config['enabled']:
+        return None
+    
+    watchdog = Watchdog(
+        fetch_timeout=watchdog_config['fetch_timeout'],
+        stall_timeout=watchdog_config['stall_timeout'],
+        max_stuck_workers=watchdog_config['max_stuck_workers']
+    )
+    if watchdog.ping_interval is not None:
+        print(f"Watchdog: Pinging systemd every {watchdog.ping_interval:.0f}s while healthy")
+    return watchdog
+
+
+def configure_api_budgets(cfg):
+    """Register the shared per-host request budgets, timeouts, retry policy and circuit breaker with the client layer"""
+    for host, budget in cfg.API_BUDGET_CONFIG.items():
+        http.set_budget(host, budget['max_requests'], budget['window'])
+    fetch_budget = cfg.FETCH_BUDGET_CONFIG
+    http.configure_timeouts(fetch_budget['connect_timeout'], fetch_budget['min_request_timeout'])
+    retry = cfg.RETRY_CONFIG
+    http.configure_retries(retry['max_retries'], retry['base_delay'], retry['max_delay'])
+    breaker = cfg.CIRCUIT_BREAKER_CONFIG
+    http.configure_breaker(breaker['failure_threshold'], breaker['cooldown'])
+
+
+def start_aggregator(cfg):
+    """Start the LAN aggregator server or enable client mode (AGGREGATOR_CONFIG)
+    
+    Returns:
+        AggregatorServer: Running server in server mode, None otherwise
+    """
+    agg_config = cfg.AGGREGATOR_CONFIG
+    mode = agg_config['mode']
+    
+    if mode == 'client':
+        aggregator.configure_client(
+            agg_config['url'],
+            long_poll=agg_config['long_poll'],
+            timeout=agg_config['timeout'],
+            idle_timeout=agg_config['idle_timeout']
+        )
+        print(f"Aggregator: Client mode, reading data from {agg_config['url']}")
+        return None
+    
+    if mode == 'server':
+        sources = create_sources(
+            intervals={
+                'crypto_prices': cfg.CRYPTO_MODULE_CONFIG['update_interval'],
+                'weather': cfg.WEATHER_MODULE_CONFIG['update_interval'],
+                'fear_greed': cfg.FEAR_GREED_MODULE_CONFIG['update_interval'],
+                'global': cfg.MARKET_CAP_MODULE_CONFIG['update_interval'],
+                'alt_season': cfg.ALT_SEASON_MODULE_CONFIG['update_interval'],
+            },
+            weather_api_key=cfg.WEATHER_MODULE_CONFIG['api_key'],
+            fear_greed_history=cfg.FEAR_GREED_MODULE_CONFIG.get('history'),
+            alt_season_history=cfg.ALT_SEASON_MODULE_CONFIG.get('history')
+        )
+        server = AggregatorServer(
+            sources,
+            host=agg_config['host'],
+            port=agg_config['port'],
+            max_wait=agg_config['long_poll'] * 2,
+            idle_timeout=agg_config['idle_timeout']
+        )
+        server.start()
+        return server
+    
+    return None
+
+
+def reload_config(new_cfg, displays, ip):
+    """Validate a reloaded config and apply it to the running displays
+    
+    All modules are built before anything is applied, so an invalid config
+    (e.g. a missing key) leaves the running configuration untouched. Unchanged
+    modules keep running as they are; no caches are dropped and no display is
+    blanked.
+    
+    Settings that need a restart (LCD hardware, added or removed displays,
+    price alerts, aggregator mode, tick log, rollups, watchdog, traffic
+    archive, clock, version) are reported and ignored.
+    
+    Args:
+        new_cfg: Freshly loaded config module
+        displays: Dict of display name -> {'lcd', 'scheduler', 'display'}
+        ip: Public IP address (weather location)
+    
+    Returns:
+        bool: True if the config was applied
+    """
+    new_displays = {display['name']: display for display in new_cfg.DISPLAYS}
+    
+    # Build everything first; keep the old config if anything is invalid
+    rebuilt = {}
+    try:
+        quiet_hours = QuietHours.from_config(new_cfg.QUIET_HOURS_CONFIG)
+        for name, running in displays.items():
+            display = new_displays.get(name)
+            if display is None:
+                continue
+            for module_name in display['module_order']:
+                if module_name not in MODULE_REGISTRY:
+                    raise ValueError(f"Display '{name}': unknown module '{module_name}' in module_order")
+            previous = running['scheduler'].modules
+            rebuilt[name] = initialize_modules(new_cfg, running['lcd'], ip, display, previous=previous)
+    except Exception as e:
+        print(f"Config reload: Invalid config ({e}), keeping current config")
+        for name, modules in rebuilt.items():
+            for module_name, module in modules.items():
+                if module is not displays[name]['scheduler'].modules.get(module_name):
+                    module.close()
+        return False
+    
+    configure_api_budgets(new_cfg)
+    
+    for name, running in displays.items():
+        if name not in rebuilt:
+            print(f"Config reload: Display '{name}' was removed, restart to apply")
+            continue
+        display = new_displays[name]
+        if display['lcd'] != running['display']['lcd']:
+            print(f"Config reload: LCD settings of '{name}' changed, restart to apply")
+        
+        old_modules = running['scheduler'].modules
+        modules = rebuilt[name]
+        running['scheduler'].reconfigure(modules, display['module_order'], display.get('module_weights'),
+                                         fetch_budget=new_cfg.FETCH_BUDGET_CONFIG['cycle_budget'],
+                                         quiet_hours=quiet_hours)
+        running['display'] = display
+        
+        # Tear down modules that were removed or replaced
+        for module_name, module in old_modules.items():
+            if modules.get(module_name) is not module:
+                module.close()
+        print(f"[{name}] Config reloaded ({', '.join(modules) or 'no modules'})")
+    
+    for name in new_displays:
+        if name not in displays:
+            print(f"Config reload: New display '{name}', restart to apply")
+    
+    if new_cfg.AGGREGATOR_CONFIG != config.AGGREGATOR_CONFIG:
+        print("Config reload: Aggregator settings changed, restart to apply")
+    if new_cfg.TICK_LOG_CONFIG != config.TICK_LOG_CONFIG:
+        print("Config reload: Tick log settings changed, restart to apply")
+    if new_cfg.ROLLUP_CONFIG != config.ROLLUP_CONFIG:
+        print("Config reload: Rollup settings changed, restart to apply")
+    if new_cfg.WATCHDOG_CONFIG != config.WATCHDOG_CONFIG:
+        print("Config reload: Watchdog settings changed, restart to apply")
+    if new_cfg.PRICE_ALERT_CONFIG != config.PRICE_ALERT_CONFIG:
+        print("Config reload: Price alert settings changed, restart to apply")
+    elif config.PRICE_ALERT_CONFIG['enabled'] and (
+            new_cfg.CRYPTO_MODULE_CONFIG['symbols'] != config.CRYPTO_MODULE_CONFIG['symbols']
+            or new_cfg.CRYPTO_MODULE_CONFIG['fiat'] != config.CRYPTO_MODULE_CONFIG['fiat']):
+        # The alert engine resolves rule symbols with the crypto module's symbols and fiat
+        print("Config reload: Crypto symbols or fiat changed, restart to apply them to price alerts")
+    if new_cfg.TRAFFIC_ARCHIVE_CONFIG != config.TRAFFIC_ARCHIVE_CONFIG:
+        print("Config reload: Traffic archive settings changed, restart to apply")
+    if new_cfg.APP_CONFIG.get('clock', 'system') != config.APP_CONFIG.get('clock', 'system'):
+        print("Config reload: Clock setting changed, restart to apply")
+    if new_cfg.APP_CONFIG['version'] != config.APP_CONFIG['version']:
+        print("Config reload: Version changed, restart to show it")
+    
+    return True
+
+
 def display_module_error(lcd):
     """Display error message when no modules are active"""
     lcd.clear()
     lcd.write_string(row=ROW_FIRST, text="No modules", pos=POS_CENTER)
     lcd.write_string(row=ROW_SECOND, text="enabled!", pos=POS_CENTER)
-    time.sleep(5)
+    clock.sleep(5)
+
+
+def run_display(name, lcd, scheduler):
+    """Run one display's rotation forever (each display has its own thread)
+    
+    Args:
+        name: Display name (for logging)
+        lcd: The display's SafeLCD
+        scheduler: The display's Scheduler
+    """
+    while True:
+        try:
+            # Display screens in the planned order, refreshing data only when due
+            scheduler.run_cycle()
+            
+            # Nothing to show until a config reload enables modules
+            if not scheduler.plan:
+                display_module_error(lcd)
+        
+        except Exception as e:
+            print(f"[{name}] Error in display loop: {e}")
+            try:
+                lcd.clear()
+                lcd.write_string(row=ROW_FIRST, text="Display Error", pos=POS_CENTER)
+                lcd.write_string(row=ROW_SECOND, text="Recovering...", pos=POS_CENTER)
+            except Exception as lcd_error:
+                print(f"[{name}] LCD error: {lcd_error}")
+            clock.sleep(5)
 
 
 def main():
     """Main application loop"""
     print("Starting Crypto Ticker...")
     
-    # Initialize LCD
-    lcd = init_lcd(APP_CONFIG['version'])
+    cfg = config
+    if cfg.APP_CONFIG.get('clock', 'system') == 'virtual':
+        clock.set_clock(clock.VirtualClock())
+        print("Clock: Virtual time (sleeps are skipped)")
+    configure_api_budgets(cfg)
     
-    # Establish connection
-    ip = establish_connection(lcd)
+    # Record API traffic, or replay a recording instead of the network
+    archive = cfg.TRAFFIC_ARCHIVE_CONFIG
+    if archive['mode'] != 'off':
+        http.configure_traffic_archive(archive['mode'], archive['path'], replay_speed=archive['replay_speed'])
     
-    # Initialize modules
-    modules = initialize_modules(lcd, ip)
+    # Initialize LCDs
+    lcds = init_lcds(cfg.DISPLAYS, cfg.APP_CONFIG['version'])
     
-    if not modules:
-        display_module_error(lcd)
-        print("No modules enabled. Check config.py")
-        return
+    # Establish connection (shown on the first display)
+    ip = establish_connection(lcds[0], cfg.APP_CONFIG)
     
-    print("Starting main loop...")
+    alert_engine = initialize_alerts(cfg)
+    tick_log = initialize_tick_log(cfg)
+    if cfg.ROLLUP_CONFIG['enabled']:
+        start_rollups(cfg.ROLLUP_CONFIG['resolutions'])
+    aggregator_server = start_aggregator(cfg)
     
-    # Main loop
-    while True:
-        try:
-            # Update and display modules in configured order
-            for module_name in MODULE_ORDER:
-                if module_name in modules:
-                    module = modules[module_name]
-                    
-                    # Update module data if needed
-                    module.update_data()
-                    
-                    # Display module
-                    module.display()
+    quiet_hours = QuietHours.from_config(cfg.QUIET_HOURS_CONFIG)
+    watchdog = initialize_watchdog(cfg)
+    
+    # Each display gets its own modules and rotation; all share the API clients and caches
+    displays = {}
+    threads = []
+    for display, lcd in zip(cfg.DISPLAYS, lcds):
+        name = display['name']
+        modules = initialize_modules(cfg, lcd, ip, display)
+        alert_module = PriceAlertModule(lcd, cfg.PRICE_ALERT_CONFIG, alert_engine) if alert_engine else None
         
-        except KeyboardInterrupt:
-            print("\nShutting down...")
+        # Build the weighted screen rotation once (rebuilt on config reload)
+        scheduler = Scheduler(modules, display['module_order'], display.get('module_weights'),
+                              alert_module=alert_module, fetch_budget=cfg.FETCH_BUDGET_CONFIG['cycle_budget'],
+                              lcd=lcd, quiet_hours=quiet_hours, watchdog=watchdog)
+        displays[name] = {'lcd': lcd, 'scheduler': scheduler, 'display': display}
+        
+        if not scheduler.plan:
+            print(f"[{name}] No modules enabled. Check config.py")
+        
+        print(f"[{name}] Starting display loop ({len(scheduler.plan)} screens per rotation)...")
+        thread = threading.Thread(target=run_display, args=(name, lcd, scheduler), name=f"display-{name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    
+    # Main thread waits for Ctrl+C, logs metrics, watches config.py and pings
+    # systemd while the displays (running in their own threads) make progress
+    watcher = ConfigWatcher(config.__file__)
+    last_metrics_log = last_config_check = clock.now()
+    
+    # Startup is done (systemd Type=notify; no-op when not run by systemd)
+    sd_notify('READY=1')
+    try:
+        while any(thread.is_alive() for thread in threads):
+            clock.sleep(1)
+            now = clock.now()
+            if watchdog is not None:
+                watchdog.notify()
+            
+            metrics_interval = cfg.APP_CONFIG.get('metrics_log_interval', 0)
+            if metrics_interval and now - last_metrics_log >= metrics_interval:
+                log_metrics()
+                last_metrics_log = now
+            
+            reload_interval = cfg.APP_CONFIG.get('config_reload_interval', 0)
+            if reload_interval and now - last_config_check >= reload_interval:
+                last_config_check = now
+                new_cfg = watcher.poll()
+                if new_cfg is not None and reload_config(new_cfg, displays, ip):
+                    cfg = new_cfg
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+        sd_notify('STOPPING=1')
+        if aggregator_server is not None:
+            aggregator_server.stop()
+        if tick_log is not None:
+            tick_log.close()
+        for lcd in lcds:
+            lcd.backlight_enabled = True
             lcd.clear()
             lcd.write_string(row=ROW_FIRST, text="Goodbye!", pos=POS_CENTER)
-            time.sleep(2)
+        clock.sleep(2)
+        for lcd in lcds:
             lcd.clear()
-            break
-        
-        except Exception as e:
-            print(f"Error in main loop: {e}")
-            try:
-                lcd.clear()
-                lcd.write_string(row=ROW_FIRST, text="Display Error", pos=POS_CENTER)
-                lcd.write_string(row=ROW_SECOND, text="Recovering...", pos=POS_CENTER)
-            except Exception as lcd_error:
-                print(f"LCD error: {lcd_error}")
-            time.sleep(5)
 
 
 if __name__ == "__main__":
     main()
-
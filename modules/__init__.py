@@ -6,6 +6,8 @@ from .fear_greed import FearGreedModule
 from .market_cap import MarketCapModule
 from .alt_season import AltSeasonModule
 from .btc_dominance import BTCDominanceModule
+from .price_alert import PriceAlertModule
+from .portfolio import PortfolioModule
 
 __all__ = [
     'WeatherTimeModule',
@@ -13,6 +15,8 @@ __all__ = [
     'FearGreedModule',
     'MarketCapModule',
     'AltSeasonModule',
-    'BTCDominanceModule'
+    'BTCDominanceModule',
+    'PriceAlertModule',
+    'PortfolioModule'
 ]
 
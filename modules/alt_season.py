@@ -6,6 +6,8 @@ coins performed better than Bitcoin over the last 7 days and 30 days.
 
 Calculated using CoinGecko API data (free, no API key required).
 Shows two separate screens: one for 7d metric, one for 30d metric.
+With history enabled, a third screen shows the rolling index (default 90d),
+computed from a daily price history store.
 
 The season is determined by:
 - 75% or more = Altcoin Season
@@ -13,11 +15,10 @@ The season is determined by:
 - Between 25-75% = Mixed
 """
 
-import time
 from datetime import datetime
 from modules.base import BaseModule
-from clients import get_altcoin_season_index
-from utils.lcd import POS_CENTER, ROW_FIRST, ROW_SECOND
+from clients import get_altcoin_season_index, get_altcoin_season_history, backfill_altcoin_season_history
+from utils.layout import TITLE_VALUE_LAYOUT
 
 
 class AltSeasonModule(BaseModule):
@@ -38,9 +39,35 @@ class AltSeasonModule(BaseModule):
         
         self.timeout = config['timeout']
         
+        # Optional rolling index history
+        history_config = config.get('history', {})
+        self.history = None
+        if history_config.get('enabled', False):
+            self.history_days = history_config.get('days', 90)
+            self.backfill_per_update = history_config.get('backfill_per_update', 5)
+            self.budget_reserve = history_config.get('budget_reserve', 0.5)
+            self.history = get_altcoin_season_history(history_config['path'], self.history_days)
+        
     def fetch_data(self):
-        """Fetch Altcoin Season Index data"""
-        return get_altcoin_season_index(timeout=self.timeout, cache_duration=self.update_interval)
+        """Fetch Altcoin Season Index data (and backfill a few coins of missing history)"""
+        if self.history is None:
+            return get_altcoin_season_index(timeout=self.timeout, cache_duration=self.update_interval)
+        
+        data = get_altcoin_season_index(
+            timeout=self.timeout,
+            cache_duration=self.update_interval,
+            history=self.history,
+            history_days=self.history_days
+        )
+        if data is not None:
+            backfill_altcoin_season_history(
+                self.history,
+                self.history_days,
+                timeout=self.timeout,
+                max_requests=self.backfill_per_update,
+                budget_reserve=self.budget_reserve
+            )
+        return data
     
     def _get_season(self, index_value):
         """
@@ -59,25 +86,27 @@ class AltSeasonModule(BaseModule):
         else:
             return "Mixed"
     
-    def display(self):
+    def display_screen(self, screen):
         """
         Display Altcoin Season Index on LCD
-        Shows 2 screens (7d and 30d)
+        Screen 0 shows the 7d index, screen 1 the 30d index, screen 2 the
+        rolling index (skipped until enough history is available)
         """
         if not self.is_data_ready():
-            return
+            return False
         
-        # Get altcoin season index values for both timeframes
-        index_7d = self.data.get('value_7d')
-        index_30d = self.data.get('value_30d')
+        if screen == 0:
+            index_value, timeframe = self.data.value_7d, '07d'
+        elif screen == 1:
+            index_value, timeframe = self.data.value_30d, '30d'
+        else:
+            index_value, timeframe = self.data.value_rolling, f'{self.history_days}d'
         
-        # Screen 1: 7-day Altcoin Season Index
-        if index_7d is not None:
-            self._display_screen(index_7d, '07d')
+        if index_value is None:
+            return False
         
-        # Screen 2: 30-day Altcoin Season Index
-        if index_30d is not None:
-            self._display_screen(index_30d, '30d')
+        self._display_screen(index_value, timeframe)
+        return True
     
     def _display_screen(self, index_value, timeframe):
         """Display a single Altcoin Season screen
@@ -92,16 +121,13 @@ class AltSeasonModule(BaseModule):
             value_str = '--'
             season = '--'
         
-        # Clear display
-        self.lcd.clear()
-        
-        # Line 1: Title with timeframe (centered)
-        title = f'Alt Season ({timeframe})'
-        self.lcd.write_string(row=ROW_FIRST, text=title, pos=POS_CENTER)
-        
-        # Line 2: Percentage and season indicator (centered)
-        display_text = f"{value_str} - {season}"
-        self.lcd.write_string(row=ROW_SECOND, text=display_text, pos=POS_CENTER)
-        
-        time.sleep(self.display_duration)
+        # Title with timeframe, then percentage and season indicator
+        self.lcd.render(TITLE_VALUE_LAYOUT, {
+            'title': f'Alt Season ({timeframe})',
+            'value': f"{value_str} - {season}",
+        })
+    
+    def get_display_count(self):
+        """Return number of screens this module displays (7d, 30d and optionally rolling)"""
+        return 3 if self.history is not None else 2
 
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from utils import clock, deadline
 
 
 class BaseModule(ABC):
@@ -30,8 +31,10 @@ class BaseModule(ABC):
         self.update_interval = config['update_interval']  # seconds (passed to API clients for caching)
         self.display_duration = config['display_duration']  # seconds
         self.max_failed_attempts = config['max_failed_attempts']
+        self.retry_interval = config.get('retry_interval', 60)  # seconds between attempts after a failure
         self.data = {}
         self.consecutive_failures = 0
+        self.last_update = 0  # time of the last update attempt
     
     @abstractmethod
     def fetch_data(self):
@@ -39,10 +42,24 @@ class BaseModule(ABC):
         pass
     
     @abstractmethod
-    def display(self):
-        """Display module data (to be implemented by subclasses)"""
+    def display_screen(self, screen):
+        """
+        Display a single screen (to be implemented by subclasses)
+        
+        Args:
+            screen: Screen index (0 to get_display_count() - 1)
+        
+        Returns:
+            bool: True if the screen was drawn, False if there was nothing to show
+        """
         pass
     
+    def display(self):
+        """Display all screens of this module, one after another"""
+        for screen in range(self.get_display_count()):
+            if self.display_screen(screen):
+                clock.sleep(self.display_duration)
+    
     def is_error_data(self, data):
         """
         Check if data is None or empty (indicating API failure)
@@ -58,18 +75,53 @@ class BaseModule(ABC):
             bool: True if data is available, False otherwise
         """
         if not self.data:
-            self.update_data()
+            if self.needs_update():
+                self.update_data()
             if not self.data:
                 return False
         return True
     
+    def needs_update(self, interval_multiplier=1):
+        """
+        Check if the module's data is due for a refresh
+        
+        Args:
+            interval_multiplier: Factor applied to update_interval and retry_interval (e.g. during quiet hours)
+        
+        Returns:
+            bool: True if update_interval (or retry_interval after a failure) has expired
+        """
+        return self.seconds_until_update(interval_multiplier) <= 0
+    
+    def seconds_until_update(self, interval_multiplier=1):
+        """
+        Get the time left until the module's data is due for a refresh
+        
+        Args:
+            interval_multiplier: Factor applied to update_interval and retry_interval (e.g. during quiet hours)
+        
+        Returns:
+            float: Seconds until update_interval (or retry_interval after a failure) expires (<= 0 if due)
+        """
+        interval = self.update_interval * interval_multiplier
+        if self.consecutive_failures:
+            interval = min(self.retry_interval * interval_multiplier, interval)
+        return self.last_update + interval - clock.now()
+    
     def update_data(self):
         """
         Update module data
         
-        Keeps last good data on API failure until max_failed_attempts is reached
+        Keeps last good data on API failure until max_failed_attempts is reached.
+        A refresh skipped for lack of fetch budget is no attempt: data,
+        failure count and last_update stay, so it is retried next rotation.
         """
-        new_data = self.fetch_data()
+        try:
+            new_data = self.fetch_data()
+        except deadline.FetchSkippedError:
+            print(f"{self.name} module: Fetch budget used up, keeping data until the next rotation")
+            return
+        self.last_update = clock.now()
         
         # Check if new data is valid or error
         if self.is_error_data(new_data):
@@ -89,6 +141,23 @@ class BaseModule(ABC):
             self.data = new_data
             print(f"{self.name} module: Data updated successfully")
     
+    def inherit_state(self, previous):
+        """
+        Take over data from the instance this one replaces (config reload)
+        
+        The next screen refreshes through the client caches, so unchanged
+        requests are served from cache and only changed ones hit the API.
+        
+        Args:
+            previous: Module instance built from the previous configuration
+        """
+        self.data = previous.data
+        self.consecutive_failures = previous.consecutive_failures
+    
+    def close(self):
+        """Release resources when the module is removed or replaced (config reload)"""
+        pass
+    
     def is_enabled(self):
         """Check if module is enabled"""
         return self.enabled
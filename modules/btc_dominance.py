@@ -8,10 +8,9 @@ Higher dominance (>50%) often indicates Bitcoin Season
 Lower dominance (<40%) often indicates Altcoin Season
 """
 
-import time
 from .base import BaseModule
 from clients import get_global_data
-from utils.lcd import POS_CENTER, ROW_FIRST, ROW_SECOND
+from utils.layout import TITLE_VALUE_LAYOUT
 
 
 class BTCDominanceModule(BaseModule):
@@ -22,22 +21,9 @@ class BTCDominanceModule(BaseModule):
         self.timeout = config.get('timeout', 10)
     
     def fetch_data(self):
-        """Fetch Bitcoin dominance from CoinGecko API"""
-        data = get_global_data(timeout=self.timeout, cache_duration=self.update_interval)
-        
-        if data is None:
-            return None
-        
-        # Extract BTC dominance from global data
-        btc_dominance = data.get('market_cap_percentage', {}).get('btc', '--')
-        
-        # Round if numeric, otherwise keep default
-        if isinstance(btc_dominance, (int, float)):
-            btc_dominance = round(btc_dominance, 2)
-        
-        return {
-            'dominance': btc_dominance,
-        }
+        """Fetch global market data (with Bitcoin dominance) from CoinGecko API"""
+        # Shares the GlobalSnapshot with the Market Cap module and the client cache
+        return get_global_data(timeout=self.timeout, cache_duration=self.update_interval)
     
     def _get_status(self, dominance):
         """Determine market status based on dominance
@@ -59,29 +45,26 @@ class BTCDominanceModule(BaseModule):
         else:
             return "Very Low"
     
-    def display(self):
+    def display_screen(self, screen):
         """Display Bitcoin Dominance on LCD"""
         if not self.is_data_ready():
-            return
+            return False
         
         # Get dominance value
-        dominance = self.data.get('dominance', '--')
+        dominance = self.data.btc_dominance
         
-        # Format dominance and status based on type
-        dominance_str = f"{int(round(dominance))}%"
-        status = self._get_status(dominance)
-     
-        
-        # Clear display
-        self.lcd.clear()
-        
-        # Line 1: Title (centered)
-        title = 'BTC Dominance'
-        self.lcd.write_string(row=ROW_FIRST, text=title, pos=POS_CENTER)
+        # Format dominance and status (dummy values if missing)
+        if isinstance(dominance, (int, float)):
+            dominance_str = f"{int(round(dominance))}%"
+            status = self._get_status(dominance)
+        else:
+            dominance_str = '--'
+            status = '--'
         
-        # Line 2: Dominance percentage and status (centered)
-        display_text = f"{dominance_str} - {status}"
-        self.lcd.write_string(row=ROW_SECOND, text=display_text, pos=POS_CENTER)
+        # Title, then dominance percentage and status
+        self.lcd.render(TITLE_VALUE_LAYOUT, {
+            'title': '₿ Dominance',
+            'value': f"{dominance_str} - {status}",
+        })
         
-        time.sleep(self.display_duration)
-
+        return True
@@ -1,10 +1,33 @@
-"""Cryptocurrency Ticker module for displaying cryptocurrency prices"""
+"""
+Cryptocurrency Ticker module for displaying cryptocurrency prices
+
+Prices for the main 'fiat' and any 'extra_fiats' come from one request;
+screens rotate through every symbol in every currency.
+"""
 
-import time
-from datetime import datetime
 from .base import BaseModule
-from clients import get_crypto_prices
-from utils.lcd import ROW_FIRST, ROW_SECOND, POS_RIGHT
+from clients import get_crypto_prices_multi
+from clients.http import budget_fraction
+from clients.price_stream import get_shared_stream, release_shared_stream, DEFAULT_STREAM_URL
+from utils.adaptive import AdaptiveInterval
+from utils.layout import Layout, Field
+from utils.lcd import POS_CENTER, POS_RIGHT
+from utils import clock
+
+
+COINGECKO_HOST = 'api.coingecko.com'
+
+# Time and 24h change / acronym and price
+PRICE_LAYOUT = Layout([
+    [Field('time', 5), Field('change', align=POS_RIGHT)],
+    [Field('symbol', 6), Field('price', align=POS_RIGHT)],
+])
+
+# Same, with the currency code between time and change (several fiat currencies)
+MULTI_FIAT_PRICE_LAYOUT = Layout([
+    [Field('time', 5), Field('fiat', align=POS_CENTER), Field('change', 6, align=POS_RIGHT)],
+    [Field('symbol', 6), Field('price', align=POS_RIGHT)],
+])
 
 
 class CryptoTickerModule(BaseModule):
@@ -20,57 +43,149 @@ class CryptoTickerModule(BaseModule):
             raise ValueError(f"CryptoTicker module missing required config keys: {', '.join(missing_keys)}. Check config.py")
         
         self.symbols = config['symbols']
-        self.fiat = config['fiat']
+        self.fiat = config['fiat']  # main currency (stream, adaptive interval, alerts)
+        self.fiats = [self.fiat] + [fiat for fiat in config.get('extra_fiats', []) if fiat != self.fiat]
+        # Screen index -> (acronym, crypto_id, fiat), each symbol in every currency
+        self.screen_list = [
+            (acronym, crypto_id, fiat)
+            for acronym, crypto_id in self.symbols.items()
+            for fiat in self.fiats
+        ]
         self.timeout = config['timeout']
+        
+        # Optional volatility-adaptive update interval
+        adaptive_config = config.get('adaptive_interval', {})
+        self.adaptive = None
+        if adaptive_config.get('enabled', False):
+            self.adaptive = AdaptiveInterval(
+                base_interval=self.update_interval,
+                min_interval=adaptive_config.get('min_interval', self.update_interval),
+                max_interval=adaptive_config.get('max_interval', self.update_interval),
+                fast_move_pct=adaptive_config.get('fast_move_pct', 1.0),
+                flat_move_pct=adaptive_config.get('flat_move_pct', 0.2)
+            )
+            # Don't shorten the interval once less than this share of the API budget is left
+            self.budget_reserve = adaptive_config.get('budget_reserve', 0.25)
+        
+        # Optional push-based price feed (polling stays as fallback)
+        stream_config = config.get('stream', {})
+        self.stream = None
+        if stream_config.get('enabled', False):
+            self.stream = get_shared_stream(
+                symbols=self.symbols,
+                fiat=self.fiat,
+                url=stream_config.get('url', DEFAULT_STREAM_URL),
+                pairs=stream_config.get('pairs'),
+                stale_after=stream_config.get('stale_after', 30),
+                max_backoff=stream_config.get('max_backoff', 60)
+            )
+    
+    def close(self):
+        """Stop using the shared price stream"""
+        if self.stream is not None:
+            release_shared_stream(self.stream)
+            self.stream = None
     
     def fetch_data(self):
-        """Fetch cryptocurrency prices from API"""
+        """Fetch cryptocurrency prices in all currencies from API (one request)"""
         # Get crypto IDs from the dict values
         crypto_ids = ','.join(self.symbols.values())
         
-        # Client returns None on failure
-        data = get_crypto_prices(
+        # Client returns None on failure, else fiat -> crypto ID -> PriceSnapshot
+        data = get_crypto_prices_multi(
             crypto_ids=crypto_ids,
-            fiat_currency=self.fiat,
+            fiat_currencies=self.fiats,
             timeout=self.timeout,
             cache_duration=self.update_interval
         )
         
         return data
     
-    def display(self):
-        """Display cryptocurrency information"""
-        if not self.is_data_ready():
+    def _stream_prices(self):
+        """
+        Get streamed prices if the stream is live and covers every symbol
+        
+        Returns:
+            dict: Crypto ID -> PriceSnapshot, or None to fall back to polling
+        """
+        if self.stream is None or not self.stream.is_live():
+            return None
+        
+        prices = self.stream.snapshot()
+        if not all(crypto_id in prices for crypto_id in self.symbols.values()):
+            return None
+        return prices
+    
+    def needs_update(self, interval_multiplier=1):
+        """Streamed prices are local, so they can be refreshed on every screen (extra currencies are still polled)"""
+        if self.stream is not None and self.stream.is_live():
+            return True
+        return super().needs_update(interval_multiplier)
+    
+    def update_data(self):
+        """Update prices and, if enabled, adapt the interval to recent price moves"""
+        streamed = self._stream_prices()
+        if streamed is not None:
+            if len(self.fiats) == 1:
+                # last_update stays the time of the last poll, so polling resumes as soon as the stream goes stale
+                self.consecutive_failures = 0
+            elif super().needs_update():
+                # The stream only covers the main currency; poll the others at the regular interval
+                super().update_data()
+            data = dict(self.data or {})
+            data[self.fiat] = streamed
+            self.data = data
             return
         
-        # Display each crypto for configured duration
-        # Iterate through acronyms and crypto IDs
-        for acronym, crypto_id in self.symbols.items():
-            if crypto_id in self.data:
-                self._display_crypto(acronym, self.data[crypto_id])
-                time.sleep(self.display_duration)
+        previous_data = self.data
+        super().update_data()
+        
+        if self.adaptive is None or self.consecutive_failures or self.data is previous_data:
+            return
+        
+        prices = {
+            crypto_id: snapshot.price
+            for crypto_id, snapshot in self.data.get(self.fiat, {}).items()
+            if isinstance(snapshot.price, (int, float))
+        }
+        allow_shorter = budget_fraction(COINGECKO_HOST) > self.budget_reserve
+        self.update_interval = self.adaptive.observe(prices, allow_shorter=allow_shorter)
+        print(f"{self.name} module: Next update in {self.update_interval:.0f}s")
     
-    def _display_crypto(self, acronym, data):
-        """Display a single cryptocurrency"""
-        self.lcd.clear()
+    def display_screen(self, screen):
+        """Display one cryptocurrency in one currency (one screen per symbol and currency)"""
+        if not self.is_data_ready():
+            return False
         
-        # first row: time and 24h change percentage
-        # Display time
-        now = datetime.now()
-        self.lcd.write_string(row=ROW_FIRST, text=now.strftime("%H:%M"))
-        # Display 24h change percentage (use dummy value if missing)
-        change_key = f'{self.fiat}_24h_change'
-        variation = str(round(data.get(change_key, 0), 1))
-        self.lcd.write_string(row=ROW_FIRST, text=f"{variation}%", pos=POS_RIGHT)
+        acronym, crypto_id, fiat = self.screen_list[screen]
+        prices = self.data.get(fiat, {})
+        if crypto_id not in prices:
+            return False
+        
+        self._display_crypto(acronym, fiat, prices[crypto_id])
+        return True
+    
+    def _display_crypto(self, acronym, fiat, snapshot):
+        """Display a single cryptocurrency (snapshot: PriceSnapshot)"""
+        # Use dummy values if change or price is missing
+        change = snapshot.change_24h if snapshot.change_24h is not None else 0
+        price = snapshot.price if snapshot.price is not None else '--'
+        values = {
+            'time': clock.datetime_now().strftime("%H:%M"),
+            'change': f"{'▲' if change >= 0 else '▼'}{abs(round(change, 1))}%",
+            'symbol': f"{acronym}:",
+        }
         
-        # second row: crypto acronym and value
-        # Display crypto acronym (e.g., 'BTC')
-        self.lcd.write_string(row=ROW_SECOND, text=f"{acronym}:")
-        # Display crypto value (use dummy value if missing)
-        value = str(data.get(self.fiat, '--'))
-        self.lcd.write_string(row=ROW_SECOND, text=f"${value}", pos=POS_RIGHT)
+        if len(self.fiats) == 1:
+            values['price'] = f"${price}"
+            self.lcd.render(PRICE_LAYOUT, values)
+        else:
+            # Currency code in the top row; no single-character sign fits every currency
+            values['fiat'] = fiat.upper()
+            values['price'] = f"{price}"
+            self.lcd.render(MULTI_FIAT_PRICE_LAYOUT, values)
     
     def get_display_count(self):
         """Return number of screens this module displays"""
-        return len(self.symbols)
+        return len(self.screen_list)
 
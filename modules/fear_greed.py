@@ -3,13 +3,15 @@ Fear and Greed Index Module
 
 Displays the cryptocurrency Fear and Greed Index from Alternative.me
 Index ranges from 0 (Extreme Fear) to 100 (Extreme Greed)
+
+With history enabled, two more screens show past values (yesterday, last week,
+last month) and the 7d/30d moving averages from the local history store.
 """
 
-import time
 from datetime import datetime
 from modules.base import BaseModule
-from clients import get_fear_greed_index
-from utils.lcd import POS_CENTER, ROW_FIRST, ROW_SECOND
+from clients import get_fear_greed_index, get_fear_greed_history
+from utils.layout import TITLE_VALUE_LAYOUT
 
 
 class FearGreedModule(BaseModule):
@@ -30,9 +32,23 @@ class FearGreedModule(BaseModule):
         
         self.timeout = config['timeout']
         
+        # Optional local history for past values and averages
+        history_config = config.get('history', {})
+        self.history = None
+        if history_config.get('enabled', False):
+            self.history_days = history_config.get('days', 30)
+            self.history = get_fear_greed_history(history_config['path'], self.history_days)
+        
     def fetch_data(self):
         """Fetch Fear and Greed Index data"""
-        return get_fear_greed_index(timeout=self.timeout, cache_duration=self.update_interval)
+        if self.history is None:
+            return get_fear_greed_index(timeout=self.timeout, cache_duration=self.update_interval)
+        return get_fear_greed_index(
+            timeout=self.timeout,
+            cache_duration=self.update_interval,
+            history=self.history,
+            history_days=self.history_days
+        )
     
     def _shorten_classification(self, classification):
         """Shorten two-word classifications (e.g., 'Extreme Fear' -> 'Extr. Fear')"""
@@ -45,24 +61,51 @@ class FearGreedModule(BaseModule):
         
         return ' '.join(words)
     
-    def display(self):
-        """Display Fear and Greed Index on LCD"""
+    def _format_value(self, value):
+        """Format a history value, '--' if missing"""
+        return '--' if value is None else str(value)
+    
+    def display_screen(self, screen):
+        """
+        Display Fear and Greed Index on LCD
+        Screen 0 shows the current index, screen 1 past values and screen 2
+        the moving averages (both skipped until history is available)
+        """
         if not self.is_data_ready():
-            return
+            return False
         
-        # Get index value and classification
-        index_value = self.data.get('value', '--')
-        classification = self._shorten_classification(self.data.get('value_classification', '--'))
+        if screen == 1:
+            past = (self.data.yesterday, self.data.last_week, self.data.last_month)
+            if all(value is None for value in past):
+                return False
+            yesterday, last_week, last_month = (self._format_value(value) for value in past)
+            self.lcd.render(TITLE_VALUE_LAYOUT, {
+                'title': "F&G 1d/1w/1m Ago",
+                'value': f"{yesterday} {last_week} {last_month}",
+            })
+            return True
         
-        # Display Fear & Greed Index
-        self.lcd.clear()
+        if screen == 2:
+            if self.data.average_7d is None and self.data.average_30d is None:
+                return False
+            self.lcd.render(TITLE_VALUE_LAYOUT, {
+                'title': "F&G Average",
+                'value': f"7d:{self._format_value(self.data.average_7d)} 30d:{self._format_value(self.data.average_30d)}",
+            })
+            return True
         
-        # Align center "Fear&Greed Idx." on first line
-        title = "Fear & Greed Idx"
-        self.lcd.write_string(row=ROW_FIRST, text=title, pos=POS_CENTER)
+        # Get index value and classification
+        index_value = self.data.value or '--'
+        classification = self._shorten_classification(self.data.classification or '--')
         
-        # Line 2: Value and classification
-        display_text = f"{index_value} - {classification}"
-        self.lcd.write_string(row=ROW_SECOND, text=display_text, pos=POS_CENTER)
+        # Display Fear & Greed Index: title, then value and classification
+        self.lcd.render(TITLE_VALUE_LAYOUT, {
+            'title': "Fear & Greed Idx",
+            'value': f"{index_value} - {classification}",
+        })
         
-        time.sleep(self.display_duration)
+        return True
+    
+    def get_display_count(self):
+        """Return number of screens this module displays (current, plus past values and averages with history)"""
+        return 3 if self.history is not None else 1
@@ -5,12 +5,19 @@ Displays total cryptocurrency market capitalization from CoinGecko
 Shows total market cap and 24h change percentage
 """
 
-import time
-from datetime import datetime
 from modules.base import BaseModule
 from clients import get_global_data
 from utils.parser import format_large_number
-from utils.lcd import ROW_FIRST, ROW_SECOND, POS_RIGHT
+from utils.layout import Layout, Field
+from utils.lcd import POS_RIGHT
+from utils import clock
+
+
+# Time and 24h change / label and total market cap
+MARKET_CAP_LAYOUT = Layout([
+    [Field('time', 5), Field('change', align=POS_RIGHT)],
+    ['Mkt. Cap:', Field('value', align=POS_RIGHT)],
+])
 
 
 class MarketCapModule(BaseModule):
@@ -34,20 +41,23 @@ class MarketCapModule(BaseModule):
         
     def fetch_data(self):
         """Fetch global market cap data"""
-        return get_global_data(timeout=self.timeout, cache_duration=self.update_interval)
+        return get_global_data(timeout=self.timeout, cache_duration=self.update_interval,
+                               fiat_currencies=[self.fiat])
     
     def _format_market_cap(self, value):
         """Format market cap value to readable string (e.g., 1.2T, 450B)"""
         return format_large_number(value)
     
-    def display(self):
+    def display_screen(self, screen):
         """Display market cap on LCD"""
         if not self.is_data_ready():
-            return
+            return False
         
         # Get market cap and change percentage
-        total_market_cap = self.data.get('total_market_cap', {}).get(self.fiat, '--')
-        change_24h = self.data.get('market_cap_change_percentage_24h_usd', '--')
+        total_market_cap = self.data.total_market_cap.get(self.fiat, '--')
+        change_24h = self.data.market_cap_change_24h
+        if change_24h is None:
+            change_24h = '--'
         
         # Format values
         market_cap_str = self._format_market_cap(total_market_cap)
@@ -61,19 +71,10 @@ class MarketCapModule(BaseModule):
             change_str = '--'
         
         # Display Market Cap
-        self.lcd.clear()
-        
-        # Line 1: Time and 24h change
-        now = datetime.now()
-        self.lcd.write_string(row=ROW_FIRST, text=now.strftime("%H:%M"))
-        # Right-align 24h change
-        self.lcd.write_string(row=ROW_FIRST, text=change_str, pos=POS_RIGHT)
+        self.lcd.render(MARKET_CAP_LAYOUT, {
+            'time': clock.datetime_now().strftime("%H:%M"),
+            'change': change_str,
+            'value': f"${market_cap_str}",
+        })
         
-        # Line 2: Market cap label (left) and value (right)
-        self.lcd.write_string(row=ROW_SECOND, text="Mkt. Cap:")
-        # Right-align market cap value
-        value_text = f"${market_cap_str}"
-        self.lcd.write_string(row=ROW_SECOND, text=value_text, pos=POS_RIGHT)
-        
-        time.sleep(self.display_duration)
-
+        return True
@@ -0,0 +1,155 @@
+"""
+Portfolio Module
+
+Displays the value of configured holdings: total value, 24h profit/loss and,
+optionally, one screen per holding.
+
+Adds no API calls of its own while the crypto module runs: the held coins are
+registered with the crypto client, so they are priced in the same batched
+request as the ticker symbols, and every published price (polled or
+streamed) updates the valuation incrementally. Only coins without a recent
+price are requested, e.g. when the crypto module is disabled.
+"""
+
+from .base import BaseModule
+from clients import get_crypto_prices_multi, register_crypto_ids, unregister_crypto_ids
+from clients.snapshots import PriceSnapshot
+from utils.events import subscribe, unsubscribe, TOPIC_CRYPTO_PRICES
+from utils.layout import Layout, Field
+from utils.lcd import POS_RIGHT
+from utils.parser import format_large_number
+from utils.portfolio import Portfolio
+from utils import clock
+
+
+# Time and 24h change / label and total value
+TOTAL_LAYOUT = Layout([
+    [Field('time', 5), Field('change', align=POS_RIGHT)],
+    ['Total:', Field('value', align=POS_RIGHT)],
+])
+
+# Label / 24h profit or loss
+PNL_LAYOUT = Layout([
+    ['24h P&L:', Field('change', align=POS_RIGHT)],
+    [Field('value', align=POS_RIGHT)],
+])
+
+# Symbol and amount / value and 24h change
+HOLDING_LAYOUT = Layout([
+    [Field('symbol', 6), Field('amount', align=POS_RIGHT)],
+    [Field('value', 9), Field('change', align=POS_RIGHT)],
+])
+
+# Screens before the per-holding screens
+SUMMARY_SCREENS = 2
+
+
+def _format_change(change):
+    """Format a 24h change in percent (e.g. '▲2.5%')"""
+    if change is None:
+        return '--'
+    return f"{'▲' if change >= 0 else '▼'}{abs(round(change, 1))}%"
+
+
+def _format_money(value, signed=False):
+    """Format an amount of money (e.g. '$12.3K', '-$450')"""
+    sign = ('+' if value >= 0 else '-') if signed else ''
+    return f"{sign}${format_large_number(abs(value))}"
+
+
+class PortfolioModule(BaseModule):
+    """Module for displaying the value of a portfolio"""
+
+    def __init__(self, lcd, config):
+        super().__init__('Portfolio', lcd, config)
+
+        # Validate required configuration
+        required_keys = ['holdings', 'fiat', 'timeout']
+        missing_keys = [key for key in required_keys if key not in config]
+        if missing_keys:
+            raise ValueError(f"Portfolio module missing required config keys: {', '.join(missing_keys)}. Check config.py")
+
+        self.fiat = config['fiat'].lower()
+        self.timeout = config['timeout']
+        self.show_holdings = config.get('show_holdings', True)
+        self.portfolio = Portfolio({
+            symbol: (holding['id'], holding['amount'])
+            for symbol, holding in config['holdings'].items()
+        })
+
+        # Price the holdings in the crypto module's request and follow every published price
+        register_crypto_ids(self, self.portfolio.crypto_ids, self.fiat)
+        subscribe(TOPIC_CRYPTO_PRICES, self._on_prices)
+
+    def close(self):
+        """Stop following prices"""
+        unsubscribe(TOPIC_CRYPTO_PRICES, self._on_prices)
+        unregister_crypto_ids(self)
+
+    def _on_prices(self, payload):
+        """Revalue the holdings whose price changed"""
+        if payload['fiat'] == self.fiat:
+            self.portfolio.update(payload['prices'])
+
+    def fetch_data(self):
+        """Request prices only for holdings no recent fetch has priced"""
+        stale_ids = self.portfolio.stale_ids(self.update_interval)
+        if stale_ids:
+            # Fresh prices are also published, and reach _on_prices
+            data = get_crypto_prices_multi(
+                crypto_ids=stale_ids,
+                fiat_currencies=[self.fiat],
+                timeout=self.timeout,
+                cache_duration=self.update_interval
+            )
+            if data is not None:
+                self.portfolio.update(data[self.fiat])
+
+        return self.portfolio if self.portfolio.priced else None
+
+    def inherit_state(self, previous):
+        """Start from the previous instance's prices (config reload)"""
+        self.consecutive_failures = previous.consecutive_failures
+        self.portfolio.update({
+            crypto_id: PriceSnapshot(price, change_24h)
+            for crypto_id, (price, change_24h) in previous.portfolio.prices().items()
+        })
+        self.data = self.portfolio if self.portfolio.priced else {}
+
+    def display_screen(self, screen):
+        """Display the total, the 24h P&L or one holding (totals are precomputed, O(1))"""
+        if not self.is_data_ready():
+            return False
+
+        portfolio = self.portfolio
+        if screen == 0:
+            self.lcd.render(TOTAL_LAYOUT, {
+                'time': clock.datetime_now().strftime("%H:%M"),
+                'change': _format_change(portfolio.change_24h),
+                'value': _format_money(portfolio.total),
+            })
+            return True
+
+        if screen == 1:
+            self.lcd.render(PNL_LAYOUT, {
+                'change': _format_change(portfolio.change_24h),
+                'value': _format_money(portfolio.pnl_24h, signed=True),
+            })
+            return True
+
+        holding = portfolio.holdings[screen - SUMMARY_SCREENS]
+        if holding.price is None:
+            return False
+        self.lcd.render(HOLDING_LAYOUT, {
+            'symbol': f"{holding.symbol}:",
+            'amount': f"{holding.amount:g}",
+            'value': _format_money(holding.value),
+            'change': _format_change(holding.change_24h),
+        })
+        return True
+
+    def get_display_count(self):
+        """Return number of screens: total, P&L and, if enabled, one per holding"""
+        if self.show_holdings:
+            return SUMMARY_SCREENS + len(self.portfolio.holdings)
+        return SUMMARY_SCREENS
@@ -0,0 +1,52 @@
+"""
+Price Alert Module
+
+Shows latched price alerts from the AlertEngine. This module is not part of
+the regular rotation: the scheduler interrupts the rotation and shows its
+screens as soon as an alert fires, and re-shows them while they stay latched.
+"""
+
+from .base import BaseModule
+from utils.layout import TITLE_VALUE_LAYOUT
+
+
+class PriceAlertModule(BaseModule):
+    """Module for displaying latched price alerts"""
+    
+    def __init__(self, lcd, config, engine):
+        """
+        Initialize Price Alert module
+        
+        Args:
+            lcd: LCD display object
+            config: PRICE_ALERT_CONFIG dictionary
+            engine: AlertEngine providing the alerts
+        """
+        # Alerts are local data, so there is no fetch interval or failure handling
+        base_config = {'update_interval': 0, 'max_failed_attempts': 1}
+        base_config.update(config)
+        super().__init__('Price Alert', lcd, base_config)
+        
+        self.engine = engine
+        self.data = []
+    
+    def fetch_data(self):
+        """Get the currently latched alerts"""
+        return self.engine.active_alerts()
+    
+    def update_data(self):
+        """Refresh latched alerts (local, never fails)"""
+        self.data = self.fetch_data()
+    
+    def display_screen(self, screen):
+        """Display one latched alert"""
+        if screen >= len(self.data):
+            return False
+        
+        alert = self.data[screen]
+        self.lcd.render(TITLE_VALUE_LAYOUT, {'title': alert.title, 'value': alert.message})
+        return True
+    
+    def get_display_count(self):
+        """Return number of latched alerts"""
+        return len(self.data)
@@ -1,10 +1,25 @@
-"""Weather and Time module for displaying weather information and clock"""
+"""Weather and Time module for displaying weather information and clock
+
+Shows the device's location by default (public IP). With several configured
+locations, all of them are fetched in one bulk request per update interval
+and the module rotates through them (4 screens per location).
+"""
 
-import time
-from datetime import datetime
 from .base import BaseModule
-from clients import get_weather
-from utils.lcd import POS_CENTER, ROW_FIRST, ROW_SECOND
+from clients import get_weather, get_weather_bulk
+from utils.layout import Layout, Field
+from utils.lcd import POS_CENTER
+from utils import clock
+
+
+# Date and time / one weather detail per screen (long names and conditions scroll)
+WEATHER_LAYOUT = Layout([
+    [Field('clock')],
+    [Field('text', align=POS_CENTER, marquee=True)],
+])
+
+# Location, temperature, feels like, condition
+SCREENS_PER_LOCATION = 4
 
 
 class WeatherTimeModule(BaseModule):
@@ -14,7 +29,7 @@ class WeatherTimeModule(BaseModule):
         super().__init__('WeatherTime', lcd, config)
         
         # Validate required configuration
-        required_keys = ['api_key', 'ip', 'timeout', 'lcd_max_size']
+        required_keys = ['api_key', 'ip', 'timeout']
         missing_keys = [key for key in required_keys if key not in config]
         if missing_keys:
             raise ValueError(f"Weather module missing required config keys: {', '.join(missing_keys)}. Check config.py")
@@ -22,70 +37,71 @@ class WeatherTimeModule(BaseModule):
         self.api_key = config['api_key']
         self.ip = config['ip']
         self.timeout = config['timeout']
-        self.lcd_max_size = config['lcd_max_size']
+        # Empty list = device location (public IP)
+        self.locations = config.get('locations') or [self.ip]
         self.temperature_unit = config.get('temperature_unit', 'celsius').lower()
     
     def fetch_data(self):
-        """Fetch weather data from weatherapi"""
-
+        """Fetch weather data from weatherapi (dict of location -> WeatherSnapshot)"""
+        if len(self.locations) > 1:
+            return get_weather_bulk(
+                api_key=self.api_key,
+                locations=self.locations,
+                timeout=self.timeout,
+                cache_duration=self.update_interval
+            )
+        
+        location = self.locations[0]
         data = get_weather(
             api_key=self.api_key,
-            location=self.ip,
+            location=location,
             timeout=self.timeout,
             cache_duration=self.update_interval
         )
         
-        return data
-    
-    
-    def _print_clock(self):
-        """Print date and time on first row"""
-        now = datetime.now()
-        self.lcd.write_string(row=ROW_FIRST, text=now.strftime("%d/%m/%Y %H:%M"))
+        return {location: data} if data is not None else None
+
     
-    def display(self):
-        """Display weather and time information across multiple screens"""
+    def display_screen(self, screen):
+        """
+        Display weather and time information
+        Screens per location: 0 = location, 1 = temperature, 2 = feels like, 3 = condition
+        """
         if not self.is_data_ready():
-            return
+            return False
+        
+        location, screen = divmod(screen, SCREENS_PER_LOCATION)
+        data = self.data.get(self.locations[location])
+        if data is None:
+            return False
         
         unit = self.temperature_unit.upper()
-        temp = self.data.get('current', {}).get(f'temp_{unit.lower()}', '--')
-        feelslike = self.data.get('current', {}).get(f'feelslike_{unit.lower()}', '--')
-        condition = self.data.get('current', {}).get('condition', {}).get('text', '--')
-        location_name = self.data.get('location', {}).get('name', '--')
-        location_country = self.data.get('location', {}).get('country', '')
         
-        # Screen 1: Location
-        self.lcd.clear()
-        self._print_clock()
-        # Format location (add country if it fits)
-        if location_country and len(f"{location_name}, {location_country}") <= self.lcd_max_size:
-            location_text = f"{location_name}, {location_country}"
+        if screen == 0:
+            location_name = data.name or '--'
+            location_country = data.country or ''
+            # Format location (add country if it fits this display's width)
+            max_size = self.lcd.compiled(WEATHER_LAYOUT).width('text')
+            if location_country and len(f"{location_name}, {location_country}") <= max_size:
+                text = f"{location_name}, {location_country}"
+            else:
+                text = location_name
+        elif screen == 1:
+            temp = getattr(data, f'temp_{unit.lower()}', None)
+            text = f"Temp: {'--' if temp is None else temp}°{unit}"
+        elif screen == 2:
+            feelslike = getattr(data, f'feelslike_{unit.lower()}', None)
+            text = f"Sens: {'--' if feelslike is None else feelslike}°{unit}"
         else:
-            location_text = location_name
-        self.lcd.write_string(row=ROW_SECOND, text=location_text, pos=POS_CENTER)
-        time.sleep(self.display_duration)
-
-        # Screen 2: Temperature
-        self.lcd.clear()
-        self._print_clock()
-        self.lcd.write_string(row=ROW_SECOND, text=f"Temp: {temp}{unit}", pos=POS_CENTER)
-        time.sleep(self.display_duration)
-        
-        # Screen 3: Feels like
-        self.lcd.clear()
-        self._print_clock()
-        self.lcd.write_string(row=ROW_SECOND, text=f"Sens: {feelslike}{unit}", pos=POS_CENTER)
-        time.sleep(self.display_duration)
-        
-        # Screen 4: Condition
-        self.lcd.clear()
-        self._print_clock()
-        self.lcd.write_string(row=ROW_SECOND, text=condition, pos=POS_CENTER)
-        time.sleep(self.display_duration)
+            text = data.condition or '--'
         
+        self.lcd.render(WEATHER_LAYOUT, {
+            'clock': clock.datetime_now().strftime("%d/%m/%Y %H:%M"),
+            'text': text,
+        })
+        return True
     
     def get_display_count(self):
         """Return number of screens this module displays"""
-        return 4
+        return SCREENS_PER_LOCATION * len(self.locations)
 
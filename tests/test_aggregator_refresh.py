@@ -0,0 +1,79 @@
+"""
+Aggregator server tests: sources refresh independently; a failed refresh keeps the last response
+
+Run with: python -m pytest tests
+"""
+
+import threading
+import time
+import pytest
+
+from clients.aggregator_server import AggregatorServer
+
+
+@pytest.fixture
+def hang():
+    """Event a hung fetch waits for; set at the end of the test to let its thread exit"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def wait_for(condition, timeout=5):
+    """Poll condition until it is true; fails the test after timeout seconds"""
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return
+        time.sleep(0.01)
+    pytest.fail("Timed out waiting for condition")
+
+
+def test_hung_source_does_not_stall_others(hang):
+    calls = {'hung': 0, 'fast': 0}
+
+    def hung(query, force_refresh):
+        calls['hung'] += 1
+        if calls['hung'] > 1:
+            hang.wait()
+        return {'value': 'hung'}
+
+    def fast(query, force_refresh):
+        calls['fast'] += 1
+        return {'value': calls['fast']}
+
+    server = AggregatorServer({'hung': (hung, 0), 'fast': (fast, 0)})
+    hung_entry = server._entry('hung', {})
+    fast_entry = server._entry('fast', {})
+    server._refresh(hung_entry, force_refresh=False)
+    server._refresh(fast_entry, force_refresh=False)
+
+    server._running = True
+    threading.Thread(target=server._refresh_loop, daemon=True).start()
+    try:
+        # The second hung refresh never returns; the other source keeps refreshing
+        wait_for(lambda: calls['fast'] >= 3)
+        assert calls['hung'] == 2
+        assert hung_entry.body == b'{"value":"hung"}'
+    finally:
+        server._running = False
+
+
+def test_failed_refresh_keeps_last_response():
+    results = [{'value': 1}, None]
+
+    def source(query, force_refresh):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    server = AggregatorServer({'source': (source, 60)})
+    entry = server._entry('source', {})
+    server._refresh(entry, force_refresh=False)
+    body, etag = entry.body, entry.etag
+
+    results += [RuntimeError("upstream down")]
+    server._refresh(entry, force_refresh=True)
+    server._refresh(entry, force_refresh=True)
+    assert (entry.body, entry.etag) == (body, etag)
@@ -0,0 +1,116 @@
+"""
+Cache refresh tests: a hung fetch (abandoned by the watchdog) blocks no later refresh
+
+Run with: python -m pytest tests
+"""
+
+import threading
+import time
+import pytest
+
+from clients import weather_api
+from utils import cache as cache_utils
+from utils.cache import create_cache, cached_api_call, update_cache
+from utils.watchdog import Watchdog
+
+
+@pytest.fixture
+def hang():
+    """Event a hung fetch waits for; set at the end of the test to let its worker exit"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture(autouse=True)
+def short_refresh_wait(monkeypatch):
+    monkeypatch.setattr(cache_utils, 'REFRESH_WAIT', 0.2)
+
+
+def expired_cache(data):
+    cache = create_cache()
+    update_cache(cache, data, cache_duration=60)
+    cache['timestamp'] -= 600
+    return cache
+
+
+def test_hung_fetch_serves_cache_to_next_refresh(hang):
+    cache = expired_cache({'value': 'old'})
+    calls = []
+
+    def hung_fetch():
+        calls.append('hung')
+        hang.wait()
+        return {'value': 'late'}
+
+    watchdog = Watchdog(fetch_timeout=0.2)
+    assert not watchdog.run('test', lambda: cached_api_call(cache, hung_fetch, cache_duration=60))
+
+    # The abandoned worker still holds the refresh: serve the cache instead of blocking
+    started = time.time()
+    data = cached_api_call(cache, lambda: calls.append('second') or {'value': 'new'}, cache_duration=60)
+    assert data == {'value': 'old'}
+    assert calls == ['hung']
+    assert time.time() - started < 2
+
+    # Once the stuck fetch returns, its data is cached as usual
+    hang.set()
+    watchdog.stuck_workers()
+    for _ in range(100):
+        if cache['refresh'] is None:
+            break
+        time.sleep(0.01)
+    assert cached_api_call(cache, lambda: {'value': 'new'}, cache_duration=60) == {'value': 'late'}
+
+
+def test_refresh_presumed_hung_is_taken_over(hang, monkeypatch):
+    cache = expired_cache({'value': 'old'})
+
+    def hung_fetch():
+        hang.wait()
+        return {'value': 'late'}
+
+    worker = threading.Thread(target=cached_api_call, args=(cache, hung_fetch), kwargs={'cache_duration': 60},
+                              daemon=True)
+    worker.start()
+    for _ in range(100):
+        if cache['refresh'] is not None:
+            break
+        time.sleep(0.01)
+
+    monkeypatch.setattr(cache_utils, 'REFRESH_TAKEOVER_AFTER', 0)
+    assert cached_api_call(cache, lambda: {'value': 'new'}, cache_duration=60) == {'value': 'new'}
+
+    # The late result of the taken-over refresh doesn't overwrite newer data
+    hang.set()
+    worker.join(1)
+    assert cache['data'] == {'value': 'new'}
+
+
+def test_hung_bulk_fetch_serves_cache_to_next_refresh(hang, monkeypatch):
+    calls = []
+
+    def fetch_bulk(api_key, locations, timeout):
+        calls.append(list(locations))
+        if len(calls) == 1:
+            return {location: f"{location} old" for location in locations}
+        hang.wait()
+        return None
+
+    monkeypatch.setattr(weather_api, '_location_caches', {})
+    monkeypatch.setattr(weather_api, '_fetch_bulk', fetch_bulk)
+    locations = ['London', 'Paris']
+    assert weather_api.get_weather_bulk('key', locations, cache_duration=60) == {
+        'London': 'London old', 'Paris': 'Paris old'}
+
+    # Expire both; the next bulk refresh hangs and is abandoned
+    for cache in weather_api._location_caches.values():
+        cache['timestamp'] -= 600
+    watchdog = Watchdog(fetch_timeout=0.2)
+    assert not watchdog.run('weather', lambda: weather_api.get_weather_bulk('key', locations, cache_duration=60))
+
+    started = time.time()
+    assert weather_api.get_weather_bulk('key', locations, cache_duration=60) == {
+        'London': 'London old', 'Paris': 'Paris old'}
+    assert len(calls) == 2
+    assert time.time() - started < 2
@@ -0,0 +1,79 @@
+"""
+Fetch budget tests: refreshes skipped for lack of budget run in the next rotation
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from modules.base import BaseModule
+from utils import clock, deadline
+from utils.cache import create_cache, cached_api_call
+from utils.scheduler import Scheduler
+
+
+class FakeModule(BaseModule):
+    """Module whose fetch spends fetch_seconds of the budget, like a request through clients/http.py"""
+
+    def __init__(self, name, fetch_seconds):
+        super().__init__(name, None, {
+            'enabled': True,
+            'update_interval': 300,
+            'display_duration': 5,
+            'max_failed_attempts': 3,
+        })
+        self.fetch_seconds = fetch_seconds
+        self.fetches = 0
+        self.cache = create_cache()
+
+    def fetch_data(self):
+        return cached_api_call(self.cache, self._fetch, cache_duration=self.update_interval, api_name=self.name)
+
+    def _fetch(self):
+        # clients/http.py: no request without budget; what is left counts as spent
+        left = deadline.remaining()
+        if left is not None and left < 1:
+            deadline.charge(max(left, 0))
+            return None
+        self.fetches += 1
+        deadline.charge(self.fetch_seconds)
+        return {'fetch': self.fetches}
+
+    def display_screen(self, screen):
+        return bool(self.data)
+
+
+@pytest.fixture
+def virtual_clock():
+    virtual = clock.VirtualClock(start=1_700_000_000)
+    clock.set_clock(virtual)
+    yield virtual
+    clock.set_clock(clock.SystemClock())
+
+
+def test_budget_skipped_refresh_runs_next_rotation(virtual_clock):
+    slow = FakeModule('Slow', fetch_seconds=2)
+    skipped = FakeModule('Skipped', fetch_seconds=2)
+    scheduler = Scheduler({'slow': slow, 'skipped': skipped}, ['slow', 'skipped'], fetch_budget=5)
+
+    # Both fit into the budget
+    scheduler.run_cycle()
+    assert (slow.fetches, skipped.fetches) == (1, 1)
+
+    # Both due; the slow fetch uses up the budget, the other refresh is skipped
+    virtual_clock.advance(300)
+    slow.fetch_seconds = 6
+    last_update = skipped.last_update
+    scheduler.run_cycle()
+    assert (slow.fetches, skipped.fetches) == (2, 1)
+    assert skipped.data == {'fetch': 1}
+    assert skipped.last_update == last_update
+    assert skipped.consecutive_failures == 0
+    assert skipped.needs_update()
+    assert not slow.needs_update()
+
+    # Next rotation: the skipped refresh runs, not a full update_interval later
+    scheduler.run_cycle()
+    assert (slow.fetches, skipped.fetches) == (2, 2)
+    assert skipped.data == {'fetch': 2}
+    assert not skipped.needs_update()
@@ -0,0 +1,139 @@
+"""
+Price stream tests against the local stand-in server (tools/stream_standin.py)
+
+Run with: python -m pytest tests
+"""
+
+import time
+import types
+import pytest
+
+pytest.importorskip('websocket')
+
+from clients import price_stream
+from clients.price_stream import PriceStream
+from clients.snapshots import PriceSnapshot
+from tools.stream_standin import StandinServer
+
+
+def wait_for(condition, timeout=5):
+    """Poll condition until it is true; fails the test after timeout seconds"""
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return
+        time.sleep(0.01)
+    pytest.fail("Timed out waiting for condition")
+
+
+def send_until_live(server, stream, pair, price, change_24h=0.0):
+    """Keep sending a ticker until the stream has it (the client may be reconnecting)"""
+    wait_for(lambda: server.send_ticker(pair, price, change_24h) and stream.is_live()
+             and stream.snapshot()[stream._pair_to_id[pair]].price == price)
+
+
+@pytest.fixture
+def server():
+    server = StandinServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def backoff_delays(monkeypatch):
+    """Record the reconnect delays instead of sleeping them (no jitter)"""
+    delays = []
+
+    def sleep(seconds):
+        delays.append(seconds)
+        time.sleep(0.01)
+
+    monkeypatch.setattr(price_stream, 'time', types.SimpleNamespace(time=time.time, sleep=sleep))
+    monkeypatch.setattr(price_stream.random, 'uniform', lambda low, high: high)
+    return delays
+
+
+def test_stream_keeps_latest_price(server):
+    stream = PriceStream({'BTC': 'bitcoin', 'ETH': 'ethereum'}, 'usd', url=server.url)
+    stream.start()
+    try:
+        wait_for(lambda: server.client_count() == 1)
+        assert server.paths[0] == '/stream?streams=btcusdt@ticker/ethusdt@ticker'
+        assert not stream.is_live()
+
+        server.send_ticker('BTCUSDT', 65000.126, 2.5)
+        server.send_ticker('BTCUSDT', 65100.0, 2.6)
+        wait_for(lambda: stream.snapshot().get('bitcoin') == PriceSnapshot(65100.0, 2.6))
+        assert stream.is_live()
+        assert 'ethereum' not in stream.snapshot()
+    finally:
+        stream.stop()
+
+
+def test_reconnects_with_backoff(server, backoff_delays):
+    server.refuse(4)
+    stream = PriceStream({'BTC': 'bitcoin'}, 'usd', url=server.url, max_backoff=4)
+    stream.start()
+    try:
+        # Refused handshakes: delays double up to max_backoff
+        wait_for(lambda: server.client_count() == 1)
+        assert backoff_delays == [1, 2, 4, 4]
+        server.send_ticker('BTCUSDT', 65000.0)
+        wait_for(stream.is_live)
+
+        # A successful connection resets the backoff
+        server.drop_clients()
+        wait_for(lambda: server.connections == 2 and server.client_count() == 1)
+        assert backoff_delays == [1, 2, 4, 4, 1]
+        assert not stream.is_live()
+
+        server.send_ticker('BTCUSDT', 65500.0)
+        wait_for(lambda: stream.snapshot()['bitcoin'].price == 65500.0)
+        assert stream.is_live()
+    finally:
+        stream.stop()
+
+
+def test_crypto_module_falls_back_to_polling_when_stale(server, monkeypatch):
+    from modules import crypto_ticker
+
+    polled = []
+
+    def get_crypto_prices_multi(**kwargs):
+        polled.append(kwargs['crypto_ids'])
+        return {'usd': {'bitcoin': PriceSnapshot(60000.0, 1.0)}}
+
+    monkeypatch.setattr(crypto_ticker, 'get_crypto_prices_multi', get_crypto_prices_multi)
+    module = crypto_ticker.CryptoTickerModule(None, {
+        'enabled': True,
+        'update_interval': 300,
+        'display_duration': 5,
+        'max_failed_attempts': 3,
+        'symbols': {'BTC': 'bitcoin'},
+        'fiat': 'usd',
+        'timeout': 10,
+        'stream': {'enabled': True, 'url': server.url, 'stale_after': 0.5},
+    })
+    try:
+        wait_for(lambda: server.client_count() == 1)
+
+        # Live stream: prices come from it, nothing is polled
+        send_until_live(server, module.stream, 'BTCUSDT', 65000.0, 2.5)
+        module.update_data()
+        assert module.data['usd']['bitcoin'] == PriceSnapshot(65000.0, 2.5)
+        assert polled == []
+
+        # No message for stale_after: the module polls again
+        wait_for(lambda: not module.stream.is_live())
+        assert module.needs_update()
+        module.update_data()
+        assert polled == ['bitcoin']
+        assert module.data['usd']['bitcoin'] == PriceSnapshot(60000.0, 1.0)
+
+        # Stream back: streamed prices take over again
+        send_until_live(server, module.stream, 'BTCUSDT', 65200.0, 2.7)
+        module.update_data()
+        assert module.data['usd']['bitcoin'] == PriceSnapshot(65200.0, 2.7)
+        assert polled == ['bitcoin']
+    finally:
+        module.close()
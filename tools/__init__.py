@@ -0,0 +1,3 @@
+"""
+Development tools for the crypto ticker application (not used at runtime)
+"""
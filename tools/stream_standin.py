@@ -0,0 +1,287 @@
+"""
+Price Stream Stand-in Server
+
+Minimal local WebSocket server speaking the Binance combined-stream ticker
+format, for testing clients/price_stream.py without internet access.
+Standard library only.
+
+Run it and point CRYPTO_MODULE_CONFIG['stream']['url'] at it:
+    python -m tools.stream_standin --port 8765 BTCUSDT ETHUSDT
+    'url': 'ws://127.0.0.1:8765/stream'
+
+Tests drive it directly: send_ticker() pushes a price to every client,
+drop_clients() cuts the connections, refuse(n) rejects the next n handshakes
+and simply not sending lets the stream go stale.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+
+# RFC 6455 handshake constant
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def encode_frame(payload, opcode=OPCODE_TEXT):
+    """Encode one unmasked, final server frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def ticker_message(pair, price, change_24h):
+    """Build a combined-stream 24h ticker message (only the fields the client reads)"""
+    return json.dumps({
+        'stream': f"{pair.lower()}@ticker",
+        'data': {'e': '24hrTicker', 's': pair.upper(), 'c': f"{price:.8f}", 'P': f"{change_24h:.3f}"},
+    })
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """One client connection: handshake, then answer control frames until it closes"""
+
+    def handle(self):
+        server = self.server.standin
+        sock = self.request
+        request = self._read_request(sock)
+        if request is None:
+            return
+        path, headers = request
+
+        if server._take_refusal() or 'sec-websocket-key' not in headers:
+            sock.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+
+        accept = base64.b64encode(
+            hashlib.sha1((headers['sec-websocket-key'] + WEBSOCKET_GUID).encode('ascii')).digest()
+        ).decode('ascii')
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode('ascii'))
+
+        server._add_client(sock, path)
+        try:
+            while True:
+                frame = self._read_frame(sock)
+                if frame is None:
+                    return
+                opcode, payload = frame
+                if opcode == OPCODE_CLOSE:
+                    server._send(sock, encode_frame(payload[:2], OPCODE_CLOSE))
+                    return
+                if opcode == OPCODE_PING:
+                    server._send(sock, encode_frame(payload, OPCODE_PONG))
+        except OSError:
+            return
+        finally:
+            server._remove_client(sock)
+
+    @staticmethod
+    def _read_request(sock):
+        """Read the HTTP upgrade request; returns (path, lowercased headers) or None"""
+        data = b''
+        while b'\r\n\r\n' not in data:
+            chunk = sock.recv(4096)
+            if not chunk or len(data) > 65536:
+                return None
+            data += chunk
+        lines = data.split(b'\r\n\r\n', 1)[0].decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        if len(parts) < 2:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return parts[1], headers
+
+    @staticmethod
+    def _recv_exactly(sock, count):
+        """Read count bytes, or None if the connection closed"""
+        data = b''
+        while len(data) < count:
+            chunk = sock.recv(count - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _read_frame(self, sock):
+        """Read one (masked) client frame; returns (opcode, payload) or None"""
+        header = self._recv_exactly(sock, 2)
+        if header is None:
+            return None
+        opcode = header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            extended = self._recv_exactly(sock, 2)
+            length = struct.unpack('!H', extended)[0] if extended else None
+        elif length == 127:
+            extended = self._recv_exactly(sock, 8)
+            length = struct.unpack('!Q', extended)[0] if extended else None
+        if length is None:
+            return None
+        mask = self._recv_exactly(sock, 4) if header[1] & 0x80 else b'\0\0\0\0'
+        payload = self._recv_exactly(sock, length) if length else b''
+        if mask is None or payload is None:
+            return None
+        return opcode, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StandinServer:
+    """Local WebSocket ticker feed controlled by the caller"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Initialize the server (call start() to listen)
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0: any free port, see url)
+        """
+        self._server = _Server((host, port), _Handler, bind_and_activate=False)
+        self._server.standin = self
+        self._clients = []
+        self._refusals = 0
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._thread = None
+        self.connections = 0  # successful handshakes so far
+        self.paths = []  # request path of every handshake (shows the subscribed streams)
+
+    @property
+    def url(self):
+        """WebSocket URL to configure as the stream 'url'"""
+        host, port = self._server.server_address[:2]
+        return f"ws://{host}:{port}/stream"
+
+    def start(self):
+        """Start listening in a background thread"""
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stream-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Close every connection and stop listening"""
+        self.drop_clients()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def send_ticker(self, pair, price, change_24h=0.0):
+        """
+        Push a ticker update to every connected client
+
+        Args:
+            pair: Exchange pair (e.g. 'BTCUSDT')
+            price: Last price
+            change_24h: 24h change in percent
+
+        Returns:
+            int: Number of clients the update was sent to
+        """
+        frame = encode_frame(ticker_message(pair, price, change_24h).encode('utf-8'))
+        with self._lock:
+            clients = list(self._clients)
+        return sum(self._send(sock, frame) for sock in clients)
+
+    def drop_clients(self):
+        """Cut every connection without a close frame (like a network failure)"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def refuse(self, count):
+        """Answer the next count handshakes with 503"""
+        with self._lock:
+            self._refusals = count
+
+    def client_count(self):
+        """Number of currently connected clients"""
+        with self._lock:
+            return len(self._clients)
+
+    def _take_refusal(self):
+        with self._lock:
+            if self._refusals <= 0:
+                return False
+            self._refusals -= 1
+            return True
+
+    def _add_client(self, sock, path):
+        with self._lock:
+            self._clients.append(sock)
+            self.connections += 1
+            self.paths.append(path)
+
+    def _remove_client(self, sock):
+        with self._lock:
+            if sock in self._clients:
+                self._clients.remove(sock)
+
+    def _send(self, sock, frame):
+        with self._send_lock:
+            try:
+                sock.sendall(frame)
+                return True
+            except OSError:
+                return False
+
+
+def main():
+    """Serve a random walk for the given pairs until interrupted"""
+    parser = argparse.ArgumentParser(description="Local WebSocket stand-in for the price stream")
+    parser.add_argument('pairs', nargs='*', default=['BTCUSDT', 'ETHUSDT'], help="exchange pairs to tick")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between updates")
+    args = parser.parse_args()
+
+    server = StandinServer(args.host, args.port).start()
+    print(f"Stream stand-in: Serving {', '.join(args.pairs)} on {server.url}")
+    prices = {pair: random.uniform(1, 100000) for pair in args.pairs}
+    try:
+        while True:
+            for pair in prices:
+                prices[pair] *= 1 + random.uniform(-0.001, 0.001)
+                server.send_ticker(pair, prices[pair], random.uniform(-5, 5))
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
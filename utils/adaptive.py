@@ -0,0 +1,76 @@
+"""
+Adaptive Refresh Intervals
+
+Adjusts a module's update interval based on how much prices moved between
+consecutive fetches: shorter while the market moves fast, longer while it is
+flat, always within configured bounds.
+"""
+
+
+class AdaptiveInterval:
+    """
+    Volatility-driven update interval
+
+    After each fresh fetch, the largest relative price move since the previous
+    fetch decides the next interval:
+    - move >= fast_move_pct: interval is multiplied by shrink_factor
+    - move <= flat_move_pct: interval is multiplied by grow_factor
+    - otherwise the interval is kept
+    """
+
+    def __init__(self, base_interval, min_interval, max_interval,
+                 fast_move_pct=1.0, flat_move_pct=0.2, shrink_factor=0.5, grow_factor=1.5):
+        """
+        Initialize adaptive interval
+
+        Args:
+            base_interval: Starting interval in seconds
+            min_interval: Lower bound in seconds
+            max_interval: Upper bound in seconds
+            fast_move_pct: Move (in %) that counts as a fast market
+            flat_move_pct: Move (in %) that counts as a flat market
+            shrink_factor: Multiplier applied on fast moves (< 1)
+            grow_factor: Multiplier applied on flat markets (> 1)
+        """
+        if not min_interval <= base_interval <= max_interval:
+            raise ValueError("Adaptive interval requires min_interval <= update_interval <= max_interval")
+
+        self.interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.fast_move_pct = fast_move_pct
+        self.flat_move_pct = flat_move_pct
+        self.shrink_factor = shrink_factor
+        self.grow_factor = grow_factor
+        self._last_prices = {}
+
+    def observe(self, prices, allow_shorter=True):
+        """
+        Feed freshly fetched prices and compute the next interval
+
+        Args:
+            prices: Dict of asset id -> price
+            allow_shorter: False to never shorten (e.g. API budget running low)
+
+        Returns:
+            float: Next update interval in seconds
+        """
+        largest_move = None
+        for asset, price in prices.items():
+            last = self._last_prices.get(asset)
+            if last:
+                move = abs(price - last) / last * 100
+                if largest_move is None or move > largest_move:
+                    largest_move = move
+
+        self._last_prices = dict(prices)
+
+        if largest_move is None:
+            return self.interval
+
+        if largest_move >= self.fast_move_pct and allow_shorter:
+            self.interval = max(self.min_interval, self.interval * self.shrink_factor)
+        elif largest_move <= self.flat_move_pct:
+            self.interval = min(self.max_interval, self.interval * self.grow_factor)
+
+        return self.interval
@@ -0,0 +1,243 @@
+"""
+Price Alert Engine
+
+Evaluates threshold and percent-move alerts incrementally on every fresh
+price update. Each rule keeps O(1) state (last price, plus monotonic min/max
+queues for move rules), so an update never rescans price history.
+
+Fired alerts stay latched until acknowledged or until latch_timeout expires.
+Listeners (e.g. the screen scheduler) are woken through threading.Event
+objects as soon as an alert fires.
+"""
+
+import threading
+from collections import deque
+from utils import clock
+
+
+RULE_ABOVE = 'above'
+RULE_BELOW = 'below'
+RULE_MOVE = 'move'
+
+
+class Alert:
+    """A fired alert"""
+
+    __slots__ = ('symbol', 'title', 'message', 'fired_at')
+
+    def __init__(self, symbol, title, message, fired_at):
+        self.symbol = symbol
+        self.title = title
+        self.message = message
+        self.fired_at = fired_at
+
+
+class _ThresholdRule:
+    """Fires when the price crosses a level (re-arms after crossing back)"""
+
+    def __init__(self, symbol, crypto_id, direction, level):
+        self.symbol = symbol
+        self.crypto_id = crypto_id
+        self.direction = direction
+        self.level = level
+        self._last_price = None
+
+    def evaluate(self, price, now):
+        last, self._last_price = self._last_price, price
+        if last is None:
+            return None
+
+        if self.direction == RULE_ABOVE and last < self.level <= price:
+            return Alert(self.symbol, f"{self.symbol} ALERT", f"Above {self.level:g}", now)
+        if self.direction == RULE_BELOW and last > self.level >= price:
+            return Alert(self.symbol, f"{self.symbol} ALERT", f"Below {self.level:g}", now)
+        return None
+
+
+class _MoveRule:
+    """Fires when the price moves percent % or more within window seconds
+
+    Keeps monotonic queues of (timestamp, price) so the window minimum and
+    maximum are available in amortized O(1) per update.
+    """
+
+    def __init__(self, symbol, crypto_id, percent, window):
+        self.symbol = symbol
+        self.crypto_id = crypto_id
+        self.percent = percent
+        self.window = window
+        self._min = deque()  # increasing prices
+        self._max = deque()  # decreasing prices
+
+    def _push(self, price, now):
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        self._min.append((now, price))
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._max.append((now, price))
+
+        cutoff = now - self.window
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    def evaluate(self, price, now):
+        self._push(price, now)
+        low = self._min[0][1]
+        high = self._max[0][1]
+
+        change = None
+        if low > 0 and (price - low) / low * 100 >= self.percent:
+            change = (price - low) / low * 100
+        elif high > 0 and (high - price) / high * 100 >= self.percent:
+            change = -(high - price) / high * 100
+
+        if change is None:
+            return None
+
+        # Restart the window so the same move doesn't fire again
+        self._min.clear()
+        self._max.clear()
+        self._push(price, now)
+
+        minutes = int(self.window // 60)
+        return Alert(self.symbol, f"{self.symbol} ALERT", f"{change:+.1f}% in {minutes}m", now)
+
+
+class AlertEngine:
+    """
+    Incremental price alert evaluator
+
+    Call on_prices() with every fresh price payload. Fired alerts are latched
+    and listeners registered with add_listener() are notified immediately.
+    """
+
+    def __init__(self, rules, symbols, fiat, latch_timeout=300, reminder_interval=60):
+        """
+        Initialize the alert engine
+
+        Args:
+            rules: List of rule dicts, e.g.
+                {'symbol': 'BTC', 'type': 'above', 'level': 100000}
+                {'symbol': 'BTC', 'type': 'move', 'percent': 3, 'window': 3600}
+            symbols: Dict of acronym -> CoinGecko id (CRYPTO_MODULE_CONFIG['symbols'])
+            fiat: Fiat currency the rules are expressed in
+            latch_timeout: Seconds an alert stays latched without acknowledgement
+            reminder_interval: Seconds between re-showing latched alerts
+        """
+        self.fiat = fiat
+        self.latch_timeout = latch_timeout
+        self.reminder_interval = reminder_interval
+        self._rules_by_id = {}
+        self._active = []
+        self._listeners = {}  # event -> {'pending': bool, 'last_shown': float}
+        self._lock = threading.Lock()
+
+        for rule in rules:
+            symbol = rule['symbol']
+            if symbol not in symbols:
+                raise ValueError(f"Alert rule for unknown symbol '{symbol}'. Add it to CRYPTO_MODULE_CONFIG['symbols']")
+            crypto_id = symbols[symbol]
+
+            if rule['type'] in (RULE_ABOVE, RULE_BELOW):
+                evaluator = _ThresholdRule(symbol, crypto_id, rule['type'], rule['level'])
+            elif rule['type'] == RULE_MOVE:
+                evaluator = _MoveRule(symbol, crypto_id, rule['percent'], rule.get('window', 3600))
+            else:
+                raise ValueError(f"Unknown alert rule type '{rule['type']}'")
+
+            self._rules_by_id.setdefault(crypto_id, []).append(evaluator)
+
+    def add_listener(self):
+        """
+        Register a listener (e.g. one per display)
+
+        Returns:
+            threading.Event: Set whenever a new alert fires; also identifies
+                             the listener in take_due()
+        """
+        event = threading.Event()
+        with self._lock:
+            self._listeners[event] = {'pending': False, 'last_shown': 0}
+        return event
+
+    def on_prices(self, payload):
+        """
+        Evaluate rules against a fresh price payload
+
+        Args:
+            payload: Dict with 'prices' (crypto ID -> PriceSnapshot)
+                     and 'fiat' (currency code of the prices)
+        """
+        if payload.get('fiat') != self.fiat:
+            return
+
+        now = clock.now()
+        fired = []
+        with self._lock:
+            for crypto_id, snapshot in payload['prices'].items():
+                price = snapshot.price
+                if not isinstance(price, (int, float)):
+                    continue
+                for rule in self._rules_by_id.get(crypto_id, ()):
+                    alert = rule.evaluate(price, now)
+                    if alert is not None:
+                        fired.append(alert)
+
+            if fired:
+                self._active.extend(fired)
+                for state in self._listeners.values():
+                    state['pending'] = True
+
+        for alert in fired:
+            print(f"Price alert: {alert.title} {alert.message}")
+        if fired:
+            for event in list(self._listeners):
+                event.set()
+
+    def active_alerts(self):
+        """
+        Get latched alerts, dropping the ones that timed out
+
+        Returns:
+            list: Active Alert objects, oldest first
+        """
+        cutoff = clock.now() - self.latch_timeout
+        with self._lock:
+            self._active = [alert for alert in self._active if alert.fired_at > cutoff]
+            return list(self._active)
+
+    def take_due(self, listener):
+        """
+        Check if a listener should show alert screens now and mark them as shown
+
+        Args:
+            listener: Event returned by add_listener()
+
+        Returns:
+            list: Alerts to show (newly fired, or latched and due for a reminder)
+        """
+        alerts = self.active_alerts()
+        if not alerts:
+            return []
+
+        now = clock.now()
+        with self._lock:
+            state = self._listeners[listener]
+            if not state['pending'] and now - state['last_shown'] < self.reminder_interval:
+                return []
+            state['pending'] = False
+            state['last_shown'] = now
+        return alerts
+
+    def acknowledge(self):
+        """Clear all latched alerts"""
+        with self._lock:
+            count = len(self._active)
+            self._active = []
+            for state in self._listeners.values():
+                state['pending'] = False
+        if count:
+            print(f"Price alerts: {count} acknowledged")
@@ -4,13 +4,21 @@ Cache Utilities
 Provides reusable caching functionality for API clients to avoid code duplication.
 """
 
-import time
+import threading
 from functools import wraps
+from utils import clock, deadline
 
 
 # Default cache durations (in seconds)
 DEFAULT_CACHE_DURATION = 600  # 10 minutes
 
+# Seconds a caller waits for a refresh another caller (e.g. display) has in flight
+REFRESH_WAIT = 30
+
+# A refresh in flight for longer is presumed hung (e.g. abandoned by the watchdog);
+# the next caller starts a new one
+REFRESH_TAKEOVER_AFTER = 300
+
 
 def create_cache():
     """
@@ -23,7 +31,9 @@ def create_cache():
         'data': None,
         'timestamp': 0,
         'cache_duration': DEFAULT_CACHE_DURATION,
-        'key': None  # Optional key for multi-tenant caching
+        'key': None,  # Optional key for multi-tenant caching
+        'lock': threading.Lock(),  # Guards the fields; never held while fetching
+        'refresh': None  # Refresh in flight (see claim_refresh)
     }
 
 
@@ -47,7 +57,7 @@ def is_cache_valid(cache, cache_duration=None, cache_key=None):
         return False
     
     # Check cache age
-    current_time = time.time()
+    current_time = clock.now()
     duration = cache_duration if cache_duration is not None else cache.get('cache_duration', DEFAULT_CACHE_DURATION)
     cache_age = current_time - cache['timestamp']
     
@@ -64,7 +74,7 @@ def update_cache(cache, data, cache_duration=None, cache_key=None):
         cache_duration: Cache duration in seconds
         cache_key: Optional key for multi-tenant caching
     """
-    current_time = time.time()
+    current_time = clock.now()
     cache['data'] = data
     cache['timestamp'] = current_time
     
@@ -88,7 +98,70 @@ def get_cache_age(cache):
     if cache['data'] is None:
         return None
     
-    return time.time() - cache['timestamp']
+    return clock.now() - cache['timestamp']
+
+
+def claim_refresh(cache, refresh=None):
+    """
+    Mark a refresh of the cache as in flight, unless another caller's refresh is
+
+    Call with the lock guarding the cache held; fetch after releasing it and
+    pass the result to finish_refresh(). Only a refresh presumed hung
+    (REFRESH_TAKEOVER_AFTER) is taken over.
+
+    Args:
+        cache: Cache dictionary
+        refresh: Refresh to claim with (e.g. one shared by several caches of a bulk request)
+
+    Returns:
+        tuple: (refresh, True) if the caller fetches, or (the other caller's refresh, False)
+    """
+    current = cache['refresh']
+    if current is not None and clock.now() - current['started'] < REFRESH_TAKEOVER_AFTER:
+        return current, False
+    if refresh is None:
+        refresh = {'done': threading.Event(), 'started': clock.now(), 'ok': False}
+    cache['refresh'] = refresh
+    return refresh, True
+
+
+def finish_refresh(cache, refresh, data, cache_duration=None, cache_key=None):
+    """
+    Store the data of a claimed refresh and wake the callers waiting for it
+
+    Call with the lock guarding the cache held. A refresh that was taken over
+    meanwhile doesn't overwrite the cache.
+
+    Args:
+        cache: Cache dictionary
+        refresh: Refresh returned by claim_refresh()
+        data: Fetched data, or None if the fetch failed
+        cache_duration: Cache duration in seconds
+        cache_key: Optional key for multi-tenant caching
+    """
+    if cache['refresh'] is refresh:
+        cache['refresh'] = None
+        if data is not None:
+            update_cache(cache, data, cache_duration, cache_key)
+    refresh['ok'] = refresh['ok'] or data is not None
+    refresh['done'].set()
+
+
+def wait_for_refresh(refresh):
+    """
+    Wait for another caller's refresh, at most REFRESH_WAIT and the remaining fetch budget
+
+    The time waited is charged to the fetch budget (see utils/deadline.py).
+
+    Returns:
+        bool: True if the refresh finished, False if it is still in flight
+    """
+    left = deadline.remaining()
+    timeout = REFRESH_WAIT if left is None else min(REFRESH_WAIT, max(left, 0))
+    started = clock.now()
+    finished = clock.wait(refresh['done'], timeout)
+    deadline.charge(clock.now() - started)
+    return finished
 
 
 def cached_api_call(cache, fetch_function, cache_duration=DEFAULT_CACHE_DURATION, 
@@ -100,6 +173,13 @@ def cached_api_call(cache, fetch_function, cache_duration=DEFAULT_CACHE_DURATION
     1. Check if cache is valid
     2. If valid, return cached data
     3. If not, fetch fresh data and update cache
+    4. If the fetch was cut short by the cycle's fetch budget, raise
+       FetchSkippedError, so the caller keeps its data and retries in the
+       next rotation instead of taking expired data for fresh (see utils/deadline.py)
+    
+    The fetch runs without holding the cache lock. Callers arriving while a
+    refresh is in flight wait for it (at most REFRESH_WAIT) and reuse its
+    data; if it is hung, they get the cached data instead of blocking.
     
     Args:
         cache: Cache dictionary
@@ -111,19 +191,48 @@ def cached_api_call(cache, fetch_function, cache_duration=DEFAULT_CACHE_DURATION
     
     Returns:
         Data from cache or fresh API call
-    """
-    # Check if cache is valid
-    if not force_refresh and is_cache_valid(cache, cache_duration, cache_key):
-        cache_age = get_cache_age(cache)
-        print(f"{api_name}: Using cached data (age: {cache_age:.1f}s)")
-        return cache['data']
     
-    # Fetch fresh data
-    data = fetch_function()
+    Raises:
+        FetchSkippedError: If the fetch budget was used up before fresh data arrived
+    """
+    while True:
+        with cache['lock']:
+            # Check if cache is valid
+            if not force_refresh and is_cache_valid(cache, cache_duration, cache_key):
+                cache_age = get_cache_age(cache)
+                print(f"{api_name}: Using cached data (age: {cache_age:.1f}s)")
+                return cache['data']
+            refresh, owner = claim_refresh(cache)
+        if owner:
+            break
+        
+        # Another caller is refreshing: reuse its data instead of fetching twice
+        if not wait_for_refresh(refresh):
+            if deadline.expired():
+                print(f"{api_name}: Fetch budget used up, refresh skipped until the next rotation")
+                raise deadline.FetchSkippedError(f"{api_name}: fetch budget used up")
+            # Hung (e.g. abandoned by the watchdog): don't block on it
+            with cache['lock']:
+                data = cache['data'] if cache_key is None or cache.get('key') == cache_key else None
+            print(f"{api_name}: Refresh still in flight, serving cached data")
+            return data
+        with cache['lock']:
+            if refresh['ok'] and (cache_key is None or cache.get('key') == cache_key):
+                return cache['data']
+        # It failed or fetched another key: refresh ourselves
+    
+    # Fetch fresh data (without the lock, so a hung fetch blocks no other caller)
+    data = None
+    try:
+        data = fetch_function()
+    finally:
+        with cache['lock']:
+            finish_refresh(cache, refresh, data, cache_duration, cache_key)
     
     if data is not None:
         print(f"{api_name}: Fresh data fetched")
-        update_cache(cache, data, cache_duration, cache_key)
+    elif deadline.expired():
+        print(f"{api_name}: Fetch budget used up, refresh skipped until the next rotation")
+        raise deadline.FetchSkippedError(f"{api_name}: fetch budget used up")
     
     return data
-
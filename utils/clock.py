@@ -0,0 +1,160 @@
+"""
+Clock Utilities
+
+Single source of time for the application: reading the time, sleeping and
+waiting for events all go through the current clock, so it can be replaced.
+
+- SystemClock: real time (default)
+- VirtualClock: simulated time that jumps over sleeps. Once every thread
+  using the clock is asleep, time jumps straight to the earliest wake-up, so
+  a day of rotations, cache expiries, failures and retries runs in seconds.
+
+Example (soak test):
+    from utils import clock
+    clock.set_clock(clock.VirtualClock())
+    scheduler.run_cycle()   # sleeps take no real time
+
+Background I/O threads (price stream, aggregator) keep using real time.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """Real time"""
+
+    def now(self):
+        """Get the current Unix time"""
+        return time.time()
+
+    def sleep(self, seconds):
+        """Sleep for the given number of seconds"""
+        time.sleep(seconds)
+
+    def wait(self, event, timeout):
+        """
+        Wait until an event is set or the timeout expires
+
+        Returns:
+            bool: True if the event was set
+        """
+        return event.wait(timeout)
+
+
+class VirtualClock:
+    """
+    Simulated time that advances only when every participating thread sleeps
+
+    A thread participates from its first sleep() or wait() on the clock until
+    it exits. While any participant is running, time stands still; once all
+    of them are asleep, time jumps to the earliest wake-up.
+    """
+
+    def __init__(self, start=None):
+        """
+        Initialize the clock
+
+        Args:
+            start: Unix time to start at (default: now)
+        """
+        self._now = time.time() if start is None else start
+        self._condition = threading.Condition()
+        self._sleeping = {}         # thread -> virtual wake-up time
+        self._participants = set()  # threads that use this clock
+
+    def now(self):
+        """Get the current virtual Unix time"""
+        return self._now
+
+    def sleep(self, seconds):
+        """Sleep for the given number of virtual seconds"""
+        self._block(seconds)
+
+    def wait(self, event, timeout):
+        """
+        Wait until an event is set or the virtual timeout expires
+
+        Returns:
+            bool: True if the event was set
+        """
+        self._block(timeout, event)
+        return event.is_set()
+
+    def advance(self, seconds):
+        """Move time forward (e.g. from a test driving the clock by hand)"""
+        with self._condition:
+            self._now += seconds
+            self._condition.notify_all()
+
+    def _block(self, seconds, event=None):
+        """Sleep until the virtual wake-up time (or until the event is set)"""
+        thread = threading.current_thread()
+        with self._condition:
+            self._participants.add(thread)
+            wake = self._now + max(seconds or 0, 0)
+            self._sleeping[thread] = wake
+            try:
+                while self._now < wake and not (event is not None and event.is_set()):
+                    self._advance_if_idle()
+                    if self._now >= wake:
+                        break
+                    # Short real-time waits notice events set by other threads and exited participants
+                    self._condition.wait(0.01 if event is not None else 0.1)
+            finally:
+                del self._sleeping[thread]
+
+    def _advance_if_idle(self):
+        """Jump to the earliest wake-up if every participant is asleep (lock held)"""
+        self._participants = {thread for thread in self._participants if thread.is_alive()}
+        if any(thread not in self._sleeping for thread in self._participants):
+            return
+        earliest = min(self._sleeping.values())
+        if earliest > self._now:
+            self._now = earliest
+            self._condition.notify_all()
+
+
+_clock = SystemClock()
+
+
+def set_clock(clock):
+    """
+    Replace the application clock
+
+    Args:
+        clock: SystemClock or VirtualClock
+    """
+    global _clock
+    _clock = clock
+
+
+def get_clock():
+    """Get the application clock"""
+    return _clock
+
+
+def now():
+    """Get the current Unix time from the application clock"""
+    return _clock.now()
+
+
+def sleep(seconds):
+    """Sleep on the application clock"""
+    _clock.sleep(seconds)
+
+
+def wait(event, timeout):
+    """
+    Wait on the application clock until an event is set or the timeout expires
+
+    Returns:
+        bool: True if the event was set
+    """
+    return _clock.wait(event, timeout)
+
+
+def datetime_now():
+    """Get the current local datetime from the application clock"""
+    return datetime.fromtimestamp(_clock.now())
@@ -0,0 +1,71 @@
+"""
+Config Watcher
+
+Watches config.py for changes and loads new versions into a separate module
+object, so the running configuration stays untouched until the new one has
+been validated and applied.
+"""
+
+import importlib.util
+import os
+
+
+def load_config(path):
+    """
+    Execute a config file into a new module object
+
+    Args:
+        path: Path to config.py
+
+    Returns:
+        module: Freshly loaded config module
+
+    Raises:
+        Exception: Whatever the config file raises (e.g. SyntaxError)
+    """
+    spec = importlib.util.spec_from_file_location('config', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ConfigWatcher:
+    """Detects changes of a config file by its modification time"""
+
+    def __init__(self, path):
+        """
+        Initialize the watcher (the current file version counts as loaded)
+
+        Args:
+            path: Path to config.py
+        """
+        self.path = path
+        self._mtime = self._current_mtime()
+
+    def _current_mtime(self):
+        """Get the file's modification time, or None if it is missing"""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        """
+        Load the config file if it changed since the last poll
+
+        A file that fails to load is reported once and retried after its next
+        change (e.g. when a partial write is completed).
+
+        Returns:
+            module: New config module, or None if unchanged or invalid
+        """
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return None
+        self._mtime = mtime
+
+        try:
+            return load_config(self.path)
+        except Exception as e:
+            print(f"Config reload: {self.path} could not be loaded ({type(e).__name__}: {e}), keeping current config")
+            return None
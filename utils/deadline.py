@@ -0,0 +1,63 @@
+"""
+Fetch Deadline Utilities
+
+Per-thread fetch time budget. The scheduler starts a budget at the beginning
+of every rotation; the HTTP client layer caps each request's timeout at the
+remaining budget and charges the time spent. Once the budget is used up,
+requests are skipped and refreshes raise FetchSkippedError: modules keep
+their current data and retry in the next rotation.
+
+Each display runs in its own thread, so each display has its own budget.
+"""
+
+import threading
+
+
+_local = threading.local()
+
+
+class FetchSkippedError(Exception):
+    """A refresh was skipped because the thread's fetch budget is used up (not a failure)"""
+    pass
+
+
+def start(seconds):
+    """
+    Start a new fetch budget for the current thread
+
+    Args:
+        seconds: Fetch time allowed until the next start(), or None for no limit
+    """
+    _local.remaining = seconds
+
+
+def remaining():
+    """
+    Get the fetch time left for the current thread
+
+    Returns:
+        float: Seconds left (may be <= 0), or None if no budget is set
+    """
+    return getattr(_local, 'remaining', None)
+
+
+def charge(seconds):
+    """
+    Deduct time spent fetching from the current thread's budget
+
+    Args:
+        seconds: Time spent
+    """
+    if remaining() is not None:
+        _local.remaining -= seconds
+
+
+def expired():
+    """
+    Check if the current thread's budget is used up
+
+    Returns:
+        bool: True if a budget is set and nothing is left
+    """
+    left = remaining()
+    return left is not None and left <= 0
@@ -0,0 +1,92 @@
+"""
+Event Utilities
+
+Minimal publish/subscribe hub so API clients can announce fresh data without
+knowing who consumes it (alerts, history stores, ...).
+"""
+
+# Topics published by the API clients on every fresh fetch
+TOPIC_CRYPTO_PRICES = 'crypto_prices'   # {'prices': {crypto id: PriceSnapshot}, 'fiat': code}
+TOPIC_GLOBAL_DATA = 'global_data'       # GlobalSnapshot
+TOPIC_FEAR_GREED = 'fear_greed'         # FearGreedSnapshot
+TOPIC_ALT_SEASON = 'alt_season'         # AltSeasonSnapshot
+
+
+_subscribers = {}
+
+
+def subscribe(topic, callback):
+    """
+    Register a callback for a topic
+
+    Args:
+        topic: Topic name (e.g. TOPIC_CRYPTO_PRICES)
+        callback: Function called with the published payload
+    """
+    _subscribers.setdefault(topic, []).append(callback)
+
+
+def unsubscribe(topic, callback):
+    """Remove a previously registered callback (no-op if not registered)"""
+    callbacks = _subscribers.get(topic, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+
+
+def publish(topic, payload):
+    """
+    Deliver a payload to every subscriber of a topic
+
+    Subscriber errors are logged and never propagate to the publisher.
+
+    Args:
+        topic: Topic name
+        payload: Data passed to each callback
+    """
+    for callback in list(_subscribers.get(topic, [])):
+        try:
+            callback(payload)
+        except Exception as e:
+            print(f"Event subscriber error on '{topic}': {e}")
+
+
+def subscribe_values(callback):
+    """
+    Receive every fresh API value as named numeric series
+
+    Series names:
+        price.<coin id>.<fiat>                      CoinGecko / streamed prices
+        btc_dominance, market_cap.usd               CoinGecko /global
+        fear_greed                                  Alternative.me index
+        alt_season.7d, alt_season.30d               Altcoin Season Index
+
+    Args:
+        callback: Function called with a dict of series name -> number (or None)
+                  for the values of one fetch (e.g. TickLog.append)
+    """
+    def on_prices(payload):
+        fiat = payload['fiat']
+        callback({
+            f"price.{crypto_id}.{fiat}": snapshot.price
+            for crypto_id, snapshot in payload['prices'].items()
+        })
+
+    def on_global(snapshot):
+        callback({
+            'btc_dominance': snapshot.btc_dominance,
+            'market_cap.usd': (snapshot.total_market_cap or {}).get('usd'),
+        })
+
+    def on_fear_greed(snapshot):
+        try:
+            callback({'fear_greed': float(snapshot.value)})
+        except (TypeError, ValueError):
+            pass
+
+    def on_alt_season(snapshot):
+        callback({'alt_season.7d': snapshot.value_7d, 'alt_season.30d': snapshot.value_30d})
+
+    subscribe(TOPIC_CRYPTO_PRICES, on_prices)
+    subscribe(TOPIC_GLOBAL_DATA, on_global)
+    subscribe(TOPIC_FEAR_GREED, on_fear_greed)
+    subscribe(TOPIC_ALT_SEASON, on_alt_season)
@@ -0,0 +1,233 @@
+"""
+Daily History Store
+
+Keeps a fixed window of daily values (e.g. closing prices) for many keys
+(e.g. coin IDs). Each key is an array-backed ring buffer indexed by day
+number, so appending today's value or reading the value from N days ago is
+O(1) and memory stays constant.
+
+The store is persisted to a JSON file, so history that took many API
+requests to backfill survives restarts.
+"""
+
+import json
+import os
+import threading
+from array import array
+from utils import clock
+
+
+SECONDS_PER_DAY = 86400
+
+# Marks a ring slot that holds no day
+_EMPTY_DAY = -1
+
+# Shared stores by (path, capacity)
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def day_number(timestamp=None):
+    """
+    Get the UTC day number (days since 1970-01-01)
+
+    Args:
+        timestamp: Unix timestamp in seconds (default: now)
+
+    Returns:
+        int: Day number
+    """
+    if timestamp is None:
+        timestamp = clock.now()
+    return int(timestamp // SECONDS_PER_DAY)
+
+
+def shared_series(path, capacity):
+    """
+    Get the process-wide store for a history file
+
+    All displays (threads) share one instance per file, so the file has a
+    single writer.
+
+    Args:
+        path: JSON file the history is persisted to
+        capacity: Number of days kept per key
+
+    Returns:
+        DailySeries: Shared store
+    """
+    with _stores_lock:
+        key = (path, capacity)
+        if key not in _stores:
+            _stores[key] = DailySeries(capacity, path)
+        return _stores[key]
+
+
+class DailySeries:
+    """
+    Fixed-window daily values for many keys
+
+    Example:
+        history = DailySeries(capacity=91, path='data/history.json')
+        history.set('bitcoin', day_number(), 65000.0)
+        history.get('bitcoin', day_number() - 90)  # None until backfilled
+    """
+
+    def __init__(self, capacity, path=None):
+        """
+        Initialize the store and load persisted history (if any)
+
+        Args:
+            capacity: Number of days kept per key
+            path: Optional JSON file for persistence
+        """
+        self.capacity = capacity
+        self.path = path
+        self._days = {}    # key -> array('l') of day numbers per ring slot
+        self._values = {}  # key -> array('d') of values per ring slot
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def _series(self, key):
+        """Get (days, values) arrays of a key, creating empty ones if needed"""
+        if key not in self._days:
+            self._days[key] = array('l', [_EMPTY_DAY]) * self.capacity
+            self._values[key] = array('d', [0.0]) * self.capacity
+        return self._days[key], self._values[key]
+
+    def set(self, key, day, value):
+        """
+        Store the value of a day (overwrites the slot of the day capacity days earlier)
+
+        Args:
+            key: Series key (e.g. coin ID)
+            day: Day number
+            value: Value for that day
+        """
+        with self._lock:
+            days, values = self._series(key)
+            slot = day % self.capacity
+            # Never let an old (backfilled) day overwrite a newer one
+            if days[slot] > day or (days[slot] == day and values[slot] == value):
+                return
+            days[slot] = day
+            values[slot] = value
+            self._dirty = True
+
+    def get(self, key, day):
+        """
+        Get the value of a day
+
+        Returns:
+            float: Value, or None if the day is not stored
+        """
+        with self._lock:
+            days = self._days.get(key)
+            if days is None:
+                return None
+            slot = day % self.capacity
+            if days[slot] != day:
+                return None
+            return self._values[key][slot]
+
+    def values(self, key, first_day, last_day):
+        """
+        Get the stored values of a day range (inclusive), skipping missing days
+
+        Returns:
+            list: Values in day order
+        """
+        with self._lock:
+            days = self._days.get(key)
+            if days is None:
+                return []
+            values = self._values[key]
+            return [
+                values[day % self.capacity] for day in range(first_day, last_day + 1)
+                if days[day % self.capacity] == day
+            ]
+
+    def missing_days(self, key, first_day, last_day):
+        """
+        Count days without a value in a range (inclusive)
+
+        Returns:
+            int: Number of missing days
+        """
+        with self._lock:
+            days = self._days.get(key)
+            if days is None:
+                return last_day - first_day + 1
+            return sum(1 for day in range(first_day, last_day + 1) if days[day % self.capacity] != day)
+
+    def last_day(self, key):
+        """
+        Get the newest day stored for a key
+
+        Returns:
+            int: Day number, or None if the key has no values
+        """
+        with self._lock:
+            days = self._days.get(key)
+            if days is None:
+                return None
+            newest = max(days)
+            return None if newest == _EMPTY_DAY else newest
+
+    def keys(self):
+        """Get all stored keys"""
+        with self._lock:
+            return list(self._days)
+
+    def remove(self, key):
+        """Drop a key's history"""
+        with self._lock:
+            if self._days.pop(key, None) is not None:
+                del self._values[key]
+                self._dirty = True
+
+    def load(self):
+        """Load history from the JSON file (missing or invalid files are ignored)"""
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if stored.get('capacity') != self.capacity:
+            print(f"History: {self.path} has a different window, starting over")
+            return
+
+        with self._lock:
+            for key, series in stored.get('series', {}).items():
+                days, values = self._series(key)
+                for day, value in zip(series['days'], series['values']):
+                    days[day % self.capacity] = day
+                    values[day % self.capacity] = value
+
+    def save(self):
+        """Write history to the JSON file if anything changed (atomic replace)"""
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            series = {}
+            for key, days in self._days.items():
+                stored = [(day, value) for day, value in zip(days, self._values[key]) if day != _EMPTY_DAY]
+                series[key] = {'days': [day for day, _ in stored], 'values': [value for _, value in stored]}
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'capacity': self.capacity, 'series': series}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self._dirty = True
+            print(f"History: Could not save {self.path} ({e})")
@@ -0,0 +1,196 @@
+"""
+Screen Layout Templates
+
+Declarative screen layouts: each screen is a template of rows made of named
+fields (with width and alignment) and literal text. A template is compiled
+once per display geometry (cols x rows) into fixed cell offsets and a
+preallocated row buffer, so rendering a frame only formats the field values.
+
+Example:
+    PRICE_LAYOUT = Layout([
+        [Field('time', 5), Field('change', align=POS_RIGHT)],
+        [Field('symbol', 6), Field('price', align=POS_RIGHT)],
+    ])
+
+    lcd.render(PRICE_LAYOUT, {'time': '14:30', ...})
+"""
+
+from utils.lcd import POS_LEFT, POS_CENTER, POS_RIGHT
+
+
+class Field:
+    """A named, aligned slot in a layout row"""
+
+    __slots__ = ('name', 'width', 'align', 'marquee')
+
+    def __init__(self, name, width=None, align=POS_LEFT, marquee=False):
+        """
+        Initialize a field
+
+        Args:
+            name: Value key used at render time
+            width: Fixed width in cells, or None to share the row's free space
+            align: POS_LEFT, POS_CENTER or POS_RIGHT
+            marquee: Scroll over-width values instead of truncating them
+                     (only for a field that fills its row alone; see SafeLCD.play_marquee())
+        """
+        self.name = name
+        self.width = width
+        self.align = align
+        self.marquee = marquee
+
+
+class Layout:
+    """
+    Geometry-independent screen template
+
+    Rows are lists of Field objects and literal strings. Rows beyond the
+    display's height are dropped (list the most important rows first); a
+    template with fewer rows than the display is centered vertically.
+    """
+
+    def __init__(self, rows):
+        """
+        Initialize a layout
+
+        Args:
+            rows: List of rows, each a list of Field objects and/or literal strings
+        """
+        self.rows = rows
+
+    def compile(self, cols, rows):
+        """
+        Compile the layout for a display geometry
+
+        SafeLCD.render() compiles each layout once per display and keeps the
+        result, so every display owns its own row buffers.
+
+        Args:
+            cols: Display width in characters
+            rows: Display height in lines
+
+        Returns:
+            CompiledLayout: Layout with fixed cell offsets
+        """
+        return CompiledLayout(self.rows, cols, rows)
+
+
+class CompiledLayout:
+    """Layout with fixed cell offsets for one display geometry"""
+
+    def __init__(self, template_rows, cols, rows):
+        """
+        Compile template rows into cell offsets
+
+        Args:
+            template_rows: Rows from Layout
+            cols: Display width in characters
+            rows: Display height in lines
+        """
+        self.cols = cols
+        self.rows = rows
+
+        # Center shorter templates vertically on taller displays
+        template_rows = template_rows[:rows]
+        top = (rows - len(template_rows)) // 2
+
+        # Preallocated row buffers with literal text baked in
+        self._buffers = [[' '] * cols for _ in range(rows)]
+        # Per field: (name, row, offset, width, align)
+        self._slots = []
+        self._widths = {}
+        # Marquee fields that fill their row: (name, row, width)
+        self._marquee_slots = []
+
+        for index, items in enumerate(template_rows):
+            self._compile_row(top + index, items)
+
+    def _compile_row(self, row, items):
+        """Assign offsets and widths to the items of one row"""
+        fixed = sum(len(item) if isinstance(item, str) else (item.width or 0) for item in items)
+        flexible = [item for item in items if isinstance(item, Field) and item.width is None]
+        free = max(0, self.cols - fixed)
+
+        offset = 0
+        for item in items:
+            if isinstance(item, str):
+                width = len(item)
+            elif item.width is None:
+                # Split free space between flexible fields, remainder to the last one
+                share = free // len(flexible)
+                width = free - share * (len(flexible) - 1) if item is flexible[-1] else share
+            else:
+                width = item.width
+
+            width = max(0, min(width, self.cols - offset))
+
+            if isinstance(item, str):
+                self._buffers[row][offset:offset + width] = item[:width]
+            else:
+                self._slots.append((item.name, row, offset, width, item.align))
+                self._widths[item.name] = width
+                if item.marquee and offset == 0 and width == self.cols:
+                    self._marquee_slots.append((item.name, row, width))
+
+            offset += width
+
+    def width(self, name):
+        """
+        Get the compiled width of a field
+
+        Args:
+            name: Field name
+
+        Returns:
+            int: Width in cells (0 if the field doesn't fit this geometry)
+        """
+        return self._widths.get(name, 0)
+
+    def render(self, values):
+        """
+        Format field values into the row buffers
+
+        Args:
+            values: Dict of field name -> value (missing fields render blank)
+
+        Returns:
+            list: One string per display row, each exactly cols wide
+        """
+        buffers = self._buffers
+        for name, row, offset, width, align in self._slots:
+            text = str(values.get(name, ''))[:width]
+            pad = width - len(text)
+            if align == POS_RIGHT:
+                cell = ' ' * pad + text
+            elif align == POS_CENTER:
+                left = round(pad / 2)
+                cell = ' ' * left + text + ' ' * (pad - left)
+            else:
+                cell = text + ' ' * pad
+            buffers[row][offset:offset + width] = cell
+
+        return [''.join(buffer) for buffer in buffers]
+
+    def overflow(self, values):
+        """
+        Get the full text of marquee fields whose values exceed their width
+
+        Args:
+            values: Dict of field name -> value
+
+        Returns:
+            dict: Row -> full text (empty if everything fits)
+        """
+        texts = {}
+        for name, row, width in self._marquee_slots:
+            text = str(values.get(name, ''))
+            if len(text) > width:
+                texts[row] = text
+        return texts
+
+
+# Shared layout: centered title on the first row, centered value below
+TITLE_VALUE_LAYOUT = Layout([
+    [Field('title', align=POS_CENTER)],
+    [Field('value', align=POS_CENTER)],
+])
@@ -5,8 +5,25 @@ Wraps the RPLCD CharLCD class to automatically truncate text that exceeds
 the LCD's maximum width (16 characters for 16x2 displays).
 
 This prevents display corruption from overly long text strings.
+
+Screens are drawn with render(), which fills whole rows from a layout
+template (see utils/layout.py) compiled once for this display's geometry.
+
+Over-width text in marquee fields is scrolled by the controller itself: the
+full text is loaded once into the HD44780's 40-column display RAM, and each
+scroll step is a single display-shift command instead of a rewritten row.
+The display shift moves all rows together, so the other rows scroll along
+(their off-screen columns are blanked) and snap back at the end.
+
+Characters the controller's ROM lacks (arrows, bitcoin sign, bar cells; see
+GLYPHS) can be used in any text. They are mapped to the 8 CGRAM slots by
+GlyphCache, which uploads a glyph only when it is not loaded. The degree sign
+is in the A00 ROM (0xDF) and needs no slot.
 """
 
+from collections import OrderedDict
+from utils import metrics
+
 # Row constants for LCD lines
 ROW_FIRST = 0
 ROW_SECOND = 1
@@ -16,6 +33,106 @@ POS_LEFT = 'left'
 POS_CENTER = 'center'
 POS_RIGHT = 'right'
 
+# HD44780 display RAM per line in 2-line mode (columns beyond the display width are off-screen)
+DDRAM_COLS = 40
+
+# Marquee timing: longest time per one-column step, and the minimum share of
+# the display time the text rests at each end
+MARQUEE_STEP = 0.3
+MARQUEE_HOLD = 0.25
+
+# HD44780 custom character slots (character codes 0-7)
+CGRAM_SLOTS = 8
+
+# Custom glyphs: character -> 5x8 bitmap (one int per pixel row)
+GLYPHS = {
+    '▲': (0b00000, 0b00000, 0b00100, 0b01110, 0b11111, 0b00000, 0b00000, 0b00000),
+    '▼': (0b00000, 0b00000, 0b11111, 0b01110, 0b00100, 0b00000, 0b00000, 0b00000),
+    '₿': (0b01010, 0b11110, 0b01001, 0b01110, 0b01001, 0b11110, 0b01010, 0b00000),
+    # Bar graph cells, 1 to 5 columns filled
+    '▏': (0b10000,) * 8,
+    '▎': (0b11000,) * 8,
+    '▍': (0b11100,) * 8,
+    '▌': (0b11110,) * 8,
+    '█': (0b11111,) * 8,
+}
+
+# Shown when a frame uses more glyphs than there are CGRAM slots
+GLYPH_FALLBACKS = {'▲': '+', '▼': '-', '₿': 'B', '▏': '|', '▎': '|', '▍': '|', '▌': '|', '█': '#'}
+
+
+class GlyphCache:
+    """
+    Keeps custom glyphs in the controller's CGRAM slots
+
+    Glyphs are uploaded on first use (8 bytes plus a command over I2C) and
+    stay loaded; when all slots are taken, the least recently used glyph
+    that is not part of the current frame is replaced.
+    """
+
+    def __init__(self, lcd, glyphs=GLYPHS, slots=CGRAM_SLOTS):
+        """
+        Initialize the cache
+
+        Args:
+            lcd: The CharLCD instance (create_char() target)
+            glyphs: Dict of character -> bitmap
+            slots: Number of CGRAM slots
+        """
+        self._lcd = lcd
+        self._glyphs = glyphs
+        self._loaded = OrderedDict()  # character -> slot, least recently used first
+        self._free = list(range(slots))
+
+    def translate(self, texts):
+        """
+        Replace glyph characters by their CGRAM character codes
+
+        All texts of one frame are translated together, so no glyph of the
+        frame is evicted by another one. Glyphs beyond the slot count are
+        replaced by plain fallback characters.
+
+        Args:
+            texts: List of strings (e.g. the rows of a frame)
+
+        Returns:
+            list: Strings with glyphs replaced by '\x00'-'\x07'
+        """
+        # Glyphs of the frame in order of appearance (later ones fall back first)
+        needed = dict.fromkeys(char for text in texts for char in text if char in self._glyphs)
+        if not needed:
+            return texts
+
+        codes = {}
+        for char in needed:
+            if char in self._loaded:
+                self._loaded.move_to_end(char)
+                codes[char] = chr(self._loaded[char])
+
+        for char in needed:
+            if char in codes:
+                continue
+            slot = self._take_slot(needed)
+            if slot is None:
+                codes[char] = GLYPH_FALLBACKS.get(char, ' ')
+                continue
+            self._lcd.create_char(slot, self._glyphs[char])
+            metrics.increment('lcd.glyph_uploads')
+            self._loaded[char] = slot
+            codes[char] = chr(slot)
+
+        table = str.maketrans(codes)
+        return [text.translate(table) for text in texts]
+
+    def _take_slot(self, needed):
+        """Get a free slot, evicting the least recently used glyph not in needed (None if all are needed)"""
+        if self._free:
+            return self._free.pop(0)
+        for char in self._loaded:
+            if char not in needed:
+                return self._loaded.pop(char)
+        return None
+
 
 class SafeLCD:
     """
@@ -25,16 +142,162 @@ class SafeLCD:
     All other CharLCD methods and properties are passed through unchanged.
     """
     
-    def __init__(self, lcd, max_size):
+    def __init__(self, lcd, max_size, rows=2):
         """
         Initialize SafeLCD wrapper
         
         Args:
             lcd: The CharLCD instance to wrap
             max_size: Maximum characters per line (required)
+            rows: Number of display lines (default: 2)
         """
         self._lcd = lcd
         self._max_size = max_size
+        self._rows = rows
+        self._layouts = {}  # Layout -> CompiledLayout for this geometry
+        self._backlight = True  # CharLCD starts with the backlight on
+        self._offscreen = {}    # row -> known text in the off-screen display RAM columns
+        self._marquee_steps = 0  # columns to scroll for the current screen
+        self._glyphs = GlyphCache(lcd)
+    
+    @property
+    def cols(self):
+        """Display width in characters"""
+        return self._max_size
+    
+    @property
+    def rows(self):
+        """Display height in lines"""
+        return self._rows
+    
+    @property
+    def backlight_enabled(self):
+        """Backlight state (passed through to CharLCD)"""
+        return self._backlight
+    
+    @backlight_enabled.setter
+    def backlight_enabled(self, enabled):
+        """Switch the backlight; unchanged states are not sent over I2C"""
+        enabled = bool(enabled)
+        if enabled != self._backlight:
+            self._lcd.backlight_enabled = enabled
+            self._backlight = enabled
+    
+    def clear(self):
+        """Clear the display (also blanks the off-screen display RAM and resets any shift)"""
+        self._lcd.clear()
+        self._offscreen = {row: ' ' * (DDRAM_COLS - self._max_size) for row in range(self._rows)}
+        self._marquee_steps = 0
+    
+    def compiled(self, layout):
+        """
+        Get a layout compiled for this display (compiled on first use)
+        
+        Args:
+            layout: utils.layout.Layout
+        
+        Returns:
+            CompiledLayout: Layout with fixed offsets for this geometry
+        """
+        compiled = self._layouts.get(layout)
+        if compiled is None:
+            compiled = layout.compile(self._max_size, self._rows)
+            self._layouts[layout] = compiled
+        return compiled
+    
+    def render(self, layout, values):
+        """
+        Draw a full screen from a layout template
+        
+        Every row is rewritten at full width, so no clear() is needed.
+        
+        Args:
+            layout: utils.layout.Layout
+            values: Dict of field name -> value
+        """
+        compiled = self.compiled(layout)
+        rows = compiled.render(values)
+        overflow = compiled.overflow(values)
+        
+        # Custom glyphs of the whole frame (including scrolled text) are loaded together
+        texts = self._glyphs.translate(rows + list(overflow.values()))
+        for row, text in enumerate(texts[:len(rows)]):
+            self._lcd.cursor_pos = (row, 0)
+            self._lcd.write_string(text)
+        
+        # Over-width marquee fields show their start; play_marquee() scrolls the rest into view
+        overflow = dict(zip(overflow, texts[len(rows):]))
+        self._marquee_steps = self._load_marquee(overflow) if overflow else 0
+    
+    def _load_marquee(self, texts):
+        """
+        Write the off-screen part of over-width rows into display RAM
+        
+        The visible part was just rendered. Off-screen columns of the other
+        rows are blanked, since the display shift brings them into view too.
+        Columns that already hold the right text are not rewritten.
+        
+        Args:
+            texts: Dict of row -> full text
+        
+        Returns:
+            int: Columns to shift to show the end of the longest text
+        """
+        # On 4-line displays, lines 1/3 and 2/4 share display RAM lines
+        if self._rows > 2:
+            return 0
+        
+        cols = self._max_size
+        steps = max(min(len(text), DDRAM_COLS) for text in texts.values()) - cols
+        if steps <= 0:
+            return 0
+        
+        linebreaks = self._lcd.auto_linebreaks
+        self._lcd.auto_linebreaks = False  # allows the cursor past the visible columns
+        try:
+            for row in range(self._rows):
+                tail = texts.get(row, '')[cols:cols + steps].ljust(steps)
+                known = self._offscreen.get(row, '')
+                if known[:steps] == tail:
+                    continue
+                self._lcd.cursor_pos = (row, cols)
+                self._lcd.write_string(tail)
+                self._offscreen[row] = tail + known[steps:]
+        finally:
+            self._lcd.auto_linebreaks = linebreaks
+        return steps
+    
+    def play_marquee(self, duration, wait):
+        """
+        Show the current screen for its display time, scrolling over-width text
+        
+        Rests at the start, shifts the display one column per step until the
+        end of the text is visible, rests again and resets the shift. Without
+        over-width text this is just wait(duration).
+        
+        Args:
+            duration: Display time in seconds
+            wait: Function sleeping for the given seconds; returns True to stop early (e.g. an alert)
+        
+        Returns:
+            bool: True if wait() stopped early
+        """
+        steps, self._marquee_steps = self._marquee_steps, 0
+        if not steps:
+            return wait(duration)
+        
+        step = min(MARQUEE_STEP, duration * (1 - 2 * MARQUEE_HOLD) / steps)
+        hold = (duration - step * steps) / 2
+        try:
+            if wait(hold):
+                return True
+            for _ in range(steps):
+                self._lcd.shift_display(-1)
+                if wait(step):
+                    return True
+            return wait(hold)
+        finally:
+            self._lcd.home()  # one command resets the shift
     
     def write_string(self, *, row=0, text='', pos=POS_LEFT):
         """
@@ -52,7 +315,7 @@ class SafeLCD:
                 lcd.write_string(row=1, text='World', pos=POS_CENTER)
                 lcd.write_string(row=0, text='$99.99', pos=POS_RIGHT)
         """
-        validated_text = str(text)[:self._max_size]
+        validated_text = self._glyphs.translate([str(text)[:self._max_size]])[0]
         
         # Calculate column position based on alignment
         if pos == POS_CENTER:
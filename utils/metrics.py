@@ -0,0 +1,62 @@
+"""
+Metrics Utilities
+
+Process-wide counters and gauges (e.g. requests per host, circuit breaker
+state). Values are kept in memory and logged periodically by main.py.
+
+Metric names are dotted strings, e.g. 'http.api.coingecko.com.requests'.
+"""
+
+import threading
+
+
+_counters = {}
+_gauges = {}
+_lock = threading.Lock()
+
+
+def increment(name, amount=1):
+    """
+    Add to a counter
+
+    Args:
+        name: Metric name
+        amount: Value to add (default: 1)
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name, value):
+    """
+    Set a gauge to its current value
+
+    Args:
+        name: Metric name
+        value: Current value (number or short string, e.g. 'open')
+    """
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot():
+    """
+    Get a copy of all metrics
+
+    Returns:
+        dict: Metric name -> value (counters and gauges)
+    """
+    with _lock:
+        values = dict(_counters)
+        values.update(_gauges)
+    return values
+
+
+def log_metrics():
+    """Print all metrics, one per line, sorted by name"""
+    values = snapshot()
+    if not values:
+        return
+    print("Metrics:")
+    for name in sorted(values):
+        print(f"  {name} = {values[name]}")
@@ -0,0 +1,170 @@
+"""
+Portfolio Valuation
+
+Values a set of holdings (amount per coin) from price snapshots and keeps
+the totals up to date incrementally: an update only touches the holdings
+whose price changed and adjusts the running totals by their difference, so
+its cost depends on the number of changed prices, not on the portfolio size.
+Totals are read in O(1).
+
+Example:
+    portfolio = Portfolio({'BTC': ('bitcoin', 0.25), 'ETH': ('ethereum', 4)})
+    portfolio.update({'bitcoin': PriceSnapshot(60000, 2.5)})
+    portfolio.total, portfolio.pnl_24h
+"""
+
+import math
+import threading
+from utils import clock
+
+
+# Incremental updates between two exact recomputations (bounds float rounding drift)
+RECOMPUTE_EVERY = 10000
+
+
+class Holding:
+    """One position with its latest price and valuation"""
+
+    __slots__ = ('symbol', 'crypto_id', 'amount', 'price', 'change_24h', 'value', 'pnl_24h', 'priced_at')
+
+    def __init__(self, symbol, crypto_id, amount):
+        self.symbol = symbol
+        self.crypto_id = crypto_id
+        self.amount = amount
+        self.price = None
+        self.change_24h = None
+        self.value = 0.0
+        self.pnl_24h = 0.0
+        self.priced_at = None
+
+
+class Portfolio:
+    """Holdings valued incrementally from price snapshots"""
+
+    def __init__(self, holdings):
+        """
+        Initialize a portfolio without prices
+
+        Args:
+            holdings: Dict of symbol -> (crypto ID, amount), e.g. {'BTC': ('bitcoin', 0.25)}
+        """
+        self.holdings = [Holding(symbol, crypto_id, float(amount))
+                         for symbol, (crypto_id, amount) in holdings.items()]
+        self._by_id = {}  # crypto ID -> holdings (a coin may be held in several entries)
+        for holding in self.holdings:
+            self._by_id.setdefault(holding.crypto_id, []).append(holding)
+
+        self.total = 0.0
+        self.pnl_24h = 0.0
+        self.priced = 0  # holdings with a price
+        self._updates = 0
+        self._lock = threading.Lock()
+
+    @property
+    def crypto_ids(self):
+        """IDs of all held coins"""
+        return list(self._by_id)
+
+    def update(self, prices, timestamp=None):
+        """
+        Apply fresh prices
+
+        Args:
+            prices: Dict of crypto ID -> PriceSnapshot (other coins are ignored)
+            timestamp: Unix time of the prices (default: now)
+
+        Returns:
+            int: Number of holdings whose valuation changed
+        """
+        timestamp = clock.now() if timestamp is None else timestamp
+        # Walk the smaller side: a large price batch or a large portfolio
+        if len(prices) <= len(self._by_id):
+            matches = [(crypto_id, snapshot) for crypto_id, snapshot in prices.items() if crypto_id in self._by_id]
+        else:
+            matches = [(crypto_id, prices[crypto_id]) for crypto_id in self._by_id if crypto_id in prices]
+
+        changed = 0
+        with self._lock:
+            for crypto_id, snapshot in matches:
+                priced = isinstance(snapshot.price, (int, float))
+                for holding in self._by_id[crypto_id]:
+                    if priced:
+                        # A snapshot without a price doesn't count as fresh, so stale_ids() refetches it
+                        holding.priced_at = timestamp
+                    if snapshot.price == holding.price and snapshot.change_24h == holding.change_24h:
+                        continue
+                    self._revalue(holding, snapshot.price, snapshot.change_24h)
+                    changed += 1
+
+            self._updates += changed
+            if self._updates >= RECOMPUTE_EVERY:
+                self._recompute()
+        return changed
+
+    def _revalue(self, holding, price, change_24h):
+        """Set a holding's price and move the totals by its difference (lock held)"""
+        if not isinstance(price, (int, float)):
+            price = None
+        value = holding.amount * price if price is not None else 0.0
+        pnl = 0.0
+        if price is not None and isinstance(change_24h, (int, float)) and change_24h > -100:
+            # Value 24h ago = value / (1 + change)
+            pnl = value - value / (1 + change_24h / 100)
+
+        self.priced += (price is not None) - (holding.price is not None)
+        self.total += value - holding.value
+        self.pnl_24h += pnl - holding.pnl_24h
+        holding.price = price
+        holding.change_24h = change_24h
+        holding.value = value
+        holding.pnl_24h = pnl
+
+    def _recompute(self):
+        """Recompute the totals exactly from the holdings (lock held)"""
+        self.total = math.fsum(holding.value for holding in self.holdings)
+        self.pnl_24h = math.fsum(holding.pnl_24h for holding in self.holdings)
+        self._updates = 0
+
+    @property
+    def change_24h(self):
+        """
+        Portfolio change over 24 hours in percent
+
+        Returns:
+            float: Change, or None without prices
+        """
+        start = self.total - self.pnl_24h
+        if not self.priced or start <= 0:
+            return None
+        return self.pnl_24h / start * 100
+
+    def stale_ids(self, max_age, now=None):
+        """
+        Get the coins without a price from the last max_age seconds
+
+        Args:
+            max_age: Seconds a price stays fresh
+            now: Current Unix time (default: now)
+
+        Returns:
+            list: Crypto IDs to fetch
+        """
+        now = clock.now() if now is None else now
+        return [
+            crypto_id for crypto_id, holdings in self._by_id.items()
+            if holdings[0].priced_at is None or now - holdings[0].priced_at >= max_age
+        ]
+
+    def prices(self):
+        """
+        Get the latest price of every priced coin
+
+        Returns:
+            dict: Crypto ID -> (price, change_24h)
+        """
+        with self._lock:
+            return {
+                crypto_id: (holdings[0].price, holdings[0].change_24h)
+                for crypto_id, holdings in self._by_id.items()
+                if holdings[0].priced_at is not None
+            }
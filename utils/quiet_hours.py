@@ -0,0 +1,100 @@
+"""
+Quiet Hours
+
+Daily time window (e.g. 23:00-07:00) in which a display runs in low-activity
+mode: backlight off, one static screen instead of the rotation, and data
+refreshed at a stretched interval. Shortly before the window ends, every
+module is refreshed so the display wakes up with current data.
+"""
+
+from utils import clock
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _parse_time(text):
+    """Parse 'HH:MM' into seconds after midnight"""
+    try:
+        hours, minutes = (int(part) for part in text.split(':'))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Quiet hours: invalid time '{text}' (expected 'HH:MM')")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Quiet hours: invalid time '{text}' (expected 'HH:MM')")
+    return hours * 3600 + minutes * 60
+
+
+class QuietHours:
+    """Quiet hours schedule and low-activity settings of a display"""
+
+    def __init__(self, start, end, backlight=False, screen=None, interval_multiplier=6,
+                 redraw_interval=60, prewake=300):
+        """
+        Initialize the schedule
+
+        Args:
+            start: Local time quiet hours begin ('HH:MM')
+            end: Local time quiet hours end ('HH:MM'); may be past midnight
+            backlight: Backlight state during quiet hours (False = off)
+            screen: Static screen as (module name, screen index), or None for a blank display
+            interval_multiplier: Factor applied to the static module's update_interval
+            redraw_interval: Seconds between redraws of the static screen
+            prewake: Seconds before the end at which all modules are refreshed
+        """
+        self.start = _parse_time(start)
+        self.end = _parse_time(end)
+        if self.start == self.end:
+            raise ValueError("Quiet hours: start and end must differ")
+        if interval_multiplier < 1:
+            raise ValueError("Quiet hours: interval_multiplier must be at least 1")
+
+        self.backlight = backlight
+        self.screen = tuple(screen) if screen else None
+        self.interval_multiplier = interval_multiplier
+        self.redraw_interval = redraw_interval
+        self.prewake = prewake
+
+    @classmethod
+    def from_config(cls, quiet_config):
+        """
+        Build the schedule from QUIET_HOURS_CONFIG
+
+        Returns:
+            QuietHours: Schedule, or None if quiet hours are disabled
+        """
+        if not quiet_config or not quiet_config.get('enabled', False):
+            return None
+        return cls(
+            quiet_config['start'],
+            quiet_config['end'],
+            backlight=quiet_config.get('backlight', False),
+            screen=quiet_config.get('screen'),
+            interval_multiplier=quiet_config.get('interval_multiplier', 6),
+            redraw_interval=quiet_config.get('redraw_interval', 60),
+            prewake=quiet_config.get('prewake', 300)
+        )
+
+    def _seconds_of_day(self):
+        """Current local time in seconds after midnight"""
+        now = clock.datetime_now()
+        return now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+
+    def is_active(self):
+        """
+        Check if quiet hours are running now
+
+        Returns:
+            bool: True between start and end
+        """
+        now = self._seconds_of_day()
+        if self.start < self.end:
+            return self.start <= now < self.end
+        return now >= self.start or now < self.end  # window spans midnight
+
+    def seconds_until_end(self):
+        """
+        Get the time left until quiet hours end
+
+        Returns:
+            float: Seconds until the next end time
+        """
+        return (self.end - self._seconds_of_day()) % SECONDS_PER_DAY
@@ -0,0 +1,218 @@
+"""
+Rollups
+
+Streaming OHLC candles of every fetched value at several resolutions
+(default: 1 minute for a day, 1 hour for a month, 1 day for a year). Each
+resolution is a fixed-capacity ring of array-backed candles, so memory use
+is set at startup and independent of uptime, and the candle of any time in
+the window is found in O(1) (slot = time bucket modulo capacity).
+
+Fed with utils.events.subscribe_values(), e.g. for daily high/low screens:
+    rollups = get_rollups()
+    candle = rollups.candle('price.bitcoin.usd', DAY)   # today's (open, high, low, close)
+    high, low = rollups.range('price.bitcoin.usd', DAY, 7)  # last 7 days
+"""
+
+import threading
+from array import array
+from utils import clock
+from utils.events import subscribe_values
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Resolution in seconds -> candles kept
+DEFAULT_RESOLUTIONS = {MINUTE: 1440, HOUR: 720, DAY: 365}
+
+
+class CandleRing:
+    """Fixed number of OHLC candles at one resolution"""
+
+    __slots__ = ('resolution', 'capacity', 'buckets', 'open', 'high', 'low', 'close')
+
+    def __init__(self, resolution, capacity):
+        """
+        Initialize an empty ring
+
+        Args:
+            resolution: Candle length in seconds
+            capacity: Number of candles kept
+        """
+        self.resolution = resolution
+        self.capacity = capacity
+        self.buckets = array('q', [-1]) * capacity  # time bucket held by each slot (-1 = empty)
+        self.open = array('d', [0.0]) * capacity
+        self.high = array('d', [0.0]) * capacity
+        self.low = array('d', [0.0]) * capacity
+        self.close = array('d', [0.0]) * capacity
+
+    def add(self, timestamp, value):
+        """
+        Fold a value into the candle of its time bucket
+
+        Values for a bucket whose slot already holds a newer candle are dropped.
+        """
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.capacity
+        held = self.buckets[slot]
+        if held == bucket:
+            if value > self.high[slot]:
+                self.high[slot] = value
+            if value < self.low[slot]:
+                self.low[slot] = value
+            self.close[slot] = value
+        elif held < bucket:
+            self.buckets[slot] = bucket
+            self.open[slot] = self.high[slot] = self.low[slot] = self.close[slot] = value
+
+    def candle(self, timestamp):
+        """
+        Get the candle of a point in time
+
+        Returns:
+            tuple: (open, high, low, close), or None if there is no data (or it was overwritten)
+        """
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.capacity
+        if self.buckets[slot] != bucket:
+            return None
+        return self.open[slot], self.high[slot], self.low[slot], self.close[slot]
+
+    def range(self, timestamp, count):
+        """
+        Get the high and low over the count candles ending with the one of timestamp
+
+        Returns:
+            tuple: (high, low), or None if none of the candles has data
+        """
+        last = int(timestamp // self.resolution)
+        high = low = None
+        for bucket in range(last - min(count, self.capacity) + 1, last + 1):
+            slot = bucket % self.capacity
+            if self.buckets[slot] != bucket:
+                continue
+            if high is None or self.high[slot] > high:
+                high = self.high[slot]
+            if low is None or self.low[slot] < low:
+                low = self.low[slot]
+        return None if high is None else (high, low)
+
+
+class Rollups:
+    """OHLC candles of every series at every configured resolution"""
+
+    def __init__(self, resolutions=None):
+        """
+        Initialize rollups
+
+        Args:
+            resolutions: Dict of resolution in seconds -> candles kept (default: DEFAULT_RESOLUTIONS)
+        """
+        self.resolutions = dict(resolutions or DEFAULT_RESOLUTIONS)
+        self._rings = {}  # series name -> {resolution: CandleRing}
+        self._lock = threading.Lock()
+
+    def add(self, values, timestamp=None):
+        """
+        Fold values that were fetched together into their candles
+
+        Args:
+            values: Dict of series name -> number (None values are skipped)
+            timestamp: Unix time of the values (default: now)
+        """
+        timestamp = clock.now() if timestamp is None else timestamp
+        with self._lock:
+            for name, value in values.items():
+                if value is None:
+                    continue
+                rings = self._rings.get(name)
+                if rings is None:
+                    rings = {resolution: CandleRing(resolution, capacity)
+                             for resolution, capacity in self.resolutions.items()}
+                    self._rings[name] = rings
+                for ring in rings.values():
+                    ring.add(timestamp, float(value))
+
+    def _ring(self, name, resolution):
+        """Get the ring of a series at a resolution (None if unknown)"""
+        rings = self._rings.get(name)
+        if rings is None:
+            return None
+        if resolution not in rings:
+            raise ValueError(f"Rollups: resolution {resolution}s is not configured")
+        return rings[resolution]
+
+    def candle(self, name, resolution, timestamp=None):
+        """
+        Get the candle of a series containing a point in time
+
+        Args:
+            name: Series name (e.g. 'price.bitcoin.usd')
+            resolution: Candle length in seconds (MINUTE, HOUR, DAY)
+            timestamp: Point in time (default: now, i.e. the current candle)
+
+        Returns:
+            tuple: (open, high, low, close), or None without data
+        """
+        timestamp = clock.now() if timestamp is None else timestamp
+        with self._lock:
+            ring = self._ring(name, resolution)
+            return None if ring is None else ring.candle(timestamp)
+
+    def range(self, name, resolution, count, timestamp=None):
+        """
+        Get the high and low of a series over the last count candles
+
+        Args:
+            name: Series name
+            resolution: Candle length in seconds
+            count: Number of candles, including the current one (e.g. 7 days)
+            timestamp: End of the range (default: now)
+
+        Returns:
+            tuple: (high, low), or None without data
+        """
+        timestamp = clock.now() if timestamp is None else timestamp
+        with self._lock:
+            ring = self._ring(name, resolution)
+            return None if ring is None else ring.range(timestamp, count)
+
+    def series(self):
+        """
+        Get the names of all series with candles
+
+        Returns:
+            list: Series names
+        """
+        with self._lock:
+            return sorted(self._rings)
+
+
+_rollups = None
+
+
+def start_rollups(resolutions=None):
+    """
+    Create the shared rollups and feed them every fetched value
+
+    Args:
+        resolutions: Dict of resolution in seconds -> candles kept
+
+    Returns:
+        Rollups: Shared rollups (also returned by get_rollups())
+    """
+    global _rollups
+    _rollups = Rollups(resolutions)
+    subscribe_values(_rollups.add)
+    return _rollups
+
+
+def get_rollups():
+    """
+    Get the shared rollups
+
+    Returns:
+        Rollups: Rollups started by main.py, or None if disabled
+    """
+    return _rollups
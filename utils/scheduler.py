@@ -0,0 +1,330 @@
+"""
+Screen Scheduler
+
+Builds a weighted rotation plan of individual module screens and runs it.
+
+Instead of repeating a module name in MODULE_ORDER (which replays all of its
+screens as one block and refreshes its data on every appearance), each module
+gets a weight. Its screens are spread evenly across the rotation, and module
+data is only refreshed when the module's update interval has expired.
+"""
+
+import threading
+from utils import clock, deadline
+from utils.layout import TITLE_VALUE_LAYOUT
+
+
+# Seconds the "data delayed" screen is shown after a refresh hung
+DEGRADED_DURATION = 3
+
+# Bounds of the pause after a rotation in which no screen had data
+IDLE_MIN_WAIT = 1
+IDLE_MAX_WAIT = 30
+
+
+def build_rotation_plan(modules, module_order, module_weights=None):
+    """Compute an interleaved rotation plan of (module_name, screen_index) pairs
+
+    Every module contributes get_display_count() * weight screens per rotation.
+    Screens of each module are spaced evenly over the rotation, so a heavily
+    weighted module (e.g. crypto) shows up between the other modules instead
+    of as one long block.
+
+    Args:
+        modules: Dict of module name -> module instance
+        module_order: List of module names (repeated names add weight)
+        module_weights: Optional dict of module name -> weight (overrides repeats)
+
+    Returns:
+        list: Rotation plan as a list of (module_name, screen_index) tuples
+
+    Example:
+        >>> build_rotation_plan(modules, ['weather', 'crypto'], {'crypto': 2})
+        [('crypto', 0), ('weather', 0), ('crypto', 1), ...]
+    """
+    module_weights = module_weights or {}
+
+    # Collapse repeated names into weights, keeping first-appearance order
+    weights = {}
+    for name in module_order:
+        if name in modules:
+            weights[name] = weights.get(name, 0) + 1
+
+    for name in weights:
+        if name in module_weights:
+            weights[name] = max(0, int(module_weights[name]))
+
+    slots = []
+    module_count = len(weights)
+    for order_index, (name, weight) in enumerate(weights.items()):
+        screen_count = modules[name].get_display_count()
+        total = screen_count * weight
+        if total == 0:
+            continue
+
+        # Stagger modules by their order so single-screen modules don't clump
+        phase = (order_index + 0.5) / module_count
+        for k in range(total):
+            position = (k + phase) / total
+            slots.append((position, order_index, name, k % screen_count))
+
+    slots.sort()
+    return [(name, screen) for _, _, name, screen in slots]
+
+
+class Scheduler:
+    """
+    Runs a precomputed screen rotation plan
+
+    The plan is computed once at construction. On each screen the owning
+    module's data is refreshed only if its update interval has expired.
+
+    If an alert module is given, a firing alert interrupts the current
+    screen's display time and the alert screens are shown right away.
+
+    If a fetch budget is given, all data refreshes of one rotation together
+    may spend at most that many seconds waiting for the network; refreshes
+    beyond it are skipped (modules keep their data and stay due) and run in
+    the next rotation.
+
+    If quiet hours are given, the rotation pauses during them: the display
+    shows one static screen with the backlight off, and only that screen's
+    module is refreshed, at a stretched interval (see run_quiet()).
+
+    If a watchdog is given, data refreshes run on its worker threads with a
+    hard timeout; a hung refresh is abandoned, a "data delayed" screen is
+    shown and the rotation goes on with cached data. Every screen sends a
+    heartbeat, so a stalled display loop stops the systemd pings.
+
+    reconfigure() swaps in new modules and a new plan (e.g. after a config
+    reload); the change takes effect at the next screen.
+    """
+
+    def __init__(self, modules, module_order, module_weights=None, alert_module=None, fetch_budget=None,
+                 lcd=None, quiet_hours=None, watchdog=None):
+        """
+        Initialize the scheduler
+
+        Args:
+            modules: Dict of module name -> module instance
+            module_order: List of module names in display order
+            module_weights: Optional dict of module name -> weight
+            alert_module: Optional PriceAlertModule for interrupt screens
+            fetch_budget: Optional seconds of fetching allowed per rotation
+            lcd: The display's SafeLCD (backlight and blank screen during quiet hours)
+            quiet_hours: Optional utils.quiet_hours.QuietHours
+            watchdog: Optional utils.watchdog.Watchdog
+        """
+        self.modules = modules
+        self.plan = build_rotation_plan(modules, module_order, module_weights)
+        self.alert_module = alert_module
+        self._alert_event = alert_module.engine.add_listener() if alert_module else None
+        self.fetch_budget = fetch_budget
+        self.lcd = lcd
+        self.quiet_hours = quiet_hours
+        self.watchdog = watchdog
+        self._pending = None
+        self._pending_lock = threading.Lock()
+
+    def reconfigure(self, modules, module_order, module_weights=None, fetch_budget=None, quiet_hours=None):
+        """
+        Replace modules, rotation plan, fetch budget and quiet hours (thread-safe)
+
+        Called from another thread; the running rotation is cut short and the
+        new plan starts with the next screen.
+
+        Args:
+            modules: Dict of module name -> module instance
+            module_order: List of module names in display order
+            module_weights: Optional dict of module name -> weight
+            fetch_budget: Optional seconds of fetching allowed per rotation
+            quiet_hours: Optional utils.quiet_hours.QuietHours
+        """
+        plan = build_rotation_plan(modules, module_order, module_weights)
+        with self._pending_lock:
+            self._pending = (modules, plan, fetch_budget, quiet_hours)
+
+    def _apply_pending(self):
+        """Switch to a pending configuration, if any"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.modules, self.plan, self.fetch_budget, self.quiet_hours = pending
+
+    def _wait(self, duration):
+        """
+        Sleep for a screen's display time, waking early if an alert fires
+
+        Returns:
+            bool: True if interrupted by an alert
+        """
+        if self._alert_event is None:
+            clock.sleep(duration)
+            return False
+
+        interrupted = clock.wait(self._alert_event, duration)
+        self._alert_event.clear()
+        return interrupted
+
+    def _set_backlight(self, enabled):
+        """Switch the display's backlight (no-op without an LCD)"""
+        if self.lcd is not None:
+            self.lcd.backlight_enabled = enabled
+
+    def _beat(self):
+        """Tell the watchdog that this display loop is making progress"""
+        if self.watchdog is not None:
+            self.watchdog.beat()
+
+    def _update(self, module, interval_multiplier=1):
+        """
+        Refresh a module's data if it is due, within the watchdog's hard timeout
+
+        A hung refresh is abandoned and counts as a failed attempt, so the
+        module keeps its cached data and retries after its retry_interval.
+        """
+        if not module.needs_update(interval_multiplier):
+            return
+        if self.watchdog is None:
+            module.update_data()
+            return
+
+        self._beat()
+        if not self.watchdog.run(module.name, module.update_data):
+            module.last_update = clock.now()
+            module.consecutive_failures += 1
+            self._show_degraded(module)
+        self._beat()
+
+    def _show_degraded(self, module):
+        """Briefly show that a module's data is delayed"""
+        if self.lcd is None:
+            return
+        self.lcd.render(TITLE_VALUE_LAYOUT, {'title': module.name, 'value': 'Data delayed'})
+        self._wait(DEGRADED_DURATION)
+
+    def show_alerts(self):
+        """Show alert screens if an alert just fired or a reminder is due"""
+        if self.alert_module is None:
+            return
+
+        # Alerts taken here must not cut the next screen short
+        self._alert_event.clear()
+        if not self.alert_module.engine.take_due(self._alert_event):
+            return
+
+        self.alert_module.update_data()
+        for screen in range(self.alert_module.get_display_count()):
+            if self.alert_module.display_screen(screen):
+                clock.sleep(self.alert_module.display_duration)
+
+    def show_screen(self, module_name, screen):
+        """
+        Refresh (if due) and display a single screen
+
+        Args:
+            module_name: Name of the module owning the screen
+            screen: Screen index within the module
+
+        Returns:
+            bool: True if the screen was displayed, False if it was skipped
+        """
+        module = self.modules[module_name]
+        self._beat()
+        self._update(module)
+
+        # Alerts fired by the data that just arrived take priority
+        self.show_alerts()
+
+        # Without data, display_screen() would retry the refresh outside the watchdog
+        if self.watchdog is not None and not module.data:
+            return False
+        if not module.display_screen(screen):
+            return False
+
+        # Over-width text scrolls within the display time
+        if self.lcd is not None:
+            interrupted = self.lcd.play_marquee(module.display_duration, self._wait)
+        else:
+            interrupted = self._wait(module.display_duration)
+        if interrupted:
+            self.show_alerts()
+        return True
+
+    def refresh_all(self):
+        """Refresh every module whose data is due (before waking from quiet hours)"""
+        deadline.start(self.fetch_budget)
+        for module in self.modules.values():
+            self._update(module)
+
+    def run_quiet(self):
+        """
+        Show the static quiet hours screen until quiet hours end (or the configuration changes)
+
+        The static screen is redrawn every redraw_interval, and only its module
+        is refreshed, at update_interval * interval_multiplier. Within prewake
+        seconds of the end, every module is refreshed once so the rotation
+        resumes with current data. Alerts still interrupt, with the backlight on.
+        """
+        quiet = self.quiet_hours
+        self._set_backlight(quiet.backlight)
+
+        module, screen = None, 0
+        if quiet.screen is not None:
+            module_name, screen = quiet.screen
+            module = self.modules.get(module_name)
+            if module is not None and not 0 <= screen < module.get_display_count():
+                print(f"Quiet hours: {module_name} has no screen {screen}, showing a blank display")
+                module = None
+        if module is None and self.lcd is not None:
+            self.lcd.clear()
+
+        refreshed = False
+        while self._pending is None and quiet.is_active():
+            self._beat()
+            remaining = quiet.seconds_until_end()
+            if remaining <= quiet.prewake and not refreshed:
+                self.refresh_all()
+                refreshed = True
+
+            if module is not None:
+                deadline.start(self.fetch_budget)
+                self._update(module, quiet.interval_multiplier)
+                # Without data, display_screen() would refresh at the regular interval (and outside the watchdog)
+                if (not module.data or not module.display_screen(screen)) and self.lcd is not None:
+                    self.lcd.clear()
+
+            # Sleep until the next redraw, the pre-wake refresh or the end of quiet hours
+            until_prewake = remaining - quiet.prewake
+            duration = min(quiet.redraw_interval, until_prewake if until_prewake > 0 else remaining)
+            if self._wait(duration):
+                self._set_backlight(True)
+                self.show_alerts()
+                self._set_backlight(quiet.backlight)
+
+    def run_cycle(self):
+        """Display every screen of the rotation plan once (or the quiet hours screen)"""
+        self._apply_pending()
+        self._beat()
+        if self.quiet_hours is not None and self.quiet_hours.is_active():
+            self.run_quiet()
+            return
+        self._set_backlight(True)
+        deadline.start(self.fetch_budget)
+        shown = False
+        for module_name, screen in self.plan:
+            if self._pending is not None:
+                return
+            shown = self.show_screen(module_name, screen) or shown
+
+        # No module had data: wait for the next refresh instead of spinning
+        if self.plan and not shown:
+            self._wait(self._idle_duration())
+
+    def _idle_duration(self):
+        """Seconds until the first module of the plan is due for a refresh (bounded)"""
+        due = min(
+            0 if module.needs_update() else module.seconds_until_update()
+            for module in (self.modules[name] for name, _ in self.plan)
+        )
+        return min(max(due, IDLE_MIN_WAIT), IDLE_MAX_WAIT)
@@ -0,0 +1,266 @@
+"""
+Tick Log
+
+Append-only on-disk log of every value the API clients fetch (prices,
+dominance, market cap, Fear & Greed, Altcoin Season), kept for months so
+local statistics can be computed on the device.
+
+Storage: a directory of segment files of fixed-size binary records
+    <timestamp: float64> <value: float64> <series id: uint32> <padding>
+(24 bytes, little endian), plus series.json mapping series names to ids.
+A segment is named after the time of its first record and closed once it
+reaches segment_size; old segments are deleted by age and total size.
+
+Queries memory-map the segments overlapping the requested time range,
+binary-search the start and decode records straight from the mapping, so a
+query reads only the pages it needs and keeps nothing in memory.
+
+Example:
+    log = TickLog('data/ticks')
+    subscribe_values(log.append)   # utils.events: record every fetch
+    for ts, price in log.query('price.bitcoin.usd', t0, t1):
+        ...
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from utils import clock
+
+
+RECORD = struct.Struct('<ddI4x')
+TIMESTAMP = struct.Struct('<d')
+SEGMENT_SUFFIX = '.tick'
+SERIES_FILE = 'series.json'
+
+
+class TickLog:
+    """Append-only tick log with segment rotation, retention and memory-mapped range queries"""
+
+    def __init__(self, path, segment_size=1024 * 1024, retention_days=365, max_size=256 * 1024 * 1024,
+                 min_interval=10):
+        """
+        Open (or create) a tick log
+
+        Args:
+            path: Directory holding the segments
+            segment_size: Bytes per segment before a new one is started
+            retention_days: Segments older than this are deleted (0 = keep)
+            max_size: Total bytes kept; oldest segments are deleted beyond it (0 = no limit)
+            min_interval: Seconds between two records of the same series (streamed prices tick every second)
+        """
+        self.path = path
+        self.segment_size = max(segment_size - segment_size % RECORD.size, RECORD.size)
+        self.retention_days = retention_days
+        self.max_size = max_size
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_append = {}  # series id -> timestamp of its last record
+        self._last_written = float('-inf')  # timestamp of the newest record (queries bisect on time order)
+        self._file = None
+        self._file_size = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._series = self._load_series()
+
+        # Continue the newest segment if it has room
+        segments = self._segments()
+        if segments:
+            last = os.path.join(path, segments[-1][1])
+            size = os.path.getsize(last)
+            if size >= RECORD.size:
+                with open(last, 'rb') as f:
+                    f.seek(size - size % RECORD.size - RECORD.size)
+                    self._last_written = TIMESTAMP.unpack(f.read(TIMESTAMP.size))[0]
+            if size < self.segment_size:
+                self._file = open(last, 'r+b')
+                # Drop a partial record left by a crash
+                self._file_size = size - size % RECORD.size
+                self._file.truncate(self._file_size)
+                self._file.seek(self._file_size)
+        self._apply_retention()
+
+    def _load_series(self):
+        """Read the series name -> id map"""
+        try:
+            with open(os.path.join(self.path, SERIES_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_series(self):
+        """Write the series map atomically"""
+        target = os.path.join(self.path, SERIES_FILE)
+        tmp = target + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._series, f, sort_keys=True)
+        os.replace(tmp, target)
+
+    def _segments(self):
+        """
+        List the segments, oldest first
+
+        Returns:
+            list: (first record time, file name) tuples
+        """
+        segments = []
+        for name in os.listdir(self.path):
+            if name.endswith(SEGMENT_SUFFIX):
+                try:
+                    segments.append((int(name[:-len(SEGMENT_SUFFIX)]) / 1000, name))
+                except ValueError:
+                    continue
+        segments.sort()
+        return segments
+
+    def _series_id(self, name):
+        """Get a series id, registering new series (lock held)"""
+        series_id = self._series.get(name)
+        if series_id is None:
+            series_id = len(self._series)
+            self._series[name] = series_id
+            self._save_series()
+        return series_id
+
+    def append(self, values, timestamp=None):
+        """
+        Append values that were fetched together
+
+        Args:
+            values: Dict of series name -> number (None values are skipped)
+            timestamp: Unix time of the values (default: now); raised to the newest
+                record's time if earlier, so records stay in time order
+        """
+        with self._lock:
+            # Read under the lock: a concurrent append must not write a later time first
+            timestamp = max(clock.now() if timestamp is None else timestamp, self._last_written)
+            records = bytearray()
+            for name, value in values.items():
+                if value is None:
+                    continue
+                series_id = self._series_id(name)
+                last = self._last_append.get(series_id)
+                if last is not None and timestamp - last < self.min_interval:
+                    continue
+                self._last_append[series_id] = timestamp
+                records += RECORD.pack(timestamp, float(value), series_id)
+            if not records:
+                return
+
+            if self._file is None or self._file_size + len(records) > self.segment_size:
+                self._rotate(timestamp)
+            self._file.write(records)
+            self._file.flush()  # one write per fetch; no fsync to spare the SD card
+            self._file_size += len(records)
+            self._last_written = timestamp
+
+    def _rotate(self, timestamp):
+        """Start a new segment and apply retention (lock held)"""
+        if self._file is not None:
+            self._file.close()
+        name = f"{int(timestamp * 1000):015d}{SEGMENT_SUFFIX}"
+        self._file = open(os.path.join(self.path, name), 'ab')
+        self._file_size = self._file.tell()
+        self._apply_retention()
+
+    def _apply_retention(self):
+        """Delete segments beyond the age and size limits (never the one being written)"""
+        segments = self._segments()
+        current = os.path.basename(self._file.name) if self._file is not None else None
+        sizes = {name: os.path.getsize(os.path.join(self.path, name)) for _, name in segments}
+        total = sum(sizes.values())
+        cutoff = clock.now() - self.retention_days * 86400 if self.retention_days else None
+
+        for index, (_, name) in enumerate(segments[:-1]):
+            if name == current:
+                break
+            # A segment ends where the next one starts
+            expired = cutoff is not None and segments[index + 1][0] < cutoff
+            oversize = self.max_size and total > self.max_size
+            if not (expired or oversize):
+                break
+            os.remove(os.path.join(self.path, name))
+            total -= sizes[name]
+            print(f"Tick log: Deleted segment {name}")
+
+    def series(self):
+        """
+        Get the names of all recorded series
+
+        Returns:
+            list: Series names (e.g. 'price.bitcoin.usd', 'btc_dominance')
+        """
+        with self._lock:
+            return sorted(self._series)
+
+    def query(self, name, start=None, end=None):
+        """
+        Iterate the records of one series in a time range
+
+        Args:
+            name: Series name
+            start: Unix time to start at (inclusive, default: oldest)
+            end: Unix time to stop at (exclusive, default: newest)
+
+        Yields:
+            tuple: (timestamp, value), oldest first
+        """
+        series_id = self._series.get(name)
+        if series_id is None:
+            return
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+
+        segments = self._segments()
+        for index, (first, segment) in enumerate(segments):
+            following = segments[index + 1][0] if index + 1 < len(segments) else float('inf')
+            if first >= end or following < start:
+                continue
+            try:
+                yield from self._query_segment(os.path.join(self.path, segment), series_id, start, end)
+            except FileNotFoundError:
+                continue  # deleted by retention meanwhile
+
+    def _query_segment(self, path, series_id, start, end):
+        """Yield the matching records of one segment through a read-only memory mapping"""
+        with open(path, 'rb') as f:
+            count = os.fstat(f.fileno()).st_size // RECORD.size
+            if count == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                first = self._bisect(mapped, count, start)
+                last = self._bisect(mapped, count, end)
+                if first >= last:
+                    return
+
+                view = memoryview(mapped)[first * RECORD.size:last * RECORD.size]
+                records = RECORD.iter_unpack(view)
+                try:
+                    for timestamp, value, record_series in records:
+                        if record_series == series_id:
+                            yield timestamp, value
+                finally:
+                    # The mapping can only close once no buffer refers to it
+                    del records
+                    view.release()
+
+    @staticmethod
+    def _bisect(mapped, count, timestamp):
+        """Index of the first record at or after a timestamp (records are in time order)"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if TIMESTAMP.unpack_from(mapped, middle * RECORD.size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self):
+        """Close the segment being written"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,192 @@
+"""
+Watchdog
+
+Keeps a hung network call from freezing the displays, and lets systemd
+restart the process when it wedges anyway.
+
+- Module refreshes run on a worker thread with a hard timeout. The requests
+  timeouts don't cover every phase (DNS resolution, a half-open socket
+  trickling bytes), so a refresh can block forever; after fetch_timeout the
+  display loop abandons the worker and goes on with cached data. The next
+  refresh gets a fresh worker.
+- Every display loop sends heartbeats. The main thread calls notify() once a
+  second, which sends WATCHDOG=1 to systemd only while every loop made
+  progress within stall_timeout and fewer than max_stuck_workers abandoned
+  workers are still hanging. A wedged process misses its pings and is
+  restarted by systemd (WatchdogSec=).
+
+sd_notify() speaks the systemd notify protocol over NOTIFY_SOCKET; without
+it (not started by systemd with Type=notify) notifications are skipped.
+"""
+
+import os
+import socket
+import threading
+from utils import clock, deadline, metrics
+
+
+def sd_notify(message):
+    """
+    Send a state change to systemd (e.g. 'READY=1', 'WATCHDOG=1')
+
+    Returns:
+        bool: True if sent, False without NOTIFY_SOCKET or on error
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return False
+    if address.startswith('@'):
+        address = '\0' + address[1:]  # abstract socket namespace
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(message.encode('utf-8'))
+        return True
+    except OSError as e:
+        print(f"Watchdog: sd_notify failed ({e})")
+        return False
+
+
+def systemd_ping_interval():
+    """
+    Get the interval systemd expects WATCHDOG=1 pings at (half of WatchdogSec)
+
+    Returns:
+        float: Seconds between pings, or None if the systemd watchdog is off for this process
+    """
+    try:
+        usec = int(os.environ.get('WATCHDOG_USEC', 0))
+        pid = int(os.environ.get('WATCHDOG_PID', os.getpid()))
+    except ValueError:
+        return None
+    if usec <= 0 or pid != os.getpid():
+        return None
+    return usec / 1e6 / 2
+
+
+class Watchdog:
+    """Hard fetch timeouts and display loop progress tracking with systemd pings"""
+
+    def __init__(self, fetch_timeout=60, stall_timeout=180, max_stuck_workers=5):
+        """
+        Initialize the watchdog
+
+        Args:
+            fetch_timeout: Seconds a module refresh may take before its worker is abandoned
+            stall_timeout: Seconds a display loop may go without a heartbeat
+            max_stuck_workers: Abandoned workers still hanging before the process counts as wedged
+        """
+        self.fetch_timeout = fetch_timeout
+        self.stall_timeout = stall_timeout
+        self.max_stuck_workers = max_stuck_workers
+        self.ping_interval = systemd_ping_interval()
+        self._heartbeats = {}  # loop (thread) name -> time of its last heartbeat
+        self._stuck = []  # abandoned worker threads
+        self._lock = threading.Lock()
+        self._last_ping = None
+        self._healthy = True
+
+    def beat(self):
+        """Record progress of the calling display loop"""
+        name = threading.current_thread().name
+        with self._lock:
+            self._heartbeats[name] = clock.now()
+
+    def run(self, name, function):
+        """
+        Run a refresh on a worker thread, waiting at most fetch_timeout
+
+        The worker takes over the caller's fetch budget, and the time spent
+        is charged back to it. Exceptions of the refresh are re-raised.
+
+        Args:
+            name: Name of the refresh (worker thread and log)
+            function: Callable doing the refresh (e.g. module.update_data)
+
+        Returns:
+            bool: True if it finished in time, False if the worker was abandoned
+        """
+        budget = deadline.remaining()
+        started = threading.Event()
+        done = threading.Event()
+        outcome = {}
+
+        def work():
+            clock.sleep(0)  # take part in the application clock before the caller starts waiting
+            started.set()
+            deadline.start(budget)
+            try:
+                function()
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+
+        worker = threading.Thread(target=work, name=f"fetch-{name}", daemon=True)
+        began = clock.now()
+        worker.start()
+        started.wait()
+        finished = clock.wait(done, self.fetch_timeout)
+        deadline.charge(clock.now() - began)
+
+        if not finished:
+            with self._lock:
+                self._stuck.append(worker)
+            metrics.increment('watchdog.abandoned_fetches')
+            print(f"Watchdog: {name} refresh hung for {self.fetch_timeout}s, worker abandoned")
+            return False
+        if 'error' in outcome:
+            raise outcome['error']
+        return True
+
+    def stuck_workers(self):
+        """
+        Count abandoned workers that are still hanging
+
+        Returns:
+            int: Number of stuck workers
+        """
+        with self._lock:
+            self._stuck = [worker for worker in self._stuck if worker.is_alive()]
+            count = len(self._stuck)
+        metrics.set_gauge('watchdog.stuck_workers', count)
+        return count
+
+    def check(self):
+        """
+        Check if every display loop is making progress
+
+        Returns:
+            str: None if healthy, else the reason
+        """
+        now = clock.now()
+        with self._lock:
+            heartbeats = dict(self._heartbeats)
+        for name, last in heartbeats.items():
+            if now - last > self.stall_timeout:
+                return f"{name} stalled for {now - last:.0f}s"
+        stuck = self.stuck_workers()
+        if stuck >= self.max_stuck_workers:
+            return f"{stuck} fetch workers stuck"
+        return None
+
+    def notify(self):
+        """Send a WATCHDOG=1 ping if one is due and the process is healthy (called from the main loop)"""
+        problem = self.check()
+        if problem is not None:
+            if self._healthy:
+                print(f"Watchdog: {problem}, withholding systemd pings")
+                sd_notify(f"STATUS=Unhealthy: {problem}")
+            self._healthy = False
+            return
+        if not self._healthy:
+            print("Watchdog: Healthy again")
+            sd_notify("STATUS=Running")
+            self._healthy = True
+
+        if self.ping_interval is None:
+            return
+        now = clock.now()
+        if self._last_ping is None or now - self._last_ping >= self.ping_interval:
+            sd_notify('WATCHDOG=1')
+            self._last_ping = now